@@ -0,0 +1,106 @@
+"""Benchmark of how often the size of the terminal and today's date are asked for while drawing a frame.
+
+Before each frame took a snapshot of them, every line displayed and every read of
+Screen.y_max, x_max, x_min and journal_pane_width called getmaxyx, and every read
+of Screen.today asked the system for the date. This benchmark renders the calendar
+and the journal on a fake terminal and compares those reads with the actual calls,
+failing if a frame calls getmaxyx or looks up the date more than once.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_frame_context
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.headless import FakeScreen, import_calcure
+
+
+def count_reads(cls, names, counter):
+    """Wrap properties of the class to count how many times they are read"""
+    for name in names:
+        prop = getattr(cls, name)
+
+        def getter(self, fget=prop.fget, name=name):
+            counter[name] = counter.get(name, 0) + 1
+            return fget(self)
+        setattr(cls, name, property(getter))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count terminal size and date lookups per frame")
+    parser.add_argument("--events", type=int, default=300, help="number of events in the displayed month")
+    parser.add_argument("--tasks", type=int, default=40, help="number of tasks in the journal")
+    parser.add_argument("--frames", type=int, default=20, help="number of frames to draw")
+    args = parser.parse_args()
+
+    calcure = import_calcure()
+    from calcure.data import Events, Tasks, Task, Timer, UserEvent, Birthdays, Holidays, Frequency, Status, \
+                             RepeatedEventsCache
+    import calcure.screen as calcure_screen
+    from calcure.screen import Screen
+
+    stdscr = FakeScreen(50, 200)
+    screen = Screen(stdscr, calcure.cf)
+    screen.split = True
+    reads = {}
+    count_reads(Screen, ["y_max", "x_max", "x_min", "journal_pane_width", "today"], reads)
+    display_line = calcure.View.display_line
+
+    def counting_display_line(self, *args, **kwargs):
+        reads["display_line"] = reads.get("display_line", 0) + 1
+        return display_line(self, *args, **kwargs)
+    calcure.View.display_line = counting_display_line
+
+    # Every lookup of today's date goes through current_date:
+    current_date = calcure_screen.current_date
+
+    def counting_current_date(*args, **kwargs):
+        reads["current_date"] = reads.get("current_date", 0) + 1
+        return current_date(*args, **kwargs)
+    calcure_screen.current_date = counting_current_date
+
+    user_events = Events()
+    for index in range(args.events):
+        user_events.add_item(UserEvent(index, screen.year, screen.month, index % 28 + 1, f"Event {index}",
+                                       1, Frequency.ONCE, Status.NORMAL, False))
+    user_tasks = Tasks()
+    for index in range(args.tasks):
+        user_tasks.add_item(Task(index, f"Task {index}", Status.NORMAL, Timer([]), False))
+    weather = calcure.Weather("", True)
+    monthly = calcure.MonthlyScreenView(stdscr, 0, 0, weather, user_events, Events(), Holidays(), Birthdays(),
+                                        user_tasks, Tasks(), screen, RepeatedEventsCache(False))
+    journal = calcure.JournalScreenView(stdscr, 0, 0, weather, user_tasks, Tasks(), screen)
+
+    stdscr.getmaxyx_calls = 0
+    reads.clear()
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        screen.new_frame()
+        monthly.render()
+        journal.render()
+    seconds = time.perf_counter() - start
+
+    size_reads = sum(reads.get(name, 0) for name in ["y_max", "x_max", "x_min", "journal_pane_width", "display_line"])
+    print(f"Frames drawn:                         {args.frames}")
+    print(f"Time per frame:                       {seconds/args.frames*1000:.2f} ms")
+    print(f"Reads of the terminal size per frame: {size_reads/args.frames:.0f}")
+    print(f"Calls of getmaxyx per frame:          {stdscr.getmaxyx_calls/args.frames:.0f}")
+    print(f"Reads of today's date per frame:      {reads.get('today', 0)/args.frames:.0f}")
+    print(f"Lookups of today's date per frame:    {reads.get('current_date', 0)/args.frames:.0f}")
+
+    # Each frame should ask the terminal for its size and the system for the date only once:
+    too_many = []
+    if stdscr.getmaxyx_calls != args.frames:
+        too_many.append(f"{stdscr.getmaxyx_calls} calls of getmaxyx")
+    if reads.get("current_date", 0) != args.frames:
+        too_many.append(f"{reads.get('current_date', 0)} lookups of today's date")
+    if too_many:
+        print(f"Expected one of each per frame in {args.frames} frames, got {', '.join(too_many)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
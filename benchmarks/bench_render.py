@@ -0,0 +1,150 @@
+"""Benchmark of rendering the calendar and journal views on a fake screen, without a terminal.
+
+For each size of the dataset, every view is drawn once from scratch (first frame),
+and then several more times with the same data (next frames), as when the user
+presses keys. The peak of memory allocated while drawing the first frame is measured with tracemalloc.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_render
+    python -m benchmarks.bench_render --sizes 1000,10000 --max-frame-ms 50
+    python -m benchmarks.bench_render --dataset /tmp/dataset
+
+The last one draws data made by benchmarks.generate_dataset instead of the built-in random data.
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.headless import FakeScreen, import_calcure
+
+
+def make_dataset(size, seed):
+    """Create events and tasks spread over the year around today"""
+    from calcure.data import Events, Tasks, Task, Timer, UserEvent, Frequency, Status
+
+    rand = random.Random(seed)
+    today = datetime.date.today()
+    user_events = Events()
+    user_ics_events = Events()
+    user_tasks = Tasks()
+    for index in range(size):
+        date = today + datetime.timedelta(days=rand.randint(-182, 182))
+        if index % 50 == 0:
+            repetition, frequency = rand.randint(2, 10), rand.choice([Frequency.DAILY, Frequency.WEEKLY])
+        else:
+            repetition, frequency = 1, Frequency.ONCE
+        status = rand.choice([Status.NORMAL, Status.NORMAL, Status.IMPORTANT, Status.DONE])
+        user_events.add_item(UserEvent(index, date.year, date.month, date.day, f"Event {index}",
+                                       repetition, frequency, status, False))
+        if index % 10 == 0:
+            hour = rand.randint(0, 23)
+            user_ics_events.add_item(UserEvent(index, date.year, date.month, date.day, f"Meeting {index}",
+                                               1, Frequency.ONCE, Status.NORMAL, False, hour, 0, 0))
+        deadline = (date.year, date.month, date.day) if index % 7 == 0 else (0, 0, 0)
+        stamps = [str(1700000000 + index)] if index % 20 == 0 else []
+        user_tasks.add_item(Task(index, f"{'--' if index % 4 else ''}Task {index}", status, Timer(stamps),
+                                 False, *deadline))
+    return user_events, user_ics_events, user_tasks
+
+
+def load_dataset(calcure):
+    """Load events and tasks from the files of the config, as calcure does at start"""
+    from calcure.loaders import EventLoaderCSV, EventLoaderICS, TaskLoaderCSV, TaskLoaderICS
+
+    user_events = EventLoaderCSV(calcure.cf).load()
+    user_ics_events = EventLoaderICS(calcure.cf).load()
+    user_tasks = TaskLoaderCSV(calcure.cf).load()
+    for task in TaskLoaderICS(calcure.cf).load().items:
+        task.item_id = len(user_tasks.items)
+        user_tasks.add_item(task)
+    return user_events, user_ics_events, user_tasks
+
+
+def make_views(calcure, stdscr, screen, dataset):
+    """Create the views of each screen from the dataset"""
+    from calcure.data import Birthdays, Holidays, RepeatedEventsCache, Tasks
+
+    user_events, user_ics_events, user_tasks = dataset
+    weather = calcure.Weather("", True)
+    calendar_arguments = (weather, user_events, user_ics_events, Holidays(), Birthdays(), user_tasks, Tasks(),
+                          screen, RepeatedEventsCache(False))
+    return {
+        "monthly": calcure.MonthlyScreenView(stdscr, 0, 0, *calendar_arguments),
+        "weekly": calcure.WeeklyScreenView(stdscr, 0, 0, *calendar_arguments),
+        "daily": calcure.DailyScreenView(stdscr, 0, 0, *calendar_arguments),
+        "journal": calcure.JournalScreenView(stdscr, 0, 0, weather, user_tasks, Tasks(), screen),
+    }
+
+
+def draw(stdscr, screen, view):
+    """Draw one frame of the view as the main loop does"""
+    screen.new_frame()
+    stdscr.erase()
+    view.render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering of views without a terminal")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated numbers of events and tasks")
+    parser.add_argument("--frames", type=int, default=10, help="number of next frames to draw per view")
+    parser.add_argument("--height", type=int, default=50, help="height of the fake screen")
+    parser.add_argument("--width", type=int, default=200, help="width of the fake screen")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random dataset")
+    parser.add_argument("--dataset", default=None, metavar="PATH",
+                        help="folder made by benchmarks.generate_dataset to draw instead of random data")
+    parser.add_argument("--max-frame-ms", type=float, default=None,
+                        help="fail if the median of next frames of any view takes longer")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    calcure = import_calcure(Path(args.dataset, "config.ini") if args.dataset else None)
+    from calcure.data import AppState
+    from calcure.screen import Screen
+
+    too_slow = []
+    print(f"{'size':>8} {'view':>8} {'first ms':>10} {'next ms':>10} {'peak KiB':>10} {'lines':>6}")
+    datasets = [load_dataset(calcure)] if args.dataset else [make_dataset(size, args.seed) for size in sizes]
+    for dataset in datasets:
+        size = len(dataset[0].items) + len(dataset[1].items)
+        for name in ["monthly", "weekly", "daily", "journal"]:
+            stdscr = FakeScreen(args.height, args.width)
+            screen = Screen(stdscr, calcure.cf)
+            screen.split = False
+            screen.currently_drawn = AppState.JOURNAL if name == "journal" else AppState.CALENDAR
+
+            # Tracing allocations slows drawing down, so it is done on a separate view:
+            view = make_views(calcure, stdscr, screen, dataset)[name]
+            tracemalloc.start()
+            draw(stdscr, screen, view)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            view = make_views(calcure, stdscr, screen, dataset)[name]
+            start = time.perf_counter()
+            draw(stdscr, screen, view)
+            first = time.perf_counter() - start
+
+            times = []
+            for _ in range(args.frames):
+                start = time.perf_counter()
+                draw(stdscr, screen, view)
+                times.append(time.perf_counter() - start)
+            median = statistics.median(times)
+            print(f"{size:>8} {name:>8} {first*1000:10.2f} {median*1000:10.2f} {peak/1024:10.0f} {len(stdscr.lines):>6}")
+            if args.max_frame_ms is not None and median*1000 > args.max_frame_ms:
+                too_slow.append(f"{name} view with {size} items")
+
+    if too_slow:
+        print(f"Frames took longer than {args.max_frame_ms} ms: {', '.join(too_slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
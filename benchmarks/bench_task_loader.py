@@ -0,0 +1,68 @@
+"""Benchmark of loading tasks.csv, checking that load time grows linearly with the number of rows.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_task_loader
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from calcure.loaders import TaskLoaderCSV
+
+
+def write_tasks_file(path, number_of_rows):
+    """Write a tasks file in the format produced by TaskSaverCSV"""
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(number_of_rows):
+            year, month, day = (2024, index % 12 + 1, index % 28 + 1) if index % 3 == 0 else (0, 0, 0)
+            status = ["normal", "done", "important", "unimportant"][index % 4]
+            file.write(f'{year},{month},{day},"Task number {index}",{status}')
+            if index % 5 == 0:
+                file.write(f",{1700000000 + index},{1700000600 + index}")
+            file.write("\n")
+
+
+def time_load(path, repeats):
+    """Return the best time of several loads of the file"""
+    cf = SimpleNamespace(TASKS_FILE=path, HIDE_DONE_TASKS=False, USE_PERSIAN_CALENDAR=False, CSV_CHANGE_LOG=True)
+    loader = TaskLoaderCSV(cf)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loader.load()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading of tasks.csv")
+    parser.add_argument("--sizes", default="1000,2000,4000,8000,16000", help="comma-separated numbers of rows")
+    parser.add_argument("--repeats", type=int, default=3, help="number of loads per size")
+    parser.add_argument("--max-ratio", type=float, default=2.5,
+                        help="largest allowed ratio between time per row of the biggest and smallest file")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    per_row = []
+    with tempfile.TemporaryDirectory() as folder:
+        for size in sizes:
+            path = Path(folder) / f"tasks_{size}.csv"
+            write_tasks_file(path, size)
+            seconds = time_load(path, args.repeats)
+            per_row.append(seconds / size)
+            print(f"{size:>8} rows  {seconds*1000:9.2f} ms  {seconds/size*1e6:7.2f} us/row")
+
+    ratio = per_row[-1] / per_row[0]
+    print(f"Time per row grew {ratio:.2f} times from {sizes[0]} to {sizes[-1]} rows")
+    if ratio > args.max_ratio:
+        print("Load time is not linear in the number of rows")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
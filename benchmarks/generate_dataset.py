@@ -0,0 +1,206 @@
+"""Generate a reproducible synthetic dataset for benchmarks and for trying calcure on large inputs.
+
+Writes into the output folder:
+
+    events.csv, tasks.csv       in the format produced by EventSaverCSV and TaskSaverCSV
+    calendars/events.ics        single-file calendar with all ICS events
+    calendars/tasks.ics         single-file calendar with all ICS tasks
+    vdir/events/*.ics           other events, one per file, as vdirsyncer stores them
+    vdir/tasks/*.ics            other tasks, one per file
+    config.ini                  config that points calcure to the files above
+
+Run from the root of the repository:
+
+    python -m benchmarks.generate_dataset /tmp/dataset --events 10000 --ics-events 5000 --seed 1
+    calcure --config /tmp/dataset/config.ini
+    python -m benchmarks.bench_render --dataset /tmp/dataset
+"""
+
+import argparse
+import datetime
+import random
+from pathlib import Path
+
+
+WORDS = ["Meeting", "Call", "Lunch", "Review", "Dentist", "Gym", "Seminar", "Trip", "Deadline", "Party",
+         "Report", "Interview", "Workshop", "Lecture", "Concert", "Birthday", "Flight", "Standup"]
+STATUSES = ["normal", "normal", "normal", "important", "unimportant", "done"]
+FREQUENCIES = ["daily", "weekly", "monthly", "yearly"]
+RRULES = ["FREQ=DAILY;COUNT={count}", "FREQ=WEEKLY;BYDAY=MO,WE,FR", "FREQ=WEEKLY;INTERVAL=2",
+          "FREQ=MONTHLY;BYMONTHDAY={day}", "FREQ=YEARLY", "FREQ=WEEKLY;UNTIL={until}"]
+
+
+def random_name(rand, index):
+    """Return a name of an event or task, sometimes with a couple of extra words"""
+    words = rand.sample(WORDS, rand.choice([1, 1, 2, 3]))
+    return f"{' '.join(words)} {index}"
+
+
+def random_date(rand, start, days):
+    """Return a random date within the number of days from the start"""
+    return start + datetime.timedelta(days=rand.randrange(days))
+
+
+def write_events_csv(path, rand, number, start, days, repeated_fraction):
+    """Write events in the format produced by EventSaverCSV"""
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(number):
+            date = random_date(rand, start, days)
+            if rand.random() < repeated_fraction:
+                repetition, frequency = rand.randint(2, 20), rand.choice(FREQUENCIES)
+            else:
+                repetition, frequency = 1, "once"
+            privacy = "." if rand.random() < 0.05 else ""
+            name = f"{privacy}{random_name(rand, index)}"
+            file.write(f'{index + 1},{date.year},{date.month},{date.day},"{name}",{repetition},{frequency},'
+                       f'{rand.choice(STATUSES)}\n')
+
+
+def write_tasks_csv(path, rand, number, start, days):
+    """Write tasks in the format produced by TaskSaverCSV"""
+    with open(path, "w", encoding="utf-8") as file:
+        for index in range(number):
+            if rand.random() < 0.2:
+                date = random_date(rand, start, days)
+                year, month, day = date.year, date.month, date.day
+            else:
+                year, month, day = 0, 0, 0
+            level = rand.choice(["", "", "", "--", "----"])
+            privacy = "." if rand.random() < 0.05 else ""
+            file.write(f'{year},{month},{day},"{privacy}{level}{random_name(rand, index)}",{rand.choice(STATUSES)}')
+            if rand.random() < 0.1:
+                stamp = 1700000000 + rand.randrange(10**7)
+                for _ in range(rand.choice([1, 2, 2, 4])):
+                    file.write(f",{stamp}")
+                    stamp += rand.randrange(60, 7200)
+            file.write("\n")
+
+
+def ics_date(date):
+    """Format the date as in ICS files"""
+    return date.strftime("%Y%m%d")
+
+
+def ics_datetime(moment):
+    """Format the date and time as in ICS files, in floating time"""
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+
+def make_ics_events(rand, number, start, days, args, prefix):
+    """Return VEVENT components as lists of lines, with the requested mix of kinds of events"""
+    events = []
+    for index in range(number):
+        date = random_date(rand, start, days)
+        lines = ["BEGIN:VEVENT", f"UID:{prefix}-event-{index}@calcure-benchmark", f"SUMMARY:{random_name(rand, index)}",
+                 f"DTSTAMP:{ics_datetime(datetime.datetime(2024, 1, 1))}Z"]
+        is_timed = rand.random() < args.timed
+        is_multi_day = rand.random() < args.multi_day
+        length = rand.randint(2, 7) if is_multi_day else 1
+
+        if is_timed:
+            begin = datetime.datetime.combine(date, datetime.time(rand.randint(6, 21), rand.choice([0, 15, 30, 45])))
+            end = begin + (datetime.timedelta(days=length - 1, hours=1) if is_multi_day
+                           else datetime.timedelta(minutes=rand.choice([30, 60, 90])))
+            lines += [f"DTSTART:{ics_datetime(begin)}", f"DTEND:{ics_datetime(end)}"]
+        else:
+            lines += [f"DTSTART;VALUE=DATE:{ics_date(date)}",
+                      f"DTEND;VALUE=DATE:{ics_date(date + datetime.timedelta(days=length))}"]
+
+        if not is_multi_day and rand.random() < args.recurring:
+            until = date + datetime.timedelta(days=rand.randint(30, 365))
+            rrule = rand.choice(RRULES).format(count=rand.randint(2, 30), day=date.day,
+                                               until=f"{ics_date(until)}T235959Z" if is_timed else ics_date(until))
+            lines.append(f"RRULE:{rrule}")
+            if rand.random() < args.exdate:
+                for _ in range(rand.randint(1, 3)):
+                    excluded = date + datetime.timedelta(days=rand.randint(1, 60))
+                    if is_timed:
+                        excluded = datetime.datetime.combine(excluded, begin.time())
+                        lines.append(f"EXDATE:{ics_datetime(excluded)}")
+                    else:
+                        lines.append(f"EXDATE;VALUE=DATE:{ics_date(excluded)}")
+        lines.append("END:VEVENT")
+        events.append(lines)
+    return events
+
+
+def make_ics_tasks(rand, number, start, days, prefix):
+    """Return VTODO components as lists of lines"""
+    tasks = []
+    for index in range(number):
+        lines = ["BEGIN:VTODO", f"UID:{prefix}-task-{index}@calcure-benchmark", f"SUMMARY:{random_name(rand, index)}",
+                 f"DTSTAMP:{ics_datetime(datetime.datetime(2024, 1, 1))}Z"]
+        if rand.random() < 0.3:
+            lines.append(f"DUE;VALUE=DATE:{ics_date(random_date(rand, start, days))}")
+        if rand.random() < 0.5:
+            lines.append(f"PRIORITY:{rand.choice([1, 5, 9])}")
+        lines.append(f"STATUS:{rand.choice(['NEEDS-ACTION', 'NEEDS-ACTION', 'IN-PROCESS', 'COMPLETED', 'CANCELLED'])}")
+        lines.append("END:VTODO")
+        tasks.append(lines)
+    return tasks
+
+
+def write_calendar(path, components):
+    """Write components into a single ICS file"""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//calcure//benchmark//EN"]
+    for component in components:
+        lines += component
+    lines.append("END:VCALENDAR")
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write("\r\n".join(lines) + "\r\n")
+
+
+def write_vdir(folder, components):
+    """Write each component into its own ICS file, named after its UID"""
+    folder.mkdir(parents=True, exist_ok=True)
+    for component in components:
+        uid = component[1].split(":", 1)[1].split("@")[0]
+        write_calendar(folder / f"{uid}.ics", [component])
+
+
+def write_config(path, folder):
+    """Write a config that uses the generated files"""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[Parameters]\n")
+        file.write(f"folder_with_datafiles = {folder}\n")
+        file.write(f"ics_event_files = {folder / 'calendars' / 'events.ics'},{folder / 'vdir' / 'events'}\n")
+        file.write(f"ics_task_files = {folder / 'calendars' / 'tasks.ics'},{folder / 'vdir' / 'tasks'}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset of events and tasks")
+    parser.add_argument("output", help="folder to write the dataset into")
+    parser.add_argument("--events", type=int, default=10000, help="number of events in events.csv")
+    parser.add_argument("--tasks", type=int, default=1000, help="number of tasks in tasks.csv")
+    parser.add_argument("--ics-events", type=int, default=5000, help="number of events in ICS calendars")
+    parser.add_argument("--ics-tasks", type=int, default=500, help="number of tasks in ICS calendars")
+    parser.add_argument("--vdir-events", type=int, default=500, help="number of events in the vdir folder")
+    parser.add_argument("--vdir-tasks", type=int, default=100, help="number of tasks in the vdir folder")
+    parser.add_argument("--start", default=f"{datetime.date.today().year - 1}-01-01",
+                        help="first date of events, YYYY-MM-DD")
+    parser.add_argument("--days", type=int, default=3*365, help="number of days over which events are spread")
+    parser.add_argument("--repeated", type=float, default=0.05, help="fraction of repeated events in events.csv")
+    parser.add_argument("--recurring", type=float, default=0.2, help="fraction of ICS events with RRULE")
+    parser.add_argument("--exdate", type=float, default=0.3, help="fraction of recurring ICS events with EXDATE")
+    parser.add_argument("--multi-day", type=float, default=0.1, help="fraction of ICS events that last several days")
+    parser.add_argument("--timed", type=float, default=0.6, help="fraction of ICS events with time, others are all-day")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    args = parser.parse_args()
+
+    rand = random.Random(args.seed)
+    start = datetime.date.fromisoformat(args.start)
+    folder = Path(args.output).expanduser().resolve()
+    (folder / "calendars").mkdir(parents=True, exist_ok=True)
+
+    write_events_csv(folder / "events.csv", rand, args.events, start, args.days, args.repeated)
+    write_tasks_csv(folder / "tasks.csv", rand, args.tasks, start, args.days)
+    write_calendar(folder / "calendars" / "events.ics", make_ics_events(rand, args.ics_events, start, args.days, args, "calendar"))
+    write_calendar(folder / "calendars" / "tasks.ics", make_ics_tasks(rand, args.ics_tasks, start, args.days, "calendar"))
+    write_vdir(folder / "vdir" / "events", make_ics_events(rand, args.vdir_events, start, args.days, args, "vdir"))
+    write_vdir(folder / "vdir" / "tasks", make_ics_tasks(rand, args.vdir_tasks, start, args.days, "vdir"))
+    write_config(folder / "config.ini", folder)
+    print(f"Dataset written to {folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Helpers to render views of calcure without a terminal"""
+
+import curses
+import importlib
+import os
+import sys
+import tempfile
+
+
+class FakeScreen:
+    """Stand-in for the curses window that keeps the displayed text in memory"""
+
+    def __init__(self, y_max=50, x_max=200):
+        self.size = (y_max, x_max)
+        self.lines = {}
+        self.getmaxyx_calls = 0
+        self.addstr_calls = 0
+
+    def getmaxyx(self):
+        self.getmaxyx_calls += 1
+        return self.size
+
+    def addstr(self, y, x, text, attributes=0):
+        self.addstr_calls += 1
+        y_max, x_max = self.size
+        if not 0 <= y < y_max or not 0 <= x < x_max:
+            raise curses.error("addstr() returned ERR")
+        line = self.lines.get(y, " "*x_max)
+        self.lines[y] = (line[:x] + text + line[x + len(text):])[:x_max]
+
+    def erase(self):
+        self.lines = {}
+
+    def clear(self):
+        self.lines = {}
+
+    def noutrefresh(self):
+        pass
+
+    def refresh(self):
+        pass
+
+    def text(self):
+        """Return the displayed text, line by line"""
+        return "\n".join(self.lines.get(y, "").rstrip() for y in range(self.size[0]))
+
+
+def import_calcure(config_file=None):
+    """Import the main module of calcure with a temporary home folder and no terminal.
+    Calcure reads the config and arguments when imported, so they are kept away from the user's ones"""
+    home = tempfile.mkdtemp()
+    os.makedirs(os.path.join(home, ".config"))
+    os.environ["HOME"] = home
+    sys.argv = sys.argv[:1] + (["--config", str(config_file)] if config_file else [])
+    curses.color_pair = lambda number: number << 8
+    return importlib.import_module("calcure.__main__")
@@ -4,32 +4,40 @@
 
 import curses
 import time
+import datetime
 import sys
 import importlib
 import threading
-from datetime import date
+import logging
 
-import holidays
-
-from calcure.calendars import Calendar
+from calcure.calendars import Calendar, next_month
+from calcure.layout import Day, DayItems, MonthLayout, make_day_cell
 from calcure.errors import Error
 from calcure.configuration import Config, get_args
 from calcure.weather import Weather
 from calcure.importers import Importer
 from calcure.dialogues import clear_line
 from calcure.screen import Screen
-from calcure.savers import TaskSaverCSV, EventSaverCSV
+from calcure.savers import TaskSaverCSV, EventSaverCSV, TaskSaverSQLite, EventSaverSQLite, BackgroundSaver
+from calcure.database import Database
 from calcure.colors import Color, initialize_colors
+from calcure.profiler import FrameTimes, Profiler, subclasses
+from calcure.watcher import make_watcher
 from calcure.loaders import *
 from calcure.data import *
 from calcure.controls import *
-from calcure.moon import get_moon_phase
 
 
+# Start counting the startup time:
+START_TIME = time.perf_counter()
+
 # Initialise config:
 cf = Config()
 error = Error(cf.LOG_FILE)
 
+# Changes are written in a separate thread, which is flushed on exit:
+background_saver = BackgroundSaver()
+
 # Language:
 if cf.LANG == "fr":
     from calcure.translations.fr import *
@@ -62,13 +70,13 @@ else:
 __version__ = "3.3"
 
 
-def read_items_from_user_arguments(screen, user_tasks, user_events, task_saver_csv, event_saver_csv):
+def read_items_from_user_arguments(screen, user_tasks, user_events, task_saver, event_saver):
     """Read --task and --event flags from user arguments to create new tasks or events"""
     args = get_args()
     if args.task:
-        user_tasks.add_item(Task(len(user_tasks.items), args.task, Status.NORMAL, Timer([]), False))
+        user_tasks.add_item(Task(user_tasks.generate_id(), args.task, Status.NORMAL, Timer([]), False))
         screen.state = AppState.EXIT
-        task_saver_csv.save()
+        task_saver.save()
     if args.event:
         try:
             parts = args.event.split("-", 3)
@@ -77,7 +85,7 @@ def read_items_from_user_arguments(screen, user_tasks, user_events, task_saver_c
             user_events.add_item(UserEvent(event_id, year, month, day, name,
                                     1, Frequency.ONCE, Status.NORMAL, False))
             screen.state = AppState.EXIT
-            event_saver_csv.save()
+            event_saver.save()
         except (ValueError, IndexError):
             pass
 
@@ -94,7 +102,7 @@ class View:
         """Display the line of text respecting the slyling and available space"""
 
         # Make sure that we display inside the screen:
-        y_max, x_max = self.stdscr.getmaxyx()
+        y_max, x_max = self.screen.frame.y_max, self.screen.frame.x_max
         if y >= y_max or x >= x_max:
             return
 
@@ -178,21 +186,24 @@ class TaskView(View):
         self.display_line(self.y, self.x + self.indent, self.info, self.color)
 
         deadline_indentation = self.screen.x_min + 2 + len(self.info) + self.indent
-        deadline_view = TaskDeadlineView(self.stdscr, self.y, deadline_indentation, self.task)
+        deadline_view = TaskDeadlineView(self.stdscr, self.y, deadline_indentation, self.task, self.screen)
         deadline_view.render()
 
         addition_indentation = (deadline_view.has_deadline)*(4 + len(deadline_view.info))
         timer_indentation = deadline_indentation + addition_indentation
-        timer_view = TimerView(self.stdscr, self.y, timer_indentation, self.task.timer)
+        timer_view = TimerView(self.stdscr, self.y, timer_indentation, self.task.timer, self.screen)
         timer_view.render()
+        if self.task.timer.is_counting:
+            self.screen.ticking_views.append(timer_view)
 
 
 class TaskDeadlineView(View):
     """Display deadline for a task"""
 
-    def __init__(self, stdscr, y, x, task):
+    def __init__(self, stdscr, y, x, task, screen):
         super().__init__(stdscr, y, x)
         self.task = task
+        self.screen = screen
         self.color = Color.DEADLINES
         self.icon = cf.DEADLINE_ICON
         self.info = f"{self.task.year}/{self.task.month}/{self.task.day}"
@@ -207,9 +218,10 @@ class TaskDeadlineView(View):
 class TimerView(View):
     """Display timer for a task"""
 
-    def __init__(self, stdscr, y, x, timer):
+    def __init__(self, stdscr, y, x, timer, screen):
         super().__init__(stdscr, y, x)
         self.timer = timer
+        self.screen = screen
         self.color = Color.TIMER if self.timer.is_counting else Color.TIMER_PAUSED
 
     @property
@@ -425,20 +437,9 @@ class DeadlineView(EventView):
 class DailyView(View):
     """Display all events occurring on this days"""
 
-    def __init__(self, stdscr, y, x, repeated_user_events, repeated_ics_events, user_events,
-                 user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen,
-                 index_offset, is_selection_day=True):
-
+    def __init__(self, stdscr, y, x, day_items, screen, index_offset, is_selection_day=True):
         super().__init__(stdscr, y, x)
-        self.repeated_user_events = repeated_user_events.filter_events_that_day(screen)
-        self.repeated_ics_events = repeated_ics_events.filter_events_that_day(screen)
-        self.user_events = user_events.filter_events_that_day(screen)
-        self.user_ics_events = user_ics_events.filter_events_that_day(screen)
-        self.user_ics_events.items = sorted(self.user_ics_events.items, key=lambda x: (x.hour is None, x.hour))
-        self.holidays = holidays.filter_events_that_day(screen)
-        self.birthdays = birthdays.filter_events_that_day(screen)
-        self.deadlines = user_tasks.filter_events_that_day(screen)
-        self.deadlines_ics = user_ics_tasks.filter_events_that_day(screen)
+        self.day_items = day_items
         self.screen = screen
         self.index_offset = index_offset
         self.y_cell = (self.screen.y_max - 3) // 6
@@ -452,7 +453,7 @@ class DailyView(View):
         index = 0
 
         # Show user events:
-        for event in self.user_events.items:
+        for event in self.day_items.user_events:
             if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
                 self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.EVENTS)
             else:
@@ -464,7 +465,8 @@ class DailyView(View):
             index += 1
 
         # Show repeated user events and events from ics:
-        for event_list in [self.repeated_user_events.items, self.user_ics_events.items, self.repeated_ics_events.items]:
+        for event_list in [self.day_items.repeated_user_events, self.day_items.user_ics_events,
+                           self.day_items.repeated_ics_events]:
             for event in event_list:
                 if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
                     self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.EVENTS)
@@ -474,7 +476,7 @@ class DailyView(View):
                 index += 1
 
         # Show deadlines for tasks, both from csv and ics files:
-        for deadline_list in [self.deadlines.items, self.deadlines_ics.items]:
+        for deadline_list in [self.day_items.deadlines, self.day_items.deadlines_ics]:
             for event in deadline_list:
                 if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
                     self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.DEADLINES)
@@ -485,7 +487,7 @@ class DailyView(View):
 
         # Show holidays:
         if cf.DISPLAY_HOLIDAYS:
-            for event in self.holidays.items:
+            for event in self.day_items.holidays:
                 if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
                     self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.HOLIDAYS)
                 else:
@@ -495,7 +497,7 @@ class DailyView(View):
 
         # Show birthdays:
         if cf.BIRTHDAYS_FROM_ABOOK:
-            for event in self.birthdays.items:
+            for event in self.day_items.birthdays:
                 if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
                     self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.BIRTHDAYS)
                 else:
@@ -509,45 +511,30 @@ class DailyView(View):
 class DayNumberView(View):
     """Display the date of the day in month with proper styling"""
 
-    def __init__(self, stdscr, y, x, screen, day, day_in_week, x_cell):
-        super().__init__(stdscr, y, x)
+    def __init__(self, stdscr, cell, x_cell, screen):
+        super().__init__(stdscr, cell.y, cell.x)
+        self.cell = cell
         self.screen = screen
-        self.day = day
-        self.day_in_week = day_in_week
+        self.day = cell.date.day
         self.x_cell = x_cell
-        self.screen.day = self.day
-
-    @property
-    def moon_icon(self):
-        """Get moon icon if needed"""
-        if cf.SHOW_MOON_PHASES:
-            return get_moon_phase(self.screen.year, self.screen.month, self.screen.day)
-        else:
-            return ""
 
     def render(self):
         """Render this view on the screen"""
-        if self.screen.date == self.screen.today:
-            today = f"{self.day}{cf.TODAY_ICON}{self.moon_icon}{' '*(self.x_cell - len(str(self.day)) - 2)} "
+        moon_icon = self.cell.moon_icon
+        if self.cell.is_today:
+            today = f"{self.day}{cf.TODAY_ICON}{moon_icon}{' '*(self.x_cell - len(str(self.day)) - 2)} "
             self.display_line(self.y, self.x, today, Color.TODAY, cf.BOLD_TODAY, cf.UNDERLINED_TODAY)
-        elif cf.COLORIZE_HOLIDAYS_DATE and self.is_holiday():
-            holiday = f"{self.day}{self.moon_icon}{' '*(self.x_cell - len(str(self.day)) - 1)}"
+        elif cf.COLORIZE_HOLIDAYS_DATE and self.cell.is_holiday:
+            holiday = f"{self.day}{moon_icon}{' '*(self.x_cell - len(str(self.day)) - 1)}"
             self.display_line(self.y, self.x, holiday, Color.HOLIDAYS_DATE, cf.BOLD_HOLIDAYS, cf.UNDERLINED_HOLIDAYS)
-        elif self.day_in_week + 1 in cf.WEEKEND_DAYS:
-            weekend = f"{self.day}{self.moon_icon}{' '*(self.x_cell - len(str(self.day)) - 1)}"
+        elif self.cell.is_weekend:
+            weekend = f"{self.day}{moon_icon}{' '*(self.x_cell - len(str(self.day)) - 1)}"
             self.display_line(self.y, self.x, weekend, Color.WEEKENDS, cf.BOLD_WEEKENDS, cf.UNDERLINED_WEEKENDS)
         else:
-            weekday = f"{self.day}{self.moon_icon}{' '*(self.x_cell - len(str(self.day)) - 1)}"
+            weekday = f"{self.day}{moon_icon}{' '*(self.x_cell - len(str(self.day)) - 1)}"
             self.display_line(self.y, self.x, weekday, Color.DAYS, cf.BOLD_DAYS, cf.UNDERLINED_DAYS)
 
 
-    def is_holiday(self):
-        """Check if current day is a holiday"""
-        country_holiday_collections = [holidays.country_holidays(country) for country in cf.HOLIDAY_COUNTRY.split(",")]
-        self_date = date(self.screen.year, self.screen.month, self.screen.day)
-        return any(self_date in holiday_collection for holiday_collection in country_holiday_collections)
-
-
 class TitleView(View):
     """Show the title in the header"""
 
@@ -564,6 +551,20 @@ class TitleView(View):
             self.display_line(0, self.screen.x_min, self.title, Color.CALENDAR_HEADER, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
 
 
+class ClockView(View):
+    """Display the current time"""
+
+    FORMAT = "%H:%M"
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+
+    def render(self):
+        """Render this view on the screen"""
+        self.display_line(self.y, self.x, time.strftime(self.FORMAT, time.localtime()), Color.TIME)
+
+
 class HeaderView(View):
     """Show the header that includes the weather, time, and title"""
 
@@ -575,8 +576,6 @@ class HeaderView(View):
 
     def render(self):
         """Render this view on the screen"""
-        _, x_max = self.stdscr.getmaxyx()
-
         # Show title:
         title_view = TitleView(self.stdscr, 0, self.screen.x_min, self.title, self.screen)
         title_view.render()
@@ -584,16 +583,21 @@ class HeaderView(View):
         if self.screen.currently_drawn == AppState.JOURNAL and self.screen.split:
             return
 
+        # Show that the data is loading:
+        if self.screen.is_loading and len(self.title) + len(MSG_LOADING) + 2 < self.screen.x_max - self.screen.x_min:
+            self.display_line(0, self.screen.x_min + len(self.title) + 2, MSG_LOADING, Color.HINTS)
+
         # Show weather is space allows and it is loaded:
         size_allows = len(self.weather.forecast) < self.screen.x_max - len(self.title)
         if cf.SHOW_WEATHER and size_allows:
             self.display_line(0, self.screen.x_max - len(self.weather.forecast) - 1, self.weather.forecast, Color.WEATHER)
 
         # Show time:
-        time_string = time.strftime("%H:%M", time.localtime())
-        size_allows = len(self.weather.forecast) < self.screen.x_max - len(self.title) - len(time_string)
+        size_allows = len(self.weather.forecast) < self.screen.x_max - len(self.title) - len(ClockView.FORMAT)
         if cf.SHOW_CURRENT_TIME and size_allows:
-            self.display_line(0, (self.screen.x_max // 2 - 2), time_string, Color.TIME)
+            clock_view = ClockView(self.stdscr, 0, (self.screen.x_max // 2 - 2), self.screen)
+            clock_view.render()
+            self.screen.ticking_views.append(clock_view)
 
 
 class FooterView(View):
@@ -642,6 +646,51 @@ class ErrorView(View):
             self.error.clear_buffer()
 
 
+class PerformanceView(View):
+    """Display how long frames take, how much data is shown, and how well caches work"""
+
+    def __init__(self, stdscr, y, x, screen, frame_times, user_events, user_ics_events,
+                 repeated_events_cache, ics_caches):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+        self.frame_times = frame_times
+        self.user_events = user_events
+        self.user_ics_events = user_ics_events
+        self.repeated_events_cache = repeated_events_cache
+        self.ics_caches = ics_caches
+
+    @staticmethod
+    def hit_rate(hits, misses):
+        """Return the share of hits in percent, if there were any lookups"""
+        return f"{100*hits/(hits + misses):.0f}%" if hits + misses else "-"
+
+    @property
+    def lines(self):
+        """Lines of text with the numbers"""
+        frames = self.frame_times
+        repetitions = sum(len(events.items) for events in self.repeated_events_cache.expansions.values())
+        repetition_hits = self.hit_rate(self.repeated_events_cache.hits, self.repeated_events_cache.misses)
+        ics_hits = self.hit_rate(sum(cache.hits for cache in self.ics_caches),
+                                 sum(cache.misses for cache in self.ics_caches))
+        since_reload = int((datetime.datetime.now() - self.screen.last_data_load_time).total_seconds())
+        return [f"Frame {frames.last*1000:.1f} ms, p50 {frames.percentile(0.5)*1000:.1f}, "
+                f"p95 {frames.percentile(0.95)*1000:.1f}",
+                f"Events {len(self.user_events.items)}, ICS {len(self.user_ics_events.items)}, "
+                f"repetitions {repetitions}",
+                f"Cache hits: repetitions {repetition_hits}, ICS {ics_hits}",
+                f"Reloaded {since_reload//60} min {since_reload % 60} s ago"]
+
+    def render(self):
+        """Render this view in the top right corner, over other views"""
+        if not self.screen.show_performance:
+            return
+        lines = self.lines
+        width = max(len(line) for line in lines) + 2
+        x = max(0, self.screen.frame.x_max - width)
+        for index, line in enumerate(lines):
+            self.display_line(self.y + index, x, f" {line:<{width - 2}} ", Color.HINTS)
+
+
 class SeparatorView(View):
     """Display the separator in the split screen"""
 
@@ -651,7 +700,7 @@ class SeparatorView(View):
 
     def render(self):
         """Render this view on the screen"""
-        _, x_max = self.stdscr.getmaxyx()
+        x_max = self.screen.frame.x_max
         week_column_width = 4 if self.screen.show_week_numbers else 0
         x_separator = x_max - self.screen.journal_pane_width
         y_cell = (self.screen.y_max - 3) // 6
@@ -752,7 +801,7 @@ class DaysNameView(View):
 class DailyScreenView(View):
     """Daily view showing events of the day"""
 
-    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen):
+    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen, repeated_events_cache):
         super().__init__(stdscr, y, x)
         self.weather = weather
         self.user_events = user_events
@@ -762,6 +811,7 @@ class DailyScreenView(View):
         self.user_tasks = user_tasks
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
+        self.repeated_events_cache = repeated_events_cache
 
     @property
     def dates(self):
@@ -791,6 +841,16 @@ class DailyScreenView(View):
         """Icon of today"""
         return cf.TODAY_ICON if self.screen.date == self.screen.today else ''
 
+    def window(self, number_of_days):
+        """Return the whole months that contain the displayed days"""
+        calendar = Calendar(0, cf.USE_PERSIAN_CALENDAR)
+        year, month = self.screen.year, self.screen.month
+        last_day = self.screen.day + number_of_days - 1
+        while last_day > calendar.last_day(year, month):
+            last_day -= calendar.last_day(year, month)
+            year, month = next_month(year, month)
+        return (self.screen.year, self.screen.month, 1), (*next_month(year, month), 1)
+
     def render(self):
         """Render this view on the screen"""
         self.screen.currently_drawn = AppState.CALENDAR
@@ -807,9 +867,10 @@ class DailyScreenView(View):
         header_view.render()
 
         # Display the events from current day to as many as possible days:
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
         max_num_days = (self.screen.y_max - 5)//2
+        window_start, window_end = self.window(max_num_days)
+        repeated_user_events = self.repeated_events_cache.get(self.user_events, window_start, window_end)
+        repeated_ics_events = self.repeated_events_cache.get(self.user_ics_events, window_start, window_end)
         vertical_shift = 0
 
         num_events = 0
@@ -821,11 +882,12 @@ class DailyScreenView(View):
             self.display_line(self.y + 2 + vertical_shift, self.x, day_string, self.color)
 
             # Display events of the day:
-            daily_view = DailyView(self.stdscr, self.y + 3 + vertical_shift, self.x, repeated_user_events,
-                                   repeated_ics_events, self.user_events, self.user_ics_events, self.holidays,
-                                   self.birthdays, self.user_tasks, self.user_ics_tasks, self.screen, num_events)
+            day_items = DayItems.collect(self.screen, repeated_user_events, repeated_ics_events, self.user_events,
+                                         self.user_ics_events, self.holidays, self.birthdays,
+                                         self.user_tasks, self.user_ics_tasks)
+            daily_view = DailyView(self.stdscr, self.y + 3 + vertical_shift, self.x, day_items, self.screen, num_events)
             daily_view.render()
-            num_events += len(self.user_events.filter_events_that_day(self.screen).items)
+            num_events += len(day_items.user_events)
 
             # Move to the next day:
             vertical_shift += daily_view.num_events_this_day + 2
@@ -839,7 +901,7 @@ class DailyScreenView(View):
 class MonthlyScreenView(View):
     """Monthly view showing events of the month"""
 
-    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen):
+    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen, repeated_events_cache):
         super().__init__(stdscr, y, x)
         self.weather = weather
         self.user_events = user_events
@@ -849,6 +911,34 @@ class MonthlyScreenView(View):
         self.user_tasks = user_tasks
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
+        self.repeated_events_cache = repeated_events_cache
+        self.layout = None
+
+    def layout_key(self):
+        """Everything the layout of the month depends on"""
+        return (self.screen.year, self.screen.month, self.screen.y_max, self.screen.x_min, self.screen.x_max,
+                self.screen.show_week_numbers, self.screen.today, self.user_events.version,
+                self.user_ics_events.version, self.holidays.version, self.birthdays.version,
+                self.user_tasks.version, self.user_ics_tasks.version)
+
+    def month_layout(self):
+        """Return the layout of the displayed month, computing it only if something has changed"""
+        key = self.layout_key()
+        if self.layout is None or self.layout.key != key:
+            window_start = (self.screen.year, self.screen.month, 1)
+            window_end = (*next_month(self.screen.year, self.screen.month), 1)
+            sources = (self.repeated_events_cache.get(self.user_events, window_start, window_end),
+                       self.repeated_events_cache.get(self.user_ics_events, window_start, window_end),
+                       self.user_events, self.user_ics_events, self.holidays, self.birthdays,
+                       self.user_tasks, self.user_ics_tasks)
+            self.layout = MonthLayout(key, self.screen.year, self.screen.month, self.screen.y_max, self.screen.x_min,
+                                      self.screen.x_max, self.screen.show_week_numbers, self.screen.today,
+                                      sources, cf)
+
+            # Loading holidays of a new year changes the key, so it is taken again:
+            self.layout.key = self.layout_key()
+        self.screen.month_layout = self.layout
+        return self.layout
 
     def render(self):
         """Render this view on the screen"""
@@ -858,51 +948,21 @@ class MonthlyScreenView(View):
         # Info about the month:
         month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
         month_year_string = month_names[self.screen.month-1] + " " + str(self.screen.year)
-        calendar = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR)
-        dates = calendar.monthdayscalendar(self.screen.year, self.screen.month)
-
-        # Calculate week numbers and adjust layout if week numbers are enabled
-        if self.screen.show_week_numbers:
-            week_numbers = calendar.month_week_numbers(self.screen.year, self.screen.month)
-            week_column_width = 4  # Space for week numbers (2 digits + 2 spaces for better separation)
-            calendar_start_x = week_column_width
-        else:
-            week_numbers = []
-            week_column_width = 0
-            calendar_start_x = 0
-
-        y_cell = (self.screen.y_max - 3) // 6
-        x_cell = (self.screen.x_max - week_column_width) // 7
+        layout = self.month_layout()
 
         header_view = HeaderView(self.stdscr, 0, 0, month_year_string, self.weather, self.screen)
-        days_name_view = DaysNameView(self.stdscr, 1, calendar_start_x, self.screen, x_cell)
+        days_name_view = DaysNameView(self.stdscr, 1, layout.calendar_start_x, self.screen, layout.x_cell)
         header_view.render()
         days_name_view.render()
 
         if self.screen.show_week_numbers:
-            week_number_view = WeekNumberView(self.stdscr, 0, 0, self.screen, week_numbers)
+            week_number_view = WeekNumberView(self.stdscr, 0, 0, self.screen, layout.week_numbers)
             week_number_view.render()
 
         # Displaying the dates and events:
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        num_events_this_month = 0
-        for row, week in enumerate(dates):
-            for col, day in enumerate(week):
-                if day != 0:
-                    # Display dates of the month with proper styles:
-                    day_in_week = col + (cf.START_WEEK_DAY - 1) - 7 * ((col + (cf.START_WEEK_DAY - 1)) > 6)
-                    day_number_view = DayNumberView(self.stdscr, 2 + row * y_cell, calendar_start_x + col * x_cell, self.screen, day, day_in_week, x_cell)
-                    day_number_view.render()
-
-                    # Display the events:
-                    self.screen.day = day
-                    daily_view = DailyView(self.stdscr, 3 + row * y_cell, calendar_start_x + col * x_cell, repeated_user_events,
-                                           repeated_ics_events, self.user_events, self.user_ics_events,
-                                           self.holidays, self.birthdays, self.user_tasks, self.user_ics_tasks,
-                                           self.screen, num_events_this_month)
-                    daily_view.render()
-                    num_events_this_month += len(self.user_events.filter_events_that_day(self.screen).items)
+        for cell in layout.cells:
+            DayNumberView(self.stdscr, cell, layout.x_cell, self.screen).render()
+            DailyView(self.stdscr, cell.y + 1, cell.x, cell.items, self.screen, cell.index_offset).render()
 
         if cf.SHOW_CALENDAR_BORDERS:
             calendar_border_view = CalenarBorderView(self.stdscr, 0, 0, self.screen)
@@ -912,7 +972,7 @@ class MonthlyScreenView(View):
 class WeeklyScreenView(View):
     """Weekly view showing 7 days as columns"""
 
-    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen):
+    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen, repeated_events_cache):
         super().__init__(stdscr, y, x)
         self.weather = weather
         self.user_events = user_events
@@ -922,6 +982,7 @@ class WeeklyScreenView(View):
         self.user_tasks = user_tasks
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
+        self.repeated_events_cache = repeated_events_cache
 
     def week_dates(self):
         """Return list of 7 date objects for the week containing the current screen date"""
@@ -954,25 +1015,22 @@ class WeeklyScreenView(View):
         HeaderView(self.stdscr, 0, 0, header_string, self.weather, self.screen).render()
         DaysNameView(self.stdscr, 1, 0, self.screen, x_cell).render()
 
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, week_start.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, week_start.year)
-
-        orig_year, orig_month, orig_day = self.screen.year, self.screen.month, self.screen.day
+        window_start = (week_start.year, week_start.month, 1)
+        window_end = (*next_month(week_end.year, week_end.month), 1)
+        repeated_user_events = self.repeated_events_cache.get(self.user_events, window_start, window_end)
+        repeated_ics_events = self.repeated_events_cache.get(self.user_ics_events, window_start, window_end)
 
         num_events = 0
         for col, d in enumerate(dates):
-            self.screen.year = d.year
-            self.screen.month = d.month
-            self.screen.day = d.day
-
-            DayNumberView(self.stdscr, 2, col * x_cell, self.screen, d.day, d.weekday(), x_cell).render()
-            daily_view = DailyView(self.stdscr, 3, col * x_cell, repeated_user_events, repeated_ics_events,
-                                   self.user_events, self.user_ics_events, self.holidays, self.birthdays,
-                                   self.user_tasks, self.user_ics_tasks, self.screen, num_events)
-            daily_view.render()
-            num_events += len(self.user_events.filter_events_that_day(self.screen).items)
-
-        self.screen.year, self.screen.month, self.screen.day = orig_year, orig_month, orig_day
+            day = Day(d.year, d.month, d.day)
+            day_items = DayItems.collect(day, repeated_user_events, repeated_ics_events, self.user_events,
+                                         self.user_ics_events, self.holidays, self.birthdays,
+                                         self.user_tasks, self.user_ics_tasks)
+            cell = make_day_cell(day, 2, col * x_cell, d.weekday(), self.screen.today, self.holidays,
+                                 day_items, num_events, cf)
+            DayNumberView(self.stdscr, cell, x_cell, self.screen).render()
+            DailyView(self.stdscr, 3, cell.x, day_items, self.screen, num_events).render()
+            num_events += len(day_items.user_events)
 
 
 class JournalScreenView(View):
@@ -1007,7 +1065,7 @@ class WelcomeScreenView(View):
 
     def calibrate_position(self):
         """Depending on the screen space calculate the best position"""
-        self.y_max, self.x_max = self.stdscr.getmaxyx()
+        self.y_max, self.x_max = self.screen.frame.y_max, self.screen.frame.x_max
 
     def render(self):
         """Draw the welcome screen"""
@@ -1039,7 +1097,7 @@ class HelpScreenView(View):
 
     def calibrate_position(self):
         """Depending on the screen space calculate the best position"""
-        self.y_max, self.x_max = self.stdscr.getmaxyx()
+        self.y_max, self.x_max = self.screen.frame.y_max, self.screen.frame.x_max
 
         if self.x_max < 102:
             self.global_shift_x = 0
@@ -1096,6 +1154,33 @@ class HelpScreenView(View):
         self.display_line(d_y + 8, d_x, MSG_KEYS_SITE, Color.TITLE)
 
 
+def import_csv_into_database(database):
+    """Fill a new database with events and tasks from CSV files"""
+    user_events = EventLoaderCSV(cf).load()
+    user_tasks = TaskLoaderCSV(cf).load()
+    EventSaverSQLite(user_events, database, cf).save_all()
+    TaskSaverSQLite(user_tasks, database, cf).save_all()
+    logging.info("Imported %d events and %d tasks into %s.", len(user_events.items), len(user_tasks.items),
+                 database.database_file)
+
+
+def export_database_to_csv(user_events, user_tasks):
+    """Write events and tasks loaded from the database into CSV files"""
+    EventSaverCSV(user_events, cf).save_all()
+    TaskSaverCSV(user_tasks, cf).save_all()
+
+
+def watched_paths(loaders):
+    """Return the files and folders that the loaders read"""
+    return {path for loader in loaders for path in loader.fingerprints.files}
+
+
+def show_frame(stdscr):
+    """Send to the terminal only the cells of the virtual screen that changed since the last frame"""
+    stdscr.noutrefresh()
+    curses.doupdate()
+
+
 def main(stdscr) -> None:
     """Main function that runs and switches screens"""
 
@@ -1108,27 +1193,49 @@ def main(stdscr) -> None:
     screen = Screen(stdscr, cf)
 
     # Initialise loaders:
-    event_loader_csv = EventLoaderCSV(cf)
-    task_loader_csv = TaskLoaderCSV(cf)
+    if cf.STORAGE == "sqlite":
+        database = Database(cf.DATABASE_FILE)
+        if not database.exists:
+            import_csv_into_database(database)
+        event_loader = EventLoaderSQLite(database, cf)
+        task_loader = TaskLoaderSQLite(database, cf)
+    else:
+        event_loader = EventLoaderCSV(cf)
+        task_loader = TaskLoaderCSV(cf)
     event_loader_ics = EventLoaderICS(cf)
     task_loader_ics = TaskLoaderICS(cf)
     birthday_loader = BirthdayLoader(cf)
     holiday_loader = HolidayLoader(cf)
 
-    # Load the data:
-    user_events = event_loader_csv.load()
-    user_tasks = task_loader_csv.load()
-    user_ics_events = event_loader_ics.load()
-    user_ics_tasks = task_loader_ics.load()
-    holidays = holiday_loader.load()
-    birthdays = birthday_loader.load()
+    # Load the data from CSV files:
+    user_events = event_loader.load()
+    user_tasks = task_loader.load()
+
+    # Slower sources are loaded in the background and displayed once they are ready:
+    user_ics_events = Events()
+    user_ics_tasks = Tasks()
+    user_ics_tasks.done_hidden = cf.HIDE_DONE_TASKS
+    holidays = Holidays()
+    birthdays = Birthdays()
+    background_loader = BackgroundLoader()
+    background_loader.start([(user_ics_events, event_loader_ics), (user_ics_tasks, task_loader_ics),
+                             (holidays, holiday_loader), (birthdays, birthday_loader)])
+    is_first_frame = True
 
     # Initialise savers and importers:
-    event_saver_csv = EventSaverCSV(user_events, cf)
-    task_saver_csv = TaskSaverCSV(user_tasks, cf)
+    if cf.STORAGE == "sqlite":
+        event_saver = EventSaverSQLite(user_events, database, cf, event_loader.fingerprints)
+        task_saver = TaskSaverSQLite(user_tasks, database, cf, task_loader.fingerprints)
+    else:
+        event_saver = EventSaverCSV(user_events, cf, event_loader.fingerprints)
+        task_saver = TaskSaverCSV(user_tasks, cf, task_loader.fingerprints)
     importer = Importer(user_tasks, user_events, cf)
+    repeated_events_cache = RepeatedEventsCache(cf.USE_PERSIAN_CALENDAR)
 
-    read_items_from_user_arguments(screen, user_tasks, user_events, task_saver_csv, event_saver_csv)
+    read_items_from_user_arguments(screen, user_tasks, user_events, task_saver, event_saver)
+    if get_args().export_csv:
+        export_database_to_csv(user_events, user_tasks)
+        screen.state = AppState.EXIT
 
     # Initialise terminal screen:
     stdscr = curses.initscr()
@@ -1139,114 +1246,222 @@ def main(stdscr) -> None:
     # Initialise screen views:
     app_view = View(stdscr, 0, 0)
     monthly_screen_view = MonthlyScreenView(stdscr, 0, 0, weather, user_events, user_ics_events,
-                                            holidays, birthdays, user_tasks, user_ics_tasks, screen)
+                                            holidays, birthdays, user_tasks, user_ics_tasks, screen, repeated_events_cache)
     weekly_screen_view = WeeklyScreenView(stdscr, 0, 0, weather, user_events, user_ics_events,
-                                          holidays, birthdays, user_tasks, user_ics_tasks, screen)
+                                          holidays, birthdays, user_tasks, user_ics_tasks, screen, repeated_events_cache)
     daily_screen_view = DailyScreenView(stdscr, 0, 0, weather, user_events, user_ics_events,
-                                        holidays, birthdays, user_tasks, user_ics_tasks, screen)
+                                        holidays, birthdays, user_tasks, user_ics_tasks, screen, repeated_events_cache)
     journal_screen_view = JournalScreenView(stdscr, 0, 0, weather, user_tasks, user_ics_tasks, screen)
     help_screen_view = HelpScreenView(stdscr, 0, 0, screen)
     welcome_screen_view = WelcomeScreenView(stdscr, 0, 0, screen)
     footer_view = FooterView(stdscr, 0, 0, screen)
     separator_view = SeparatorView(stdscr, 0, 0, screen)
     error_view = ErrorView(stdscr, 0, 0, screen)
+    frame_times = FrameTimes()
+    performance_view = PerformanceView(stdscr, 1, 0, screen, frame_times, user_events, user_ics_events,
+                                       repeated_events_cache, [event_loader_ics.cache, task_loader_ics.cache])
 
     # Show welcome screen on the first run:
     if cf.is_first_run:
         screen.state = AppState.WELCOME
     while screen.state == AppState.WELCOME:
+        screen.new_frame()
         welcome_screen_view.render()
         control_welcome_screen(stdscr, screen)
 
+    # Files read by the loaders are watched for changes made by other programs:
+    watcher = make_watcher() if cf.WATCH_DATA_FILES else None
+    ics_loaders = [(user_ics_events, event_loader_ics), (user_ics_tasks, task_loader_ics)]
+    changed_paths = set()
+    if watcher is not None:
+        watcher.watch(watched_paths([event_loader, task_loader]))
+
     # Running different screens depending on the state:
+    screen_size = (screen.frame.y_max, screen.frame.x_max)
+    is_data_reloaded = False
     while screen.state != AppState.EXIT:
-        # The screen is completely redrawn on each iteration of the loop. This
-        # causes flicker on each iteration. If the screen would have to be
-        # redrawn anyway, this is a non-issue, but redrawing only parts of the
-        # screen should be the preferred default.
-        # Note that the loop generally hangs waiting for user input.
-        stdscr.clear()
-
-        if user_tasks.has_active_timer and screen.state == AppState.JOURNAL:
+
+        # Take the size of the terminal and today's date once for the whole frame:
+        screen.new_frame()
+
+        # Display the data loaded in the background, if it is ready:
+        is_data_merged = background_loader.merge()
+        if is_data_merged and watcher is not None:
+            watcher.watch(watched_paths([loader for _, loader in ics_loaders]))
+        if is_data_merged or is_data_reloaded:
+            screen.last_data_load_time = datetime.datetime.now()
+        screen.is_loading = background_loader.is_loading
+
+        if ((user_tasks.has_active_timer and screen.state == AppState.JOURNAL) or screen.is_loading
+                or watcher is not None):
             # By setting a `halfdelay`, we only wait for user input for the
             # configured number of seconds, then we crash. This causes another
-            # iteration of the loop, which redraws the screen and updates the
-            # timer as a consequence. A bit hacky.
+            # iteration of the loop, which updates the timers and the clock or
+            # shows the loaded data as a consequence. A bit hacky.
+            # While files are watched, this wakeup is always on, since curses
+            # cannot be woken by the watcher. A wakeup without changes only
+            # redraws the ticking views.
             curses.halfdelay(cf.REFRESH_INTERVAL * 10)
         else:
             # We make sure there is no active `halfdelay` to prevent flickering.
             curses.cbreak()
 
-        # Calendar screens:
-        if screen.state == AppState.CALENDAR:
+        frame_start = time.perf_counter()
 
-            if screen.calendar_state == CalState.MONTHLY:
-                monthly_screen_view.render()
-            elif screen.calendar_state == CalState.WEEKLY:
-                weekly_screen_view.render()
+        # If waiting for input timed out and the data did not change, only the time has to be updated:
+        if screen.input_timed_out and not is_data_merged and not is_data_reloaded:
+            for view in screen.ticking_views:
+                view.render()
+
+        # Otherwise, views are drawn from scratch into the virtual screen of curses,
+        # and curses compares it with what the terminal shows, sending only the
+        # cells that changed. The whole terminal is repainted only when its size changes:
+        else:
+            if (screen.frame.y_max, screen.frame.x_max) != screen_size:
+                screen_size = (screen.frame.y_max, screen.frame.x_max)
+                stdscr.clear()
             else:
-                daily_screen_view.render()
+                stdscr.erase()
+            screen.ticking_views = []
 
-            if screen.split:
+            # Calendar screens:
+            if screen.state == AppState.CALENDAR:
+                if screen.calendar_state == CalState.MONTHLY:
+                    monthly_screen_view.render()
+                elif screen.calendar_state == CalState.WEEKLY:
+                    weekly_screen_view.render()
+                else:
+                    daily_screen_view.render()
+                if screen.split:
+                    journal_screen_view.render()
+                    separator_view.render()
+                footer_view.render()
+                error_view.render()
+                performance_view.render()
+
+            # Journal screen:
+            elif screen.state == AppState.JOURNAL:
+                if screen.split:
+                    if screen.calendar_state == CalState.MONTHLY:
+                        monthly_screen_view.render()
+                    elif screen.calendar_state == CalState.WEEKLY:
+                        weekly_screen_view.render()
+                    else:
+                        daily_screen_view.render()
+                    separator_view.render()
                 journal_screen_view.render()
-                separator_view.render()
-            footer_view.render()
-            error_view.render()
+                footer_view.render()
+                error_view.render()
+                performance_view.render()
+
+            # Help screen:
+            elif screen.state == AppState.HELP:
+                help_screen_view.render()
+
+        show_frame(stdscr)
+        frame_times.add(time.perf_counter() - frame_start)
+        if is_first_frame:
+            logging.info("Time to first frame: %.3f s.", time.perf_counter() - START_TIME)
+            is_first_frame = False
 
+        # Handle user input:
+        if screen.state == AppState.CALENDAR:
             if screen.calendar_state == CalState.MONTHLY:
                 control_monthly_screen(stdscr, screen, user_events, importer)
             elif screen.calendar_state == CalState.WEEKLY:
                 control_weekly_screen(stdscr, screen, user_events, importer)
             else:
                 control_daily_screen(stdscr, screen, user_events, importer)
-
-        # Journal screen:
         elif screen.state == AppState.JOURNAL:
-            if screen.split:
-                if screen.calendar_state == CalState.MONTHLY:
-                    monthly_screen_view.render()
-                elif screen.calendar_state == CalState.WEEKLY:
-                    weekly_screen_view.render()
-                else:
-                    daily_screen_view.render()
-                separator_view.render()
-            journal_screen_view.render()
-            footer_view.render()
-            error_view.render()
             control_journal_screen(stdscr, screen, user_tasks, importer)
-
-        # Help screen:
         elif screen.state == AppState.HELP:
-            help_screen_view.render()
             control_help_screen(stdscr, screen)
-
         else:
             break
 
         # If something has been changed, save the data:
         if user_events.changed:
-            event_saver_csv.save()
+            background_saver.save(event_saver)
         if user_tasks.changed:
-            task_saver_csv.save()
+            background_saver.save(task_saver)
 
-        # If needed, reload the data:
+        # If needed, reload the files that changed, once our own changes are written:
+        is_data_reloaded = False
         if screen.is_time_to_reload:
-            user_events = event_loader_csv.load()
-            user_tasks = task_loader_csv.load()
-            user_ics_events = event_loader_ics.load()
-            user_ics_tasks = task_loader_ics.load()
+            background_saver.flush()
+            if not event_loader.fingerprints.are_unchanged:
+                user_events = event_loader.load()
+                is_data_reloaded = True
+            if not task_loader.fingerprints.are_unchanged:
+                user_tasks = task_loader.load()
+                is_data_reloaded = True
+            background_loader.start(ics_loaders)
+
+        # Reload the files that other programs changed, reading again only the changed ics files:
+        if watcher is not None:
+            changed_paths |= watcher.take_changes()
+        if changed_paths and not background_loader.is_loading:
+            background_saver.flush()
+            if not event_loader.fingerprints.are_unchanged:
+                user_events = event_loader.load()
+                is_data_reloaded = True
+            if not task_loader.fingerprints.are_unchanged:
+                user_tasks = task_loader.load()
+                is_data_reloaded = True
+            for _, loader in ics_loaders:
+                loader.fingerprints.mark_changed(changed_paths)
+            changed_ics_loaders = [(collection, loader) for collection, loader in ics_loaders
+                                   if loader.fingerprints.changed_paths]
+            if changed_ics_loaders:
+                background_loader.start(changed_ics_loaders)
+            changed_paths = set()
 
     # Cleaning up before quitting:
+    background_saver.flush()
+    if cf.STORAGE == "sqlite":
+        database.close()
+    else:
+        event_saver.compact()
+        task_saver.compact()
     curses.echo()
     curses.curs_set(True)
     curses.endwin()
 
 
+def start_profiler():
+    """Measure time of loaders, views, repetitions of events and savers until the program exits"""
+    profile_folder = cf.LOG_FILE.parent
+    stats_file = profile_folder / "profile.pstats" if cf.PROFILE == "pstats" else None
+    profiler = Profiler(profile_folder / "profile.txt", stats_file)
+    for loader in [EventLoaderCSV, TaskLoaderCSV, EventLoaderSQLite, TaskLoaderSQLite, EventLoaderICS, TaskLoaderICS,
+                   HolidayLoader, BirthdayLoader]:
+        profiler.measure(loader, "load")
+    profiler.measure(HolidayLoader, "load_year")
+    for view in subclasses(View):
+        if "render" in view.__dict__:
+            profiler.measure(view, "render")
+    profiler.measure(RepeatedEvents, "__init__", "RepeatedEvents")
+    for saver in [EventSaverCSV, TaskSaverCSV, EventSaverSQLite, TaskSaverSQLite]:
+        profiler.measure(saver, "snapshot")
+        profiler.measure(saver, "write")
+    profiler.start()
+    return profiler
+
+
 def cli() -> None:
+    # Processes that parse files in parallel set up the main module again. Started by the console script,
+    # they would run the whole setup of the program, while this module is skipped as with python -m calcure:
+    sys.modules["__main__"] = sys.modules[__name__]
+
+    profiler = start_profiler() if cf.PROFILE else None
     try:
         curses.wrapper(main)
     except (KeyboardInterrupt, curses.error): # Hides strange curses quitting error
         pass
+    finally:
+        background_saver.flush()
+        if profiler is not None:
+            profiler.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""Module that stores results of slow operations on disk to reuse them on the next run"""
+
+import hashlib
+import importlib.metadata
+import logging
+import pickle
+from pathlib import Path
+
+
+def content_digest(text):
+    """Return a short hash of the text"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ParsedICSCache:
+    """Events or tasks parsed from ICS files, reused while the files do not change.
+    Entries are identified by the path or URL of the file and checked against
+    its modification time and size, and then against the hash of its content"""
+
+    VERSION = 1
+
+    def __init__(self, cache_file, settings):
+        self.cache_file = Path(cache_file)
+        self.settings = settings
+        self.entries = None
+        self.used = set()
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+
+    def read(self):
+        """Read the cache file once, discarding it if it was made by another version or settings"""
+        if self.entries is not None:
+            return
+        self.entries = {}
+        try:
+            with open(self.cache_file, "rb") as file:
+                version, settings, entries = pickle.load(file)
+            if version == self.VERSION and settings == self.settings:
+                self.entries = entries
+        except FileNotFoundError:
+            pass
+        except Exception as e_message:
+            logging.error("Failed to read cache %s. %s", self.cache_file, e_message)
+
+    def get_by_stat(self, source, stat):
+        """Return items of the source if its modification time and size did not change"""
+        self.read()
+        entry = self.entries.get(source)
+        if stat is None or entry is None:
+            return None
+        mtime_ns, size, _, items = entry
+        if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+            return None
+        self.used.add(source)
+        self.hits += 1
+        return items
+
+    def get_by_digest(self, source, digest, stat):
+        """Return items of the source if its content did not change"""
+        self.read()
+        entry = self.entries.get(source)
+        if entry is None or entry[2] != digest:
+            self.misses += 1
+            return None
+        self.put(source, digest, stat, entry[3])
+        self.hits += 1
+        return entry[3]
+
+    def put(self, source, digest, stat, items):
+        """Store items parsed from the source"""
+        self.read()
+        mtime_ns = stat.st_mtime_ns if stat is not None else None
+        size = stat.st_size if stat is not None else None
+        self.entries[source] = (mtime_ns, size, digest, items)
+        self.used.add(source)
+        self.changed = True
+
+    def keep(self, sources):
+        """Keep entries of the sources that were not read again in this load"""
+        self.used.update(sources)
+
+    def save(self):
+        """Write the cache file, keeping only the sources that were used in this load"""
+        if self.entries is None:
+            return
+        unused = set(self.entries) - self.used
+        for source in unused:
+            del self.entries[source]
+        self.used = set()
+        if not self.changed and not unused:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            dummy_file = Path(f"{self.cache_file}.tmp")
+            with open(dummy_file, "wb") as file:
+                pickle.dump((self.VERSION, self.settings, self.entries), file, protocol=pickle.HIGHEST_PROTOCOL)
+            dummy_file.replace(self.cache_file)
+            self.changed = False
+        except Exception as e_message:
+            logging.error("Failed to write cache %s. %s", self.cache_file, e_message)
+
+
+class URLCache:
+    """Last downloaded content of subscribed URLs with the headers needed to ask the server
+    whether it changed. Each URL is kept in its own file, so that URLs can be saved in parallel"""
+
+    def __init__(self, cache_folder):
+        self.cache_folder = Path(cache_folder)
+
+    def file_of(self, url):
+        """Return the cache file of the URL"""
+        return self.cache_folder / f"{content_digest(url)}.pickle"
+
+    def get(self, url):
+        """Return ETag, Last-Modified and text of the URL saved last time, or None"""
+        try:
+            with open(self.file_of(url), "rb") as file:
+                saved_url, etag, last_modified, text = pickle.load(file)
+            return (etag, last_modified, text) if saved_url == url else None
+        except FileNotFoundError:
+            return None
+        except Exception as e_message:
+            logging.error("Failed to read cache of %s. %s", url, e_message)
+            return None
+
+    def put(self, url, etag, last_modified, text):
+        """Save the text of the URL and its headers"""
+        cache_file = self.file_of(url)
+        try:
+            self.cache_folder.mkdir(parents=True, exist_ok=True)
+            dummy_file = Path(f"{cache_file}.tmp")
+            with open(dummy_file, "wb") as file:
+                pickle.dump((url, etag, last_modified, text), file, protocol=pickle.HIGHEST_PROTOCOL)
+            dummy_file.replace(cache_file)
+        except Exception as e_message:
+            logging.error("Failed to write cache of %s. %s", url, e_message)
+
+
+class HolidayCache:
+    """Holidays generated by the holidays module for each (country, subdivision, year),
+    reused while the same version of the module is installed"""
+
+    VERSION = 1
+
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self.module_version = None
+        self.tables = None
+        self.changed = False
+
+    def read(self):
+        """Read the cache file once, discarding it if it was made with another version of holidays"""
+        if self.tables is not None:
+            return
+        self.tables = {}
+        try:
+            self.module_version = importlib.metadata.version("holidays")
+        except importlib.metadata.PackageNotFoundError:
+            return
+        try:
+            with open(self.cache_file, "rb") as file:
+                version, module_version, tables = pickle.load(file)
+            if version == self.VERSION and module_version == self.module_version:
+                self.tables = tables
+        except FileNotFoundError:
+            pass
+        except Exception as e_message:
+            logging.error("Failed to read cache %s. %s", self.cache_file, e_message)
+
+    def get(self, key):
+        """Return the table of holidays saved for the key, or None"""
+        self.read()
+        return self.tables.get(key)
+
+    def put(self, key, table):
+        """Store the table of holidays generated for the key"""
+        self.read()
+        self.tables[key] = table
+        self.changed = True
+
+    def save(self):
+        """Write the cache file if new tables were added"""
+        if not self.changed or self.module_version is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            dummy_file = Path(f"{self.cache_file}.tmp")
+            with open(dummy_file, "wb") as file:
+                pickle.dump((self.VERSION, self.module_version, self.tables), file, protocol=pickle.HIGHEST_PROTOCOL)
+            dummy_file.replace(self.cache_file)
+            self.changed = False
+        except Exception as e_message:
+            logging.error("Failed to write cache %s. %s", self.cache_file, e_message)
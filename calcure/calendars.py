@@ -19,6 +19,31 @@ def convert_to_gregorian_date(year, month, day):
     return gregorian_date.year, gregorian_date.month, gregorian_date.day
 
 
+def date_to_ordinal(year, month, day, use_persian_calendar):
+    """Return the number of the day counted from the first day of the Gregorian calendar"""
+    if use_persian_calendar:
+        import jdatetime
+        return jdatetime.date(year, month, day).togregorian().toordinal()
+    return datetime.date(year, month, day).toordinal()
+
+
+def ordinal_to_date(ordinal, use_persian_calendar):
+    """Return year, month, and day of the day with the given ordinal number"""
+    gregorian_date = datetime.date.fromordinal(ordinal)
+    if use_persian_calendar:
+        import jdatetime
+        persian_date = jdatetime.date.fromgregorian(date=gregorian_date)
+        return persian_date.year, persian_date.month, persian_date.day
+    return gregorian_date.year, gregorian_date.month, gregorian_date.day
+
+
+def next_month(year, month):
+    """Return the year and month following the given month"""
+    if month == 12:
+        return year + 1, 1
+    return year, month + 1
+
+
 class Calendar:
     """
     Calendar class, but in contrast to native calendar library, here
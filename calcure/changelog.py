@@ -0,0 +1,112 @@
+"""Module that keeps changes of a CSV file in a log next to it, so that a change does not rewrite the whole file"""
+
+import csv
+import logging
+import shutil
+from pathlib import Path
+
+
+class ChangeLog:
+    """Append-only log of items added, changed or deleted since the CSV file was last rewritten.
+
+    Records are CSV rows: "set" with the id and the row of an item, "delete" with the id,
+    "order" with the ids of all items in their new order, and "ids" with the ids that items
+    of the CSV file had in the program when it was rewritten. The first row of the log stores
+    the size and modification time of the CSV file and the number of its rows, so that it is
+    known if someone else changed the file after the log was started, and which items of the
+    log were added rather than changed"""
+
+    def __init__(self, base_file):
+        self.base_file = Path(base_file)
+        self.log_file = Path(f"{base_file}.log")
+        self.stale_file = Path(f"{self.log_file}.stale")
+
+    def fingerprint(self):
+        """Return the part of the header that identifies the current state of the CSV file"""
+        try:
+            stat = self.base_file.stat()
+            return ["base", str(stat.st_size), str(stat.st_mtime_ns)]
+        except OSError:
+            return ["base", "0", "0"]
+
+    def header(self):
+        """Return the first row of a log started for the current state of the CSV file"""
+        try:
+            with open(self.base_file, "r", encoding="utf-8", newline="") as file:
+                rows = sum(1 for _ in csv.reader(file))
+        except OSError:
+            rows = 0
+        return [*self.fingerprint(), str(rows)]
+
+    def is_started_for_base(self, header):
+        """Check if the log with this header was started for the CSV file as it is now"""
+        return header[:3] == self.fingerprint()
+
+    @staticmethod
+    def base_rows(header):
+        """Return the number of rows that the CSV file had when the log with this header was started"""
+        try:
+            return int(header[3])
+        except (IndexError, ValueError):
+            return 0
+
+    @property
+    def exists(self):
+        """Check if there are changes that are not yet folded into the CSV file"""
+        return self.log_file.exists()
+
+    @property
+    def is_larger_than_base(self):
+        """Check if the log takes more space than the CSV file, so that rewriting the file is worth it"""
+        try:
+            return self.log_file.stat().st_size > self.base_file.stat().st_size
+        except OSError:
+            return False
+
+    def read(self):
+        """Return the header and the records of the log, or None and no records if there is no log"""
+        try:
+            with open(self.log_file, "r", encoding="utf-8", newline="") as file:
+                rows = list(csv.reader(file))
+        except OSError: # There is no log
+            return None, []
+        if not rows:
+            return None, []
+        return rows[0], rows[1:]
+
+    def append(self, records):
+        """Add records to the end of the log, starting the log if needed"""
+        if not records:
+            return
+        try:
+            with open(self.log_file, "a", encoding="utf-8", newline="") as file:
+                writer = csv.writer(file)
+                if file.tell() == 0:
+                    writer.writerow(self.header())
+                writer.writerows(records)
+        except OSError as e_message:
+            logging.error("Failed to write changes into %s. %s", self.log_file, e_message)
+
+    def rebase(self, records):
+        """Start the log anew for the current state of the CSV file with the records, which give
+        the same items on top of it. The old log is kept as a copy, in case the records were
+        applied to rows that someone else moved"""
+        try:
+            shutil.copyfile(self.log_file, self.stale_file)
+            dummy_file = Path(f"{self.log_file}.tmp")
+            with open(dummy_file, "w", encoding="utf-8", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(self.header())
+                writer.writerows(records)
+            dummy_file.replace(self.log_file)
+            logging.info("%s was changed since %s was started, the changes were applied to its new content "
+                         "and the old log was copied to %s.", self.base_file, self.log_file, self.stale_file)
+        except OSError as e_message:
+            logging.error("Failed to start %s anew. %s", self.log_file, e_message)
+
+    def clear(self):
+        """Remove the log once the CSV file contains all changes"""
+        try:
+            self.log_file.unlink(missing_ok=True)
+        except OSError as e_message:
+            logging.error("Failed to remove %s. %s", self.log_file, e_message)
@@ -2,6 +2,7 @@
 
 import argparse
 import configparser
+import os
 import sys
 import logging
 import datetime
@@ -25,6 +26,11 @@ def _build_arg_parser():
     parser.add_argument("--config", help="path to config file", metavar="PATH")
     parser.add_argument("--task", help="add a task and exit", metavar="NAME")
     parser.add_argument("--event", help="add an event and exit (format: YYYY-MM-DD-name)", metavar="DATE-NAME")
+    parser.add_argument("--export-csv", help="write events and tasks from the SQLite storage into CSV files and exit",
+                        action="store_true")
+    parser.add_argument("--profile", help="measure time of loading, drawing and saving, and write it next to the log "
+                        "file on exit (pstats: also save cProfile statistics)", nargs="?", const="summary",
+                        choices=["summary", "pstats"])
     return parser
 
 
@@ -47,6 +53,7 @@ class Config:
         self.config_folder = self.home_path / ".config" / "calcure"
         self.config_file = self.config_folder / "config.ini"
         self.log_file = self.config_folder / "info.log"
+        self.cache_folder = Path(os.environ.get("XDG_CACHE_HOME") or self.home_path / ".cache") / "calcure"
         self.is_first_run= True
 
         # Create config folder:
@@ -77,6 +84,8 @@ class Config:
         conf = configparser.ConfigParser()
         conf["Parameters"] = {
                 "folder_with_datafiles":     self.shorten_path(self.config_folder),
+                "storage":                   "csv",
+                "csv_change_log":            "No",
                 "calcurse_todo_file":        self.shorten_path(self.calcurse_todo_file),
                 "calcurse_events_file":      self.shorten_path(self.calcurse_events_file),
                 "log_file":                  self.shorten_path(self.log_file),
@@ -113,6 +122,7 @@ class Config:
                 "weekend_days":              "6,7",
                 "refresh_interval":          "1",
                 "data_reload_interval":      "0",
+                "watch_data_files":          "Yes",
                 "split_screen":              "Yes",
                 "inverse_daily_scroll":      "No",
                 "right_pane_percentage":     "25",
@@ -296,6 +306,7 @@ class Config:
             self.IMPORTANT_ICON        = conf.get("Parameters", "important_icon", fallback="‣") if self.DISPLAY_ICONS else "!"
             self.REFRESH_INTERVAL      = int(conf.get("Parameters", "refresh_interval", fallback=1))
             self.DATA_RELOAD_INTERVAL  = int(conf.get("Parameters", "data_reload_interval", fallback=0))
+            self.WATCH_DATA_FILES      = conf.getboolean("Parameters", "watch_data_files", fallback=True)
             self.RIGHT_PANE_PERCENTAGE = int(conf.get("Parameters", "right_pane_percentage", fallback=25))
             self.ONE_TIMER_AT_A_TIME   = conf.getboolean("Parameters", "one_timer_at_a_time", fallback=False)
 
@@ -308,6 +319,8 @@ class Config:
             if self.ICS_TASK_FILES is not None:
                 self.ICS_TASK_FILES = [str(i) for i in self.ICS_TASK_FILES.split(",")]
 
+            self.ICS_URL_TIMEOUT = float(conf.get("Parameters", "ics_url_timeout", fallback=10))
+
             # Calendar colors:
             self.COLOR_TODAY           = int(conf.get("Colors", "color_today", fallback=2))
             self.COLOR_EVENTS          = int(conf.get("Colors", "color_events", fallback=4))
@@ -379,6 +392,9 @@ class Config:
             self.data_folder = Path(self.data_folder).expanduser()
             self.EVENTS_FILE = self.data_folder / "events.csv"
             self.TASKS_FILE = self.data_folder / "tasks.csv"
+            self.DATABASE_FILE = self.data_folder / "calcure.db"
+            self.STORAGE = conf.get("Parameters", "storage", fallback="csv").lower()
+            self.CSV_CHANGE_LOG = conf.getboolean("Parameters", "csv_change_log", fallback=False)
 
         except Exception:
             ERR_FILE1 = "Looks like there is a problem in your config.ini file. Perhaps you edited it and entered a wrong line. "
@@ -398,11 +414,13 @@ class Config:
     def read_parameters_from_user_arguments(self):
         """Read user arguments that were provided at the run. These values take priority over config.ini"""
         args = get_args()
+        self.PROFILE = args.profile
         if args.folder:
             self.data_folder = Path(args.folder).expanduser()
             self.data_folder.mkdir(exist_ok=True)
             self.EVENTS_FILE = self.data_folder / "events.csv"
             self.TASKS_FILE = self.data_folder / "tasks.csv"
+            self.DATABASE_FILE = self.data_folder / "calcure.db"
         if args.p:
             self.PRIVACY_MODE = True
         if args.j:
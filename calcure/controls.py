@@ -63,8 +63,14 @@ def block_until_valid_input(accepted_keys):
     """Decorator preventing flickering on no-op keypresses."""
     def decorator(func):
         def inner(stdscr, screen, *args, **kwargs):
+            screen.input_timed_out = False
             while not screen.selection_mode:
-                screen.key = stdscr.getkey()
+                try:
+                    screen.key = stdscr.getkey()
+                except curses.error:
+                    # No key was pressed during the halfdelay:
+                    screen.input_timed_out = True
+                    raise
                 if vim_style_exit(stdscr, screen):
                     confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATION_TO_QUIT)
                     if confirmed:
@@ -89,44 +95,51 @@ def control_monthly_screen(stdscr, screen, user_events, importer):
         # Change event status:
         if screen.key in [KEY_IMPORTANT, "h"]:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_HIGH)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 user_events.toggle_item_status(event_id, Status.IMPORTANT)
         if screen.key == KEY_LOW:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_LOW)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 user_events.toggle_item_status(event_id, Status.UNIMPORTANT)
         if screen.key == KEY_UNMARK:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_RESET)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 user_events.toggle_item_status(event_id, Status.NORMAL)
         if screen.key == KEY_DONE:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_DONE)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 user_events.toggle_item_status(event_id, Status.DONE)
 
         # Toggle event privacy:
         if screen.key == KEY_PRIVACY_ITEM:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_PRIVACY)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 user_events.toggle_item_privacy(event_id)
 
         # Delete event:
         if screen.key == KEY_DELETE:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_DEL)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 user_events.delete_item(event_id)
 
         # Rename event:
         if screen.key in [KEY_EDIT, "r"]:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_REN)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 clear_line(stdscr, screen.y_max-2)
                 new_name = input_string(stdscr, screen.y_max-2, 0, MSG_NEW_TITLE, screen.x_max-len(MSG_NEW_TITLE)-2)
                 user_events.rename_item(event_id, new_name)
@@ -134,8 +147,9 @@ def control_monthly_screen(stdscr, screen, user_events, importer):
         # Move event:
         if screen.key in [KEY_MOVE, KEY_MOVE_IN_MONTH]:
             number = input_integer(stdscr, screen.y_max-2, 0, MSG_EVENT_MV)
-            if user_events.filter_events_that_month(screen).is_valid_number(number):
-                event_id = user_events.filter_events_that_month(screen).items[number].item_id
+            event = screen.month_layout.event_by_number(number)
+            if event is not None:
+                event_id = event.item_id
                 clear_line(stdscr, screen.y_max-2)
                 if screen.key == KEY_MOVE:
                     year, month, day = input_date(stdscr, screen.y_max-2, 0, MSG_EVENT_MV_TO)
@@ -153,7 +167,7 @@ def control_monthly_screen(stdscr, screen, user_events, importer):
         # If we need to select an event, change to selection mode:
         selection_keys = [KEY_IMPORTANT, KEY_LOW, KEY_UNMARK, KEY_DONE, KEY_DELETE,
                           KEY_EDIT, KEY_MOVE, KEY_MOVE_IN_MONTH, KEY_PRIVACY_ITEM, "h", "r", "c"]
-        if screen.key in selection_keys and user_events.filter_events_that_month(screen).items:
+        if screen.key in selection_keys and screen.month_layout.numbered_events:
             screen.selection_mode = True
 
         # Navigation:
@@ -240,6 +254,8 @@ def control_monthly_screen(stdscr, screen, user_events, importer):
             screen.state = AppState.EXIT if confirmed else screen.state
         if screen.key == KEY_SPLIT:
             screen.split = not screen.split
+        if screen.key == KEY_PERFORMANCE:
+            screen.show_performance = not screen.show_performance
         if screen.key == KEY_VIEW_WEEK_NUMBERS:
             screen.show_week_numbers = not screen.show_week_numbers
 
@@ -391,6 +407,8 @@ def control_daily_screen(stdscr, screen, user_events, importer):
             screen.state = AppState.EXIT if confirmed else screen.state
         if screen.key == KEY_SPLIT:
             screen.split = not screen.split
+        if screen.key == KEY_PERFORMANCE:
+            screen.show_performance = not screen.show_performance
         if screen.key == KEY_VIEW_WEEK_NUMBERS:
             screen.show_week_numbers = not screen.show_week_numbers
 
@@ -557,6 +575,8 @@ def control_weekly_screen(stdscr, screen, user_events, importer):
             screen.state = AppState.EXIT if confirmed else screen.state
         if screen.key == KEY_SPLIT:
             screen.split = not screen.split
+        if screen.key == KEY_PERFORMANCE:
+            screen.show_performance = not screen.show_performance
         if screen.key == KEY_VIEW_WEEK_NUMBERS:
             screen.show_week_numbers = not screen.show_week_numbers
 
@@ -731,6 +751,8 @@ def control_journal_screen(stdscr, screen, user_tasks, importer):
             screen.state = AppState.EXIT if confirmed else screen.state
         if screen.key == KEY_SPLIT:
             screen.split = not screen.split
+        if screen.key == KEY_PERFORMANCE:
+            screen.show_performance = not screen.show_performance
 
 
 @safe_run
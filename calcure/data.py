@@ -4,9 +4,12 @@ import datetime
 import logging
 import time
 import enum
+import re
+import weakref
+from collections import OrderedDict
 
 from dateutil.rrule import rruleset, rrulestr
-from calcure.calendars import Calendar
+from calcure.calendars import Calendar, date_to_ordinal, ordinal_to_date
 
 
 class AppState(enum.Enum):
@@ -89,6 +92,51 @@ class UserEvent(Event):
         local_timezone = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
         return datetime.datetime(self.year, self.month, self.day, self.hour or 0, self.minute or 0, tzinfo=local_timezone)
 
+    @property
+    def step_in_days(self):
+        """Number of days between repetitions, for events repeated with a fixed number of days"""
+        return {Frequency.DAILY: 1, Frequency.WEEKLY: 7, Frequency.BIWEEKLY: 14}.get(self.frequency)
+
+    def occurrences(self, start, end, use_persian_calendar):
+        """Return dates of the event and its repetitions within [start, end) without going through all of them.
+        Start and end are (year, month, day) tuples in the calendar used for display"""
+        dates = []
+        calendar = Calendar(0, use_persian_calendar)
+
+        if self.step_in_days:
+            step = self.step_in_days
+            try:
+                first_ordinal = date_to_ordinal(self.year, self.month, self.day, use_persian_calendar)
+                start_ordinal = date_to_ordinal(*start, use_persian_calendar)
+                end_ordinal = date_to_ordinal(*end, use_persian_calendar)
+            except ValueError:
+                return dates
+            first_repetition = max(0, -((first_ordinal - start_ordinal) // step))
+            last_repetition = min(self.repetition - 1, (end_ordinal - 1 - first_ordinal) // step)
+            for repetition in range(first_repetition, last_repetition + 1):
+                dates.append(ordinal_to_date(first_ordinal + repetition*step, use_persian_calendar))
+
+        elif self.frequency == Frequency.MONTHLY:
+            first_month = 12*self.year + self.month - 1
+            first_repetition = max(0, 12*start[0] + start[1] - 1 - first_month)
+            last_repetition = min(self.repetition - 1, 12*end[0] + end[1] - 1 - first_month)
+            for repetition in range(first_repetition, last_repetition + 1):
+                year, month = divmod(first_month + repetition, 12)
+                dates.append((year, month + 1, self.day))
+
+        elif self.frequency == Frequency.YEARLY:
+            first_repetition = max(0, start[0] - self.year)
+            last_repetition = min(self.repetition - 1, end[0] - self.year)
+            for repetition in range(first_repetition, last_repetition + 1):
+                dates.append((self.year + repetition, self.month, self.day))
+
+        else:
+            dates.append((self.year, self.month, self.day))
+
+        # Skip dates outside of the window and days that do not exist in some months or years:
+        return [(year, month, day) for (year, month, day) in dates
+                if start <= (year, month, day) < end and 1 <= month <= 12 and 0 < day <= calendar.last_day(year, month)]
+
 
 class UserRepeatedEvent(Event):
     """Events that are repetitions of the original user events"""
@@ -152,20 +200,102 @@ class Collection:
 
     def __init__(self):
         self.items = []
+        self.version = 0
+        self.tracks_changes = False
+        self.modified_items = {}
+        self.deleted_items = {}
+        self.is_order_changed = False
         self.changed = False
+        self.index = {}
+
+    @property
+    def changed(self):
+        """Whether the collection has unsaved changes"""
+        return self._changed
+
+    @changed.setter
+    def changed(self, value):
+        """Mark the collection as (un)changed, counting every change in its version.
+        Once the collection is saved or loaded, its record of changed items starts anew"""
+        if value:
+            self.version += 1
+        else:
+            self.modified_items = {}
+            self.deleted_items = {}
+            self.is_order_changed = False
+        self._changed = value
+
+    def mark_modified(self, item):
+        """Mark the collection as changed, remembering the added or changed item if changes are tracked"""
+        if self.tracks_changes:
+            self.modified_items[id(item)] = item
+            self.deleted_items.pop(id(item), None)
+        self.changed = True
+
+    def mark_deleted(self, item):
+        """Mark the collection as changed, remembering the deleted item if changes are tracked"""
+        if self.tracks_changes:
+            self.deleted_items[id(item)] = item
+            self.modified_items.pop(id(item), None)
+        self.changed = True
+
+    def date_key(self, item):
+        """Key under which an item is stored in the date index"""
+        return (item.year, item.month, item.day)
+
+    def index_item(self, item):
+        """Add an item to the date index"""
+        self.index.setdefault(self.date_key(item), []).append(item)
+
+    def unindex_item(self, item):
+        """Remove an item from the date index"""
+        key = self.date_key(item)
+        bucket = self.index.get(key)
+        if bucket is None:
+            return
+        for position, indexed_item in enumerate(bucket):
+            if indexed_item is item:
+                del bucket[position]
+                break
+        if not bucket:
+            del self.index[key]
+
+    def reindex_key(self, key):
+        """Rebuild one bucket of the index so that it follows the order of items"""
+        bucket = [item for item in self.items if self.date_key(item) == key]
+        if bucket:
+            self.index[key] = bucket
+        else:
+            self.index.pop(key, None)
+
+    def rebuild_index(self):
+        """Rebuild the whole date index from the list of items"""
+        self.index = {}
+        for item in self.items:
+            self.index_item(item)
+
+    def move_item_to_date(self, item, new_year, new_month, new_day):
+        """Change the date of an item and keep the index up to date"""
+        self.unindex_item(item)
+        item.year = new_year
+        item.month = new_month
+        item.day = new_day
+        self.reindex_key(self.date_key(item))
 
     def add_item(self, item):
         """Add an item to the collection"""
         if 1000 > len(item.name) > 0 and item.name != r"\[":
             self.items.append(item)
-            self.changed = True
+            self.index_item(item)
+            self.mark_modified(item)
 
     def delete_item(self, selected_task_id):
         """Delete an item with provided id from the collection"""
         for item in self.items:
             if item.item_id == selected_task_id:
                 self.items.remove(item)
-                self.changed = True
+                self.unindex_item(item)
+                self.mark_deleted(item)
                 break
 
     def rename_item(self, selected_task_id, new_name):
@@ -173,7 +303,7 @@ class Collection:
         for item in self.items:
             if item.item_id == selected_task_id and len(new_name) > 0:
                 item.name = new_name
-                self.changed = True
+                self.mark_modified(item)
 
     def toggle_item_status(self, selected_task_id, new_status):
         """Toggle the status for the item with provided id"""
@@ -183,7 +313,7 @@ class Collection:
                     item.status = Status.NORMAL
                 else:
                     item.status = new_status
-                self.changed = True
+                self.mark_modified(item)
                 break
 
     def toggle_item_privacy(self, selected_task_id):
@@ -191,7 +321,7 @@ class Collection:
         for item in self.items:
             if item.item_id == selected_task_id:
                 item.privacy = not item.privacy
-                self.changed = True
+                self.mark_modified(item)
                 break
 
     def item_exists(self, item_name):
@@ -205,11 +335,21 @@ class Collection:
         """Change statuses of all items"""
         for item in self.items:
             item.status = new_status
-            self.changed = True
+            self.mark_modified(item)
+
+    def replace_items(self, other):
+        """Take copies of all items of another collection, for example one loaded in the background"""
+        self.items = list(other.items)
+        self.rebuild_index()
+        self.version += 1
 
     def delete_all_items(self):
         """Delete all items from the collection"""
+        if self.tracks_changes:
+            for item in self.items:
+                self.mark_deleted(item)
         self.items.clear()
+        self.index.clear()
         self.changed = True
 
     def is_empty(self):
@@ -225,20 +365,16 @@ class Collection:
     def filter_events_that_day(self, screen):
         """Filter only events that happen on the particular day"""
         events_of_the_day = Events()
-        for event in self.items:
-            if (event.year == screen.year
-                and event.month == screen.month
-                and event.day == screen.day):
-                events_of_the_day.add_item(event)
+        for event in self.index.get(self.date_key(screen), []):
+            events_of_the_day.add_item(event)
         return events_of_the_day
 
     def filter_events_that_month(self, screen):
         """Filter only events that happen on the particular month and sort them by day"""
         events_of_the_month = Events()
-        for event in self.items:
-            if event.month == screen.month and event.year == screen.year:
+        for day in range(1, 32):
+            for event in self.index.get((screen.year, screen.month, day), []):
                 events_of_the_month.add_item(event)
-        events_of_the_month.items = sorted(events_of_the_month.items, key=lambda item: item.day)
         return events_of_the_month
 
 
@@ -276,7 +412,9 @@ class Tasks(Collection):
                 task.name = level + task.name
                 if 100 > len(task.name) > 0:
                     self.items.insert(idx + 1, task)
-                    self.changed = True
+                    self.reindex_key(self.date_key(task))
+                    self.is_order_changed = True
+                    self.mark_modified(task)
                 break
 
     def add_timestamp_for_task(self, selected_task_id):
@@ -284,7 +422,7 @@ class Tasks(Collection):
         for item in self.items:
             if item.item_id == selected_task_id:
                 item.timer.stamps.append(int(time.time()))
-                self.changed = True
+                self.mark_modified(item)
                 break
 
     def pause_all_other_timers(self, selected_task_id):
@@ -292,7 +430,7 @@ class Tasks(Collection):
         for item in self.items:
             if item.timer.is_counting and item.item_id != selected_task_id:
                 item.timer.stamps.append(int(time.time()))
-                self.changed = True
+                self.mark_modified(item)
 
     def toggle_all_timers(self):
         """Pause all running timers, or resume those previously paused by this toggle"""
@@ -300,31 +438,29 @@ class Tasks(Collection):
             for item in self.items:
                 if item.item_id in self.paused_by_toggle:
                     item.timer.stamps.append(int(time.time()))
-                    self.changed = True
+                    self.mark_modified(item)
             self.paused_by_toggle.clear()
         else:
             for item in self.items:
                 if item.timer.is_counting:
                     self.paused_by_toggle.add(item.item_id)
                     item.timer.stamps.append(int(time.time()))
-                    self.changed = True
+                    self.mark_modified(item)
 
     def reset_timer_for_task(self, selected_task_id):
         """Reset the timer for one of the tasks"""
         for item in self.items:
             if item.item_id == selected_task_id:
                 item.timer.stamps = []
-                self.changed = True
+                self.mark_modified(item)
                 break
 
     def change_deadline(self, selected_task_id, new_year, new_month, new_day):
-        """Reset the timer for one of the tasks"""
+        """Change the deadline of one of the tasks"""
         for item in self.items:
             if item.item_id == selected_task_id:
-                item.year = new_year
-                item.month = new_month
-                item.day = new_day
-                self.changed = True
+                self.move_item_to_date(item, new_year, new_month, new_day)
+                self.mark_modified(item)
                 break
 
     def toggle_subtask_state(self, selected_task_id):
@@ -335,7 +471,7 @@ class Tasks(Collection):
                     item.name = item.name[2:]
                 else:
                     item.name = '--' + item.name
-                self.changed = True
+                self.mark_modified(item)
 
     def move_task(self, number_from, number_to):
         """Move task from certain place to another in the list"""
@@ -343,6 +479,8 @@ class Tasks(Collection):
         from_idx = self.items.index(visible[number_from])
         to_idx = self.items.index(visible[number_to])
         self.items.insert(to_idx, self.items.pop(from_idx))
+        self.reindex_key(self.date_key(self.items[to_idx]))
+        self.is_order_changed = True
         self.changed = True
 
     def generate_id(self):
@@ -369,111 +507,198 @@ class Events(Collection):
         """Move an event to another day within this month"""
         for item in self.items:
             if item.item_id == selected_item_id:
-                item.day = new_day
-                self.changed = True
+                self.move_item_to_date(item, item.year, item.month, new_day)
+                self.mark_modified(item)
                 break
 
     def change_date(self, selected_item_id, new_year, new_month, new_day):
         """Move an event to another date"""
         for item in self.items:
             if item.item_id == selected_item_id:
-                item.year = new_year
-                item.month = new_month
-                item.day = new_day
-                self.changed = True
+                self.move_item_to_date(item, new_year, new_month, new_day)
+                self.mark_modified(item)
                 break
 
 class Birthdays(Events):
     """List of birthdays imported from abook"""
 
+    def date_key(self, item):
+        """Birthdays repeat every year, so they are indexed only by month and day"""
+        return (item.month, item.day)
+
+
+class Holidays(Events):
+    """List of holidays with the set of their dates in each year, to quickly check if a day is a holiday.
+    Holidays of a year are requested from the year loader when the year is displayed,
+    and only a few recently displayed years are kept"""
+
+    def __init__(self, max_years=8):
+        super().__init__()
+        self.dates = {}
+        self.dates_version = self.version
+        self.year_loader = None
+        self.loaded_years = OrderedDict()
+        self.max_years = max_years
+
+    def load_year(self, year):
+        """Add holidays of the year if they were not loaded yet, forgetting the least recently used year"""
+        if year in self.loaded_years:
+            self.loaded_years.move_to_end(year)
+            return
+        if self.year_loader is None:
+            return
+        self.loaded_years[year] = self.year_loader(year)
+        for holiday in self.loaded_years[year]:
+            self.add_item(holiday)
+
+        while len(self.loaded_years) > self.max_years:
+            _, old_holidays = self.loaded_years.popitem(last=False)
+            old_ids = {id(holiday) for holiday in old_holidays}
+            self.items = [holiday for holiday in self.items if id(holiday) not in old_ids]
+            for holiday in old_holidays:
+                self.unindex_item(holiday)
+            self.version += 1
+
+    def replace_items(self, other):
+        """Take holidays of another collection, together with its years and year loader"""
+        super().replace_items(other)
+        self.year_loader = other.year_loader
+        self.loaded_years = OrderedDict((year, list(holidays)) for year, holidays in other.loaded_years.items())
+
     def filter_events_that_day(self, screen):
-        """Filter only birthdays that happen on the particular day"""
-        events_of_the_day = Events()
-        for event in self.items:
-            if event.month == screen.month and event.day == screen.day:
-                events_of_the_day.add_item(event)
-        return events_of_the_day
+        """Filter only holidays that happen on the particular day, loading its year if needed"""
+        self.load_year(screen.year)
+        return super().filter_events_that_day(screen)
+
+    def filter_events_that_month(self, screen):
+        """Filter only holidays that happen on the particular month, loading its year if needed"""
+        self.load_year(screen.year)
+        return super().filter_events_that_month(screen)
+
+    def dates_of_year(self, year):
+        """Return the set of (month, day) of holidays in the year, collecting it on the first request"""
+        self.load_year(year)
+        if self.dates_version != self.version:
+            self.dates = {}
+            self.dates_version = self.version
+        if year not in self.dates:
+            self.dates[year] = {(month, day) for (key_year, month, day) in self.index if key_year == year}
+        return self.dates[year]
+
+    def is_holiday(self, year, month, day):
+        """Check if there is a holiday on this date"""
+        return (month, day) in self.dates_of_year(year)
+
+
+UNTIL_DATE = re.compile(r"UNTIL=(\d{8})(?=;|$)")
+
+
+def end_of_day_in_utc(date, timezone):
+    """Return the last second of the date in the timezone, as a time in UTC in the format of ics files"""
+    end = datetime.datetime.strptime(date, "%Y%m%d").replace(hour=23, minute=59, second=59, tzinfo=timezone)
+    return end.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+class RepeatedEventsCache:
+    """Repetitions of events memoized by source collection, its version, and window of dates"""
+
+    def __init__(self, use_persian_calendar, max_windows=8):
+        self.use_persian_calendar = use_persian_calendar
+        self.max_windows = max_windows
+        self.expansions = {}
+        self.rulesets = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_events, start, end):
+        """Return repetitions of the events within [start, end), building them only if events changed"""
+        key = (user_events, user_events.version, start, end)
+        if key in self.expansions:
+            self.hits += 1
+            return self.expansions[key]
+        self.misses += 1
+
+        # Forget the repetitions built from outdated versions of this collection:
+        for old_key in list(self.expansions):
+            if old_key[0] is user_events and old_key[1] != user_events.version:
+                del self.expansions[old_key]
+
+        # Keep only a few most recent windows of each collection:
+        same_collection = [old_key for old_key in self.expansions if old_key[0] is user_events]
+        for old_key in same_collection[:len(same_collection) - self.max_windows + 1]:
+            del self.expansions[old_key]
+
+        repeated_events = RepeatedEvents(user_events, self.use_persian_calendar, start, end, self.rulesets)
+        self.expansions[key] = repeated_events
+        return repeated_events
 
 
 class RepeatedEvents(Events):
-    """List of events that are repetitions of main events"""
+    """List of events that are repetitions of main events within a window of dates.
+    The window is given by (year, month, day) tuples of the displayed calendar: start is
+    included and end is not included"""
 
-    def __init__(self, user_events, use_persian_calendar, current_year):
+    def __init__(self, user_events, use_persian_calendar, start, end, rulesets=None):
         super().__init__()
         self.user_events = user_events
         self.use_persian_calendar = use_persian_calendar
+        self.start = start
+        self.end = end
+        self.rulesets = rulesets if rulesets is not None else weakref.WeakKeyDictionary()
 
         for event in self.user_events.items:
             if event.repetition >= 1:
-                for rep in range(1, event.repetition):
-                    temp_year = event.year + rep*(event.frequency == Frequency.YEARLY)
-                    temp_month = event.month + rep*(event.frequency == Frequency.MONTHLY)
-                    temp_day = event.day + rep*(event.frequency == Frequency.DAILY) + (7*rep*(event.frequency == Frequency.WEEKLY)) + (14*rep*(event.frequency == Frequency.BIWEEKLY))
-                    year, month, day = self.calculate_recurring_events(temp_year, temp_month, temp_day, event.frequency)
+                for year, month, day in event.occurrences(self.start, self.end, self.use_persian_calendar):
+
+                    # The original event itself is displayed separately:
+                    if (year, month, day) == (event.year, event.month, event.day):
+                        continue
                     self.add_item(UserRepeatedEvent(event.item_id, year, month, day, event.name, event.status,
                                                     event.privacy, event.calendar_number))
 
             elif event.rrule:
-                dtstart = event.getDatetime()
-
-                # For infinitely repeated events, we limit them by end of the next year:
-                if 'COUNT' not in event.rrule and 'UNTIL' not in event.rrule:
-                    until_year = current_year + 1
-                    until_month = 12
-                    event.rrule += ';UNTIL=' + datetime.datetime(until_year, until_month, 1).strftime('%Y%m%dT%H%M%SZ')
-
-                # Create a list of dates of repeated events:
-                try:
-                    rule = rrulestr(event.rrule, dtstart=dtstart)
-                except ValueError as e:
-                    logging.error("Problem occurred with event: '%s'.", event.name)
+                rset = self.get_ruleset(event)
+                if rset is None:
                     continue
-                rset = rruleset()
-                rset.rrule(rule)
 
-                if event.exdate:
-                    exdates_list = [event.exdate] if not isinstance(event.exdate, list) else event.exdate
-
-                    for exdates in exdates_list:
-                        for exdate in exdates.dts:
-                            exdate_dt = datetime.datetime.combine(exdate.dt, datetime.time.min, tzinfo=dtstart.tzinfo) if not isinstance(exdate.dt, datetime.datetime) else exdate.dt
-                            rset.exdate(exdate_dt)
+                # Only the repetitions within the window are created, so infinite rules need no limit:
+                dtstart = event.getDatetime()
+                window_start = datetime.datetime(*self.start, tzinfo=dtstart.tzinfo)
+                window_end = datetime.datetime(*self.end, tzinfo=dtstart.tzinfo)
+                for date in rset.between(window_start, window_end, inc=True):
 
-                # Create an event for each repetition and add to the list:
-                for date in list(rset)[1:]:
+                    # The original event itself is displayed separately:
+                    if date == dtstart or date >= window_end:
+                        continue
                     self.add_item(UserRepeatedEvent(event.item_id, date.year, date.month, date.day, event.name,
                                                     event.status, event.privacy, event.calendar_number))
 
-    def calculate_recurring_events(self, year, month, day, frequency):
-        """Calculate the date of recurring events so that they occur in the next month or year"""
-        new_day = day
-        new_month = month
-        new_year = year
-        skip_days = 0
-
-        # Weekly and daily recurrence:
-        if frequency in [Frequency.WEEKLY, Frequency.BIWEEKLY, Frequency.DAILY]:
-
-            # Calculate how many days and month to skip to next event:
-            for i in range(1000):
-                if month + i > 12:
-                    year = year + 1
-                    month = month - 12
-
-                last_day = Calendar(0, self.use_persian_calendar).last_day(year, month+i)
-                if day > skip_days + last_day:
-                    skip_days += last_day
-                    skip_months = i + 1
-                else:
-                    skip_months = i
-                    break
-            new_day = day - skip_days
-            new_month = month + skip_months
-            new_year = year
-
-        # Monthly recurrence:
-        if frequency == Frequency.MONTHLY:
-            if month > 12:
-                new_year = year + (month - 1)//12
-                new_month = month - 12*(new_year - year)
-        return new_year, new_month, new_day
+    def get_ruleset(self, event):
+        """Parse recurrence rule and exception dates of the event, unless it was parsed before"""
+        if event in self.rulesets and self.rulesets[event][0] == event.rrule:
+            return self.rulesets[event][1]
+
+        dtstart = event.getDatetime()
+
+        # Rules of all-day events may end on a date, which dateutil takes only in UTC once dtstart has a timezone:
+        rrule = UNTIL_DATE.sub(lambda match: f"UNTIL={end_of_day_in_utc(match.group(1), dtstart.tzinfo)}", event.rrule)
+        try:
+            rule = rrulestr(rrule, dtstart=dtstart)
+        except ValueError as e:
+            logging.error("Problem occurred with event: '%s'.", event.name)
+            self.rulesets[event] = (event.rrule, None)
+            return None
+        rset = rruleset()
+        rset.rrule(rule)
+
+        if event.exdate:
+            for exdate in event.exdate:
+                exdate_dt = datetime.datetime.combine(exdate, datetime.time.min, tzinfo=dtstart.tzinfo) if not isinstance(exdate, datetime.datetime) else exdate
+
+                # Exception dates in floating time are in the same local time as the event:
+                if exdate_dt.tzinfo is None:
+                    exdate_dt = exdate_dt.replace(tzinfo=dtstart.tzinfo)
+                rset.exdate(exdate_dt)
+
+        self.rulesets[event] = (event.rrule, rset)
+        return rset
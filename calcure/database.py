@@ -0,0 +1,134 @@
+"""Module that stores events and tasks in an SQLite database, as an alternative to CSV files"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id          INTEGER PRIMARY KEY,
+    year        INTEGER NOT NULL,
+    month       INTEGER NOT NULL,
+    day         INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    repetition  INTEGER NOT NULL,
+    frequency   TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    privacy     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_date ON events (year, month, day);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id          INTEGER PRIMARY KEY,
+    position    INTEGER NOT NULL,
+    year        INTEGER NOT NULL,
+    month       INTEGER NOT NULL,
+    day         INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    privacy     INTEGER NOT NULL,
+    stamps      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_date ON tasks (year, month, day);
+CREATE INDEX IF NOT EXISTS tasks_by_position ON tasks (position);
+"""
+
+UPSERT_EVENT = """
+INSERT INTO events (id, year, month, day, name, repetition, frequency, status, privacy)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    year = excluded.year, month = excluded.month, day = excluded.day, name = excluded.name,
+    repetition = excluded.repetition, frequency = excluded.frequency, status = excluded.status,
+    privacy = excluded.privacy
+"""
+
+# New tasks go to the end of the list, changed tasks keep their place:
+UPSERT_TASK = """
+INSERT INTO tasks (id, position, year, month, day, name, status, privacy, stamps)
+VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM tasks), ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    year = excluded.year, month = excluded.month, day = excluded.day, name = excluded.name,
+    status = excluded.status, privacy = excluded.privacy, stamps = excluded.stamps
+"""
+
+
+class Database:
+    """SQLite database with a table of events and a table of tasks.
+    Rows are written one by one as items change, instead of rewriting whole files"""
+
+    def __init__(self, database_file):
+        self.database_file = Path(database_file)
+        self.connection = None
+        self.lock = threading.RLock()
+
+    @property
+    def exists(self):
+        """Check if the database file was already created"""
+        return self.database_file.exists()
+
+    def connect(self):
+        """Open the database once, creating the tables if needed. The connection is shared by threads under the lock"""
+        if self.connection is None:
+            self.database_file.parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.database_file, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def read_events(self):
+        """Return rows of all events in the order they were created"""
+        with self.lock:
+            return self.connect().execute(
+                "SELECT id, year, month, day, name, repetition, frequency, status, privacy FROM events ORDER BY id"
+            ).fetchall()
+
+    def read_tasks(self):
+        """Return rows of all tasks in the order of the journal"""
+        with self.lock:
+            return self.connect().execute(
+                "SELECT id, year, month, day, name, status, privacy, stamps FROM tasks ORDER BY position, id"
+            ).fetchall()
+
+    def write_events(self, snapshots):
+        """Apply snapshots of changed events in a single transaction. Each snapshot holds
+        rows to insert or update, ids of deleted events, and whether rows replace all events"""
+        with self.lock:
+            connection = self.connect()
+            try:
+                with connection:
+                    for rows, deleted_ids, replace_all in snapshots:
+                        if replace_all:
+                            connection.execute("DELETE FROM events")
+                        connection.executemany("DELETE FROM events WHERE id = ?", [(item_id,) for item_id in deleted_ids])
+                        connection.executemany(UPSERT_EVENT, rows)
+            except sqlite3.Error as e_message:
+                logging.error("Failed to save events in %s. %s", self.database_file, e_message)
+
+    def write_tasks(self, snapshots):
+        """Apply snapshots of changed tasks in a single transaction. Each snapshot holds rows
+        to insert or update, ids of deleted tasks, the order of all tasks if it changed,
+        and whether rows replace all tasks"""
+        with self.lock:
+            connection = self.connect()
+            try:
+                with connection:
+                    for rows, deleted_ids, order, replace_all in snapshots:
+                        if replace_all:
+                            connection.execute("DELETE FROM tasks")
+                        connection.executemany("DELETE FROM tasks WHERE id = ?", [(item_id,) for item_id in deleted_ids])
+                        connection.executemany(UPSERT_TASK, rows)
+                        if order is not None:
+                            connection.executemany("UPDATE tasks SET position = ? WHERE id = ?",
+                                                   [(position, item_id) for position, item_id in enumerate(order)])
+            except sqlite3.Error as e_message:
+                logging.error("Failed to save tasks in %s. %s", self.database_file, e_message)
+
+    def close(self):
+        """Close the connection, so that the database is checkpointed into its main file"""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
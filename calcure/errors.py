@@ -14,13 +14,17 @@ class Error():
         self.buffer = io.StringIO()
         self.file = file
 
+        # Only warnings and errors are displayed, info goes only to the log file:
+        buffer_handler = logging.StreamHandler(self.buffer)
+        buffer_handler.setLevel(logging.WARNING)
+
         # Start logging errors:
         logging.basicConfig(level=logging.INFO,
                             format="[%(levelname)s] %(message)s",
                             # encoding='utf-8',
                             handlers=[logging.FileHandler(self.file, 'w'),
                                       #logging.StreamHandler(),
-                                      logging.StreamHandler(self.buffer),
+                                      buffer_handler,
                                       ])
     @property
     def has_occurred(self):
@@ -62,6 +62,7 @@ KEY_QUIT              = "q"
 KEY_HELP              = "?"
 KEY_SWITCH            = " "
 KEY_SPLIT             = "/"
+KEY_PERFORMANCE       = "O"
 
 # Load overrides from keybindings.ini if it exists:
 
@@ -108,6 +109,7 @@ if _keybindings_file.exists():
         KEY_HELP              = _b.get("key_help",              KEY_HELP)
         KEY_SWITCH            = _b.get("key_switch",            KEY_SWITCH)
         KEY_SPLIT             = _b.get("key_split",             KEY_SPLIT)
+        KEY_PERFORMANCE       = _b.get("key_performance",       KEY_PERFORMANCE)
 
         # Allow writing "Space" in the ini file for the space character:
         if KEY_SWITCH.lower() == "space":
@@ -125,7 +127,7 @@ CALENDAR_KEYS = list(dict.fromkeys([
     KEY_ADD, KEY_ADD_EXTRA,
     KEY_IMPORTANT, KEY_LOW, KEY_UNMARK, KEY_DONE, KEY_DELETE, KEY_EDIT,
     KEY_MOVE, KEY_MOVE_IN_MONTH, KEY_PRIVACY_ITEM,
-    KEY_IMPORT, KEY_RELOAD, KEY_QUIT, KEY_HELP, KEY_SWITCH, KEY_SPLIT, KEY_PRIVACY,
+    KEY_IMPORT, KEY_RELOAD, KEY_QUIT, KEY_HELP, KEY_SWITCH, KEY_SPLIT, KEY_PRIVACY, KEY_PERFORMANCE,
 ] + _FIXED_NAV + _FIXED_ACT))
 
 WEEKLY_KEYS = list(dict.fromkeys(CALENDAR_KEYS + ["V"]))
@@ -138,7 +140,7 @@ JOURNAL_KEYS = list(dict.fromkeys([
     KEY_DEADLINE, KEY_DEADLINE_REMOVE,
     KEY_DONE_ALL, KEY_UNMARK_ALL, KEY_LOW_ALL, KEY_IMPORTANT_ALL, KEY_DELETE_ALL,
     KEY_HIDE_DONE, KEY_IMPORT,
-    KEY_PRIVACY, KEY_RELOAD, KEY_QUIT, KEY_HELP, KEY_SWITCH, KEY_SPLIT,
+    KEY_PRIVACY, KEY_RELOAD, KEY_QUIT, KEY_HELP, KEY_SWITCH, KEY_SPLIT, KEY_PERFORMANCE,
     "h", "v", "V", "H", "r", "c", "KEY_BTAB",
 ]))
 
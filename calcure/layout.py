@@ -0,0 +1,89 @@
+"""Module that prepares what is displayed in each day of the calendar and where"""
+
+from collections import namedtuple
+
+from calcure.calendars import Calendar
+from calcure.moon import get_moon_phase
+
+
+# Date of a day, accepted by filters of collections in place of the screen:
+Day = namedtuple("Day", ["year", "month", "day"])
+
+
+class DayItems(namedtuple("DayItems", ["user_events", "repeated_user_events", "user_ics_events",
+                                       "repeated_ics_events", "deadlines", "deadlines_ics",
+                                       "holidays", "birthdays"])):
+    """Items of every kind that happen on one day"""
+
+    @classmethod
+    def collect(cls, day, repeated_user_events, repeated_ics_events, user_events, user_ics_events,
+                holidays, birthdays, user_tasks, user_ics_tasks):
+        """Collect items of the day from each source"""
+        user_ics_events = user_ics_events.filter_events_that_day(day).items
+        return cls(tuple(user_events.filter_events_that_day(day).items),
+                   tuple(repeated_user_events.filter_events_that_day(day).items),
+                   tuple(sorted(user_ics_events, key=lambda x: (x.hour is None, x.hour))),
+                   tuple(repeated_ics_events.filter_events_that_day(day).items),
+                   tuple(user_tasks.filter_events_that_day(day).items),
+                   tuple(user_ics_tasks.filter_events_that_day(day).items),
+                   tuple(holidays.filter_events_that_day(day).items),
+                   tuple(birthdays.filter_events_that_day(day).items))
+
+
+# Position and content of a day in the calendar:
+DayCell = namedtuple("DayCell", ["date", "y", "x", "day_in_week", "is_today", "is_holiday",
+                                 "is_weekend", "moon_icon", "items", "index_offset"])
+
+
+def make_day_cell(date, y, x, day_in_week, today, holidays, items, index_offset, cf):
+    """Describe how a day is displayed"""
+    return DayCell(date, y, x, day_in_week,
+                   (date.year, date.month, date.day) == (today.year, today.month, today.day),
+                   holidays.is_holiday(date.year, date.month, date.day),
+                   day_in_week + 1 in cf.WEEKEND_DAYS,
+                   get_moon_phase(date.year, date.month, date.day) if cf.SHOW_MOON_PHASES else "",
+                   items, index_offset)
+
+
+class MonthLayout:
+    """Immutable layout of a month in the calendar: position, style and items of each day,
+    and the order in which events are numbered for selection"""
+
+    def __init__(self, key, year, month, y_max, x_min, x_max, show_week_numbers, today, sources, cf):
+        calendar = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR)
+        holidays = sources[4]
+        self.key = key
+        self.year = year
+        self.month = month
+
+        # Week numbers take a column on the left:
+        if show_week_numbers:
+            self.week_numbers = tuple(calendar.month_week_numbers(year, month))
+            week_column_width = 4
+        else:
+            self.week_numbers = ()
+            week_column_width = 0
+        self.calendar_start_x = week_column_width
+        self.y_cell = (y_max - 3) // 6
+        self.x_cell = (x_max - week_column_width) // 7
+
+        cells = []
+        numbered_events = []
+        for row, week in enumerate(calendar.monthdayscalendar(year, month)):
+            for col, day in enumerate(week):
+                if day == 0:
+                    continue
+                date = Day(year, month, day)
+                day_in_week = (col + cf.START_WEEK_DAY - 1) % 7
+                items = DayItems.collect(date, *sources)
+                cells.append(make_day_cell(date, 2 + row*self.y_cell, self.calendar_start_x + col*self.x_cell,
+                                           day_in_week, today, holidays, items, len(numbered_events), cf))
+                numbered_events.extend(items.user_events)
+        self.cells = tuple(cells)
+        self.numbered_events = tuple(numbered_events)
+
+    def event_by_number(self, number):
+        """Return the user event displayed with this number, counting from zero"""
+        if number is not None and 0 <= number < len(self.numbered_events):
+            return self.numbered_events[number]
+        return None
@@ -3,22 +3,93 @@
 import configparser
 import csv
 import glob
+import gzip
 import os
 import datetime
 import icalendar
 import urllib.request
 import io
 import logging
-
+import multiprocessing
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 from pathlib import Path
 
 from calcure.data import *
 from calcure.calendars import convert_to_persian_date
+from calcure.cache import HolidayCache, ParsedICSCache, URLCache, content_digest
+from calcure.changelog import ChangeLog
+
+
+class Fingerprints:
+    """Modification times, sizes and inodes of the files and folders that a loader read,
+    to tell if any of them changed since then without reading them again"""
+
+    def __init__(self, source_suffix=""):
+        self.files = {}
+        self.has_remote_sources = False
+        self.source_suffix = source_suffix
+        self.changed_paths = set()
+
+    def fingerprint(self, stat):
+        """Return the part of the result of os.stat that changes when a file is modified or replaced"""
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def current(self, path):
+        """Return the fingerprint of the file or folder as it is now, or None if it does not exist"""
+        try:
+            return self.fingerprint(os.stat(path))
+        except OSError:
+            return None
+
+    def record(self, path, stat=None):
+        """Remember the fingerprint of the file or folder that is about to be read"""
+        self.files[str(path)] = self.fingerprint(stat) if stat is not None else self.current(path)
+
+    def refresh(self):
+        """Take the fingerprints of the same files again, after the program itself wrote them"""
+        for path in list(self.files):
+            self.record(path)
+
+    def clear(self):
+        """Forget the fingerprints before reading the files again"""
+        self.files = {}
+        self.has_remote_sources = False
+
+    def covers(self, path):
+        """Check if the path is one of the files or folders that were read,
+        or a new file of the source type in one of the folders"""
+        path = str(path)
+        return path in self.files or (path.endswith(self.source_suffix) and os.path.dirname(path) in self.files)
+
+    def mark_changed(self, paths):
+        """Remember the paths that were seen changing, so that only they can be read again"""
+        self.changed_paths.update(path for path in paths if self.covers(path))
+
+    @property
+    def are_unchanged(self):
+        """Check if files were read and none of them was modified, created or deleted since then.
+        Sources such as URLs cannot be checked this way, so they always count as changed"""
+        if not self.files or self.has_remote_sources or self.changed_paths:
+            return False
+        return all(self.current(path) == fingerprint for path, fingerprint in self.files.items())
 
 
 class LoaderCSV:
     """Load data from CSV files"""
 
+    def record_fingerprints(self, data_file):
+        """Remember the state of the CSV file and of its change log before they are read"""
+        self.fingerprints.clear()
+        self.fingerprints.record(data_file)
+        if self.change_log is not None:
+            self.fingerprints.record(self.change_log.log_file)
+
     def create_file(self, filename):
         """Create CSV file"""
         try:
@@ -39,62 +110,169 @@ class LoaderCSV:
             # logging.info("Creating %s.", filename)
             return self.create_file(filename)
 
+    def apply_change_log(self, items, item_from_record):
+        """Apply records of the change log to items read from the CSV file, kept in a dict by their ids.
+        If someone else changed the file after the log was started, the records are applied on top
+        of its new content and the log is started anew for it, so that no change is lost"""
+        if self.change_log is None:
+            return items
+        header, records = self.change_log.read()
+        if header is None:
+            return items
+        if self.change_log.is_started_for_base(header):
+            items, _ = self.replay(items, records, item_from_record)
+            return items
+
+        # Ids that the rows of the file had when the log was started:
+        base_ids = set(range(self.change_log.base_rows(header)))
+        items, rebased_records = self.replay(items, records, item_from_record, base_ids)
+        self.change_log.rebase(rebased_records)
+        self.fingerprints.record(self.change_log.log_file)
+        return items
+
+    def replay(self, items, records, item_from_record, base_ids=None):
+        """Apply the records to the items and return them, together with the records that give the same
+        items on top of the file. If base_ids of rows of the file are given, the file was changed since
+        the records were logged, so items that the log added get new ids instead of taking the places
+        of rows that someone else added to the file"""
+        new_ids = {}
+        rows = {}
+        deleted_ids = set()
+        ids = None
+        is_order_changed = False
+
+        def current_id(logged_id):
+            """Return the id of the logged item among the items, giving a new id to an added item"""
+            if logged_id in new_ids or base_ids is None or logged_id in base_ids:
+                return new_ids.get(logged_id, logged_id)
+            new_ids[logged_id] = max([*items, *base_ids, -1]) + 1
+            return new_ids[logged_id]
+
+        for record in records:
+            try:
+                if record[0] == "set":
+                    item_id = current_id(int(record[1]))
+                    items[item_id] = item_from_record(item_id, record)
+                    rows[item_id] = record[2:]
+                    deleted_ids.discard(item_id)
+                elif record[0] == "delete":
+                    item_id = current_id(int(record[1]))
+                    items.pop(item_id, None)
+                    rows.pop(item_id, None)
+                    deleted_ids.add(item_id)
+                elif record[0] == "ids":
+                    logged_ids = [int(item_id) for item_id in record[1:]]
+                    renumbered_items = dict(zip(logged_ids, items.values()))
+
+                    # Rows that someone else added after the listed ones keep their places with new ids:
+                    for item in list(items.values())[len(logged_ids):]:
+                        renumbered_items[max([*renumbered_items, -1]) + 1] = item
+                    items = renumbered_items
+                    for item_id, item in items.items():
+                        item.item_id = item_id
+                    ids = list(items)
+                    if base_ids is not None:
+                        base_ids = set(logged_ids)
+                elif record[0] == "order":
+                    order = [new_ids.get(int(item_id), int(item_id)) for item_id in record[1:]]
+                    ordered_items = {item_id: items[item_id] for item_id in order if item_id in items}
+                    ordered_items.update(items)
+                    items = ordered_items
+                    is_order_changed = True
+            except (ValueError, IndexError, KeyError) as e_message:
+                logging.error("Skipped a broken record in %s. %s", self.change_log.log_file, e_message)
+
+        rebased_records = [["ids", *ids]] if ids is not None else []
+        rebased_records += [["delete", item_id] for item_id in deleted_ids]
+        rebased_records += [["set", item_id, *row] for item_id, row in rows.items()]
+        if is_order_changed:
+            rebased_records.append(["order", *items])
+        return items, rebased_records
+
 
 class TaskLoaderCSV(LoaderCSV):
     """Load tasks from CSV files"""
 
+    # Versions of the format of the tasks file:
+    FORMAT_UNDATED = 1  # Old format: name, status, timestamps
+    FORMAT_DATED = 2    # Current format: year, month, day, name, status, timestamps
+
     def __init__(self, cf):
         self.user_tasks = Tasks()
         self.user_tasks.done_hidden = cf.HIDE_DONE_TASKS
+        self.user_tasks.tracks_changes = cf.CSV_CHANGE_LOG
         self.tasks_file = cf.TASKS_FILE
+        self.change_log = ChangeLog(self.tasks_file) if cf.CSV_CHANGE_LOG else None
+        self.fingerprints = Fingerprints()
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
+        self.format_version = self.FORMAT_DATED
 
     @property
     def is_task_format_old(self):
         """Check if the database format is old"""
-        with open(self.tasks_file, "r", encoding="utf-8") as f:
-            text = f.read()
-        return text[0] == '"'
+        return self.format_version == self.FORMAT_UNDATED
+
+    def detect_format(self, file):
+        """Detect the format version from the first character of the file and rewind it"""
+        first_character = file.read(1)
+        file.seek(0)
+        return self.FORMAT_UNDATED if first_character == '"' else self.FORMAT_DATED
+
+    def task_from_row(self, task_id, row, shift):
+        """Make a task from a row of the CSV file, where the name is preceded by as many columns as the shift"""
+
+        # Read task dates:
+        if shift == 0:
+            year = 0
+            month = 0
+            day = 0
+        else:
+            year = int(row[0])
+            month = int(row[1])
+            day = int(row[2])
+
+        # Convert to persian date if needed and if it is not zero date:
+        if self.use_persian_calendar and year != 0:
+            year, month, day = convert_to_persian_date(year, month, day)
 
-    def load(self):
-        """Reads from CSV file"""
+        # Read task name and statuses:
+        if row[0 + shift][0] == '.':
+            name = row[0 + shift][1:]
+            is_private = True
+        else:
+            name = row[0 + shift]
+            is_private = False
+        status = Status[row[1 + shift].upper()]
+        stamps = row[(2 + shift):] if len(row) > 2 else []
+        timer = Timer(stamps)
+        return Task(task_id, name, status, timer, is_private, year, month, day)
 
+    def load(self):
+        """Reads from CSV file in a single pass and applies the changes logged since it was written"""
         self.user_tasks.delete_all_items()
-        lines = self.read_file(self.tasks_file)
-
-        for index, row in enumerate(lines):
-            task_id = index
-
-            # Read task dates:
-            if self.is_task_format_old:
-                shift = 0
-                year = 0
-                month = 0
-                day = 0
-            else:
-                shift = 3
-                year = int(row[0])
-                month = int(row[1])
-                day = int(row[2])
-
-            # Convert to persian date if needed and if it is not zero date:
-            if self.use_persian_calendar and year != 0:
-                year, month, day = convert_to_persian_date(year, month, day)
+        self.record_fingerprints(self.tasks_file)
 
-            # Read task name and statuses:
-            if row[0 + shift][0] == '.':
-                name = row[0 + shift][1:]
-                is_private = True
-            else:
-                name = row[0 + shift]
-                is_private = False
-            status = Status[row[1 + shift].upper()]
-            stamps = row[(2 + shift):] if len(row) > 2 else []
-            timer = Timer(stamps)
-
-            # Add task:
-            new_task = Task(task_id, name, status, timer, is_private, year, month, day)
-            self.user_tasks.add_item(new_task)
+        try:
+            file = open(self.tasks_file, "r", encoding="utf-8")
+        except IOError: # File does not exist
+            self.create_file(self.tasks_file)
+            self.user_tasks.changed = False
+            return self.user_tasks
+
+        tasks = {}
+        with file:
+            self.format_version = self.detect_format(file)
+            shift = 0 if self.is_task_format_old else 3
+
+            for index, row in enumerate(csv.reader(file, delimiter = ',')):
+                if not row:
+                    continue
+                tasks[index] = self.task_from_row(index, row, shift)
+
+        # Logged tasks are always in the current format, after the action and the id:
+        tasks = self.apply_change_log(tasks, lambda task_id, record: self.task_from_row(task_id, record[2:], 3))
+        for task in tasks.values():
+            self.user_tasks.add_item(task)
         self.user_tasks.changed = False
         return self.user_tasks
 
@@ -104,113 +282,219 @@ class EventLoaderCSV(LoaderCSV):
 
     def __init__(self, cf):
         self.user_events = Events()
+        self.user_events.tracks_changes = cf.CSV_CHANGE_LOG
         self.events_file = cf.EVENTS_FILE
+        self.change_log = ChangeLog(self.events_file) if cf.CSV_CHANGE_LOG else None
+        self.fingerprints = Fingerprints()
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
 
     def load(self):
-        """Read from CSV file"""
+        """Read from CSV file and apply the changes logged since it was written"""
         self.user_events.delete_all_items()
+        self.record_fingerprints(self.events_file)
         lines = self.read_file(self.events_file)
-        for index, row in enumerate(lines):
-            event_id = index
-            year = int(row[1])
-            month = int(row[2])
-            day = int(row[3])
-            if row[4][0] == '.':
-                name = row[4][1:]
-                is_private = True
-            else:
-                name = row[4]
-                is_private = False
+        events = {index: self.event_from_row(index, row) for index, row in enumerate(lines)}
 
-            # Account for old versions of the datafile:
-            if len(row) > 5:
-                repetition = int(row[5])
-                if row[6] == 'd':
-                    frequency = Frequency.DAILY
-                elif row[6] == 'w':
-                    frequency = Frequency.WEEKLY
-                elif row[6] == 'm':
-                    frequency = Frequency.MONTHLY
-                elif row[6] == 'y':
-                    frequency = Frequency.YEARLY
-                else:
-                    try:
-                        frequency = Frequency[row[6].upper()]
-                    except (ValueError, KeyError):
-                        frequency = Frequency.ONCE
-            else:
-                repetition = '1'
-                frequency = Frequency.ONCE
-            if len(row) > 7:
-                status = Status[row[7].upper()]
+        # Logged events have the same columns as the file, after the action:
+        events = self.apply_change_log(events, lambda event_id, record: self.event_from_row(event_id, record[1:]))
+        for event in events.values():
+            self.user_events.add_item(event)
+        self.user_events.changed = False
+        return self.user_events
+
+    def event_from_row(self, event_id, row):
+        """Make an event from a row of the CSV file"""
+        year = int(row[1])
+        month = int(row[2])
+        day = int(row[3])
+        if row[4][0] == '.':
+            name = row[4][1:]
+            is_private = True
+        else:
+            name = row[4]
+            is_private = False
+
+        # Account for old versions of the datafile:
+        if len(row) > 5:
+            repetition = int(row[5])
+            if row[6] == 'd':
+                frequency = Frequency.DAILY
+            elif row[6] == 'w':
+                frequency = Frequency.WEEKLY
+            elif row[6] == 'm':
+                frequency = Frequency.MONTHLY
+            elif row[6] == 'y':
+                frequency = Frequency.YEARLY
             else:
-                status = Status.NORMAL
+                try:
+                    frequency = Frequency[row[6].upper()]
+                except (ValueError, KeyError):
+                    frequency = Frequency.ONCE
+        else:
+            repetition = '1'
+            frequency = Frequency.ONCE
+        if len(row) > 7:
+            status = Status[row[7].upper()]
+        else:
+            status = Status.NORMAL
 
-            # Convert to persian date if needed:
-            if self.use_persian_calendar:
+        # Convert to persian date if needed:
+        if self.use_persian_calendar:
+            year, month, day = convert_to_persian_date(year, month, day)
+
+        return UserEvent(event_id, year, month, day, name, repetition, frequency, status, is_private)
+
+
+class TaskLoaderSQLite:
+    """Load tasks from the SQLite database"""
+
+    def __init__(self, database, cf):
+        self.user_tasks = Tasks()
+        self.user_tasks.done_hidden = cf.HIDE_DONE_TASKS
+        self.user_tasks.tracks_changes = True
+        self.database = database
+        self.fingerprints = Fingerprints()
+        self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
+
+    def load(self):
+        """Read all tasks in the order of the journal"""
+        self.user_tasks.delete_all_items()
+        self.fingerprints.clear()
+        self.fingerprints.record(self.database.database_file)
+        self.fingerprints.record(f"{self.database.database_file}-wal")
+        try:
+            rows = self.database.read_tasks()
+        except sqlite3.Error as e_message:
+            logging.error("Failed to load tasks from %s. %s", self.database.database_file, e_message)
+            rows = []
+        for task_id, year, month, day, name, status, privacy, stamps in rows:
+            if self.use_persian_calendar and year != 0:
                 year, month, day = convert_to_persian_date(year, month, day)
+            timer = Timer(stamps.split(",") if stamps else [])
+            self.user_tasks.add_item(Task(task_id, name, Status[status.upper()], timer, bool(privacy), year, month, day))
+        self.user_tasks.changed = False
+        return self.user_tasks
+
+
+class EventLoaderSQLite:
+    """Load events from the SQLite database"""
+
+    def __init__(self, database, cf):
+        self.user_events = Events()
+        self.user_events.tracks_changes = True
+        self.database = database
+        self.fingerprints = Fingerprints()
+        self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
 
-            # Add event:
-            new_event = UserEvent(event_id, year, month, day, name, repetition, frequency, status, is_private)
-            self.user_events.add_item(new_event)
+    def load(self):
+        """Read all events in the order they were created"""
+        self.user_events.delete_all_items()
+        self.fingerprints.clear()
+        self.fingerprints.record(self.database.database_file)
+        self.fingerprints.record(f"{self.database.database_file}-wal")
+        try:
+            rows = self.database.read_events()
+        except sqlite3.Error as e_message:
+            logging.error("Failed to load events from %s. %s", self.database.database_file, e_message)
+            rows = []
+        for event_id, year, month, day, name, repetition, frequency, status, privacy in rows:
+            if self.use_persian_calendar:
+                year, month, day = convert_to_persian_date(year, month, day)
+            self.user_events.add_item(UserEvent(event_id, year, month, day, name, repetition,
+                                                Frequency[frequency.upper()], Status[status.upper()], bool(privacy)))
         self.user_events.changed = False
         return self.user_events
 
 
 class HolidayLoader:
-    """Load holidays for this country around this year"""
+    """Load holidays of the countries for the years that are displayed"""
+
+    # Number of generated (country, subdivision, year) tables kept in memory:
+    MAX_TABLES = 32
 
     def __init__(self, cf):
-        self.holidays = Events()
+        self.holidays = Holidays()
+        self.holidays.year_loader = self.load_year
         self.countries = cf.HOLIDAY_COUNTRY.split(',')
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
+        self.tables = OrderedDict()
+        self.failed_countries = set()
+        self.cache = HolidayCache(cf.cache_folder / "holidays.pickle")
+        self.fingerprints = Fingerprints()
 
     def load(self):
-        """Run and collect holidays for each country"""
-        holidays = Events()
-        for country in self.countries:
-            self.load_country(country)
+        """Load holidays of this year, other years are loaded when they are displayed"""
+        today = datetime.date.today()
+        year = today.year
+        if self.use_persian_calendar:
+            year, _, _ = convert_to_persian_date(today.year, today.month, today.day)
+        self.holidays.load_year(year)
         return self.holidays
 
-    def load_country(self, country):
-        """Load list of holidays from 'holidays' module"""
-
-        def get_country_and_subdivision(country):
-            """Get country and subdivision, where encoded."""
-            if ":" in country:
-                return tuple(country.split(":"))
-            else:
-                return (country, None)
-
+    def get_country_and_subdivision(self, country):
+        """Get country and subdivision, where encoded."""
+        if ":" in country:
+            return tuple(country.split(":"))
+        else:
+            return (country, None)
+
+    def load_table(self, country, subdivision, year):
+        """Return the country code and the list of (date, name) of holidays in a Gregorian year,
+        keeping the recently used tables in memory and all generated tables on disk"""
+        key = (country, subdivision, year)
+        if key in self.tables:
+            self.tables.move_to_end(key)
+            return self.tables[key]
+
+        self.tables[key] = self.cache.get(key) or self.generate_table(country, subdivision, year)
+        while len(self.tables) > self.MAX_TABLES:
+            self.tables.popitem(last=False)
+        return self.tables[key]
+
+    def generate_table(self, country, subdivision, year):
+        """Generate the country code and the list of (date, name) of holidays from 'holidays' module"""
+        if country in self.failed_countries:
+            return (None, [])
         try:
             import holidays as hl
             from holidays import registry
 
-            (country, subdivision) = get_country_and_subdivision(country)
             country_codes = {x[0]: x[2] for x in registry.COUNTRIES.values()}
             country_code = country_codes.get(country)
-            year = datetime.date.today().year
-            holiday_events = (getattr(hl, country))(subdiv=subdivision, years=[year+x for x in range(-2, 5)])
-            for date, name in holiday_events.items():
-
-                # Convert to persian date if needed:
-                if self.use_persian_calendar:
-                    year, month, day = convert_to_persian_date(date.year, date.month, date.day)
-                else:
-                    year, month, day = date.year, date.month, date.day
-
-                # Add holiday:
-                holiday = Event(year, month, day, f'{name} ({country_code})' if len(self.countries) > 1 else name)
-                self.holidays.add_item(holiday)
+            table = (country_code, list((getattr(hl, country))(subdiv=subdivision, years=[year]).items()))
+            self.cache.put((country, subdivision, year), table)
+            return table
 
         except ModuleNotFoundError:
             logging.error("Couldn't load holidays. Module holidays is not installed. Try 'pip install holidays'")
-            pass
-        except (SyntaxError, AttributeError) as e_message:
+        except (SyntaxError, AttributeError, NotImplementedError) as e_message:
             logging.error("Couldn't load holidays. Country might be incorrect. %s", e_message)
-            pass
-        return self.holidays
+        self.failed_countries.add(country)
+        return (None, [])
+
+    def load_year(self, year):
+        """Return holidays of all countries in the year of the displayed calendar"""
+        holidays = []
+        gregorian_years = [year + 621, year + 622] if self.use_persian_calendar else [year]
+        for country in self.countries:
+            country, subdivision = self.get_country_and_subdivision(country)
+            for gregorian_year in gregorian_years:
+                country_code, table = self.load_table(country, subdivision, gregorian_year)
+                for date, name in table:
+
+                    # Convert to persian date if needed:
+                    if self.use_persian_calendar:
+                        holiday_year, month, day = convert_to_persian_date(date.year, date.month, date.day)
+                    else:
+                        holiday_year, month, day = date.year, date.month, date.day
+                    if holiday_year != year:
+                        continue
+
+                    # Add holiday:
+                    name = f'{name} ({country_code})' if len(self.countries) > 1 else name
+                    holidays.append(Event(holiday_year, month, day, name))
+        self.cache.save()
+        return holidays
 
 
 class BirthdayLoader:
@@ -221,6 +505,7 @@ class BirthdayLoader:
         self.abook_file = Path.home() / ".abook" / "addressbook"
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
         self.load_birthdays = cf.BIRTHDAYS_FROM_ABOOK
+        self.fingerprints = Fingerprints()
 
     def load(self):
         """Loading birthdays from abook contacts"""
@@ -253,6 +538,41 @@ class BirthdayLoader:
         return self.birthdays
 
 
+# Limits of parallel loading of ics files:
+MAX_READING_THREADS = 16
+MAX_PARSING_PROCESSES = 4
+MIN_PARALLEL_PARSING_SIZE = 1_000_000
+PARSING_SETTINGS = ("use_persian_calendar", "local_timezone")
+
+
+def parse_text(loader, text):
+    """Parse text of an ics file with the loader, returning items and error message if it failed"""
+    try:
+        return loader.parse_calendar(text), None
+    except Exception as e_message:
+        return [], str(e_message)
+
+
+class MessageCollector(logging.Handler):
+    """Keep messages logged in a parsing process to pass them to the main process"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append((record.levelno, record.getMessage()))
+
+
+def parse_text_in_process(loader, text):
+    """Parse text of an ics file in a process of the pool, also returning messages logged meanwhile"""
+    collector = MessageCollector()
+    logging.getLogger().handlers = [collector]
+    items, error = parse_text(loader, text)
+    messages, collector.messages = collector.messages, []
+    return items, error, messages
+
+
 class LoaderICS:
     """Load data from ICS files"""
 
@@ -279,41 +599,70 @@ class LoaderICS:
             return self.read_lines(file)
 
     def read_url(self, path):
-        """Parse an ics URL if it exists and networks works"""
+        """Download an ics URL, unless it did not change since it was saved in the cache.
+        If the server is unreachable, use the copy from the cache"""
+        cached = self.url_cache.get(path)
+        request = urllib.request.Request(path, headers={"Accept-Encoding": "gzip"})
+        if cached is not None:
+            etag, last_modified, cached_text = cached
+            if etag:
+                request.add_header("If-None-Match", etag)
+            if last_modified:
+                request.add_header("If-Modified-Since", last_modified)
         try:
-            with urllib.request.urlopen(path) as response:
-                file = io.TextIOWrapper(response, 'utf-8')
-                return self.read_lines(file)
+            with urllib.request.urlopen(request, timeout=self.url_timeout) as response:
+                content = response.read()
+                if response.headers.get("Content-Encoding") == "gzip":
+                    content = gzip.decompress(content)
+                text = self.read_lines(io.StringIO(content.decode("utf-8")))
+                self.url_cache.put(path, response.headers.get("ETag"), response.headers.get("Last-Modified"), text)
+                return text
         except urllib.error.HTTPError as e_message:
+            if e_message.code == 304 and cached is not None:
+                return cached_text
             logging.error("Failed to load from %s. Probably url is wrong. %s", path, e_message)
-            return ""
-        except urllib.error.URLError as e_message:
+        except (urllib.error.URLError, TimeoutError) as e_message:
             logging.error("Failed to load from %s. Probably no internet connection. %s", path, e_message)
-            return ""
-
-    def read_resource(self, path):
-        """Determine type of the resource, parse it, and return list of strings for each file"""
-        ics_files = []
+        except (OSError, UnicodeDecodeError) as e_message:
+            logging.error("Failed to load from %s. %s", path, e_message)
+        return cached_text if cached is not None else ""
+
+    def read_source(self, source):
+        """Read text of a local file or URL"""
+        if source.startswith('http'):
+            return self.read_url(source)
+        return self.read_file(source)
+
+    def find_sources(self, path):
+        """Determine type of the resource and return the list of URLs or files it consists of"""
+        sources = []
         path = os.path.expanduser(path)
 
-        # If it's a URL, try to load it:
+        # If it's a URL, it is the only source:
         if path.startswith('http'):
-            ics_files.append(self.read_url(path))
-            return ics_files
+            self.fingerprints.has_remote_sources = True
+            sources.append(path)
+            return sources
 
-        # If it contains a glob pattern, expand and recurse:
+        # If it contains a glob pattern, expand and recurse, remembering folders where new matches would appear:
         if '*' in path or '?' in path:
+            pattern_folder = path[:min(index for index in (path.find('*'), path.find('?')) if index >= 0)]
+            self.fingerprints.record(os.path.dirname(pattern_folder))
             for matched in sorted(glob.glob(path)):
-                ics_files.extend(self.read_resource(matched))
-            return ics_files
+                self.fingerprints.record(os.path.dirname(matched))
+                sources.extend(self.find_sources(matched))
+            return sources
 
-        # If it's a local file, read it:
+        # If it's a local file, it is the only source:
         if path.endswith('.ics'):
-            ics_files.append(self.read_file(path))
-            return ics_files
+            sources.append(path)
+            return sources
 
-        # Otherwise, assume it's a folder, and read every file inside:
+        # Otherwise, assume it's a folder, and find every file inside.
+        # Adding or removing a file changes the fingerprint of its folder:
+        self.fingerprints.record(path)
         for root, directories, files in os.walk(path):
+            self.fingerprints.record(root)
             for filename in files:
                 # Get the full path to the file
                 file_path = os.path.join(root, filename)
@@ -321,9 +670,148 @@ class LoaderICS:
                 # `path` may contain files with metadata, e.g. `color` and
                 # `displayname`. For now, exclude those while loading.
                 if file_path.endswith('.ics'):
-                    ics_files.append(self.read_file(file_path))
+                    sources.append(file_path)
 
-        return ics_files
+        return sources
+
+    def load_source(self, source, resource):
+        """Return items of a single file or URL, parsing it only if it changed since it was cached"""
+        stat = None
+        if not source.startswith('http'):
+            try:
+                stat = os.stat(source)
+            except OSError:
+                logging.error("Failed to load %s because file does not exist.", source)
+                return []
+            items = self.cache.get_by_stat(source, stat)
+            if items is not None:
+                return items
+
+        text = self.read_source(source)
+        digest = content_digest(text)
+        items = self.cache.get_by_digest(source, digest, stat)
+        if items is not None:
+            return items
+
+        items, error = parse_text(self, text)
+        if error is not None:
+            logging.error("Failed to parse %s. %s", resource, error)
+            return []
+        self.cache.put(source, digest, stat, items)
+        return items
+
+    def __getstate__(self):
+        """Send to the parsing processes only the settings needed for parsing"""
+        return {key: value for key, value in self.__dict__.items() if key in PARSING_SETTINGS}
+
+    def read_sources(self, sources):
+        """Read texts of several files and URLs, in parallel threads since it is mostly waiting"""
+        if len(sources) < 2:
+            return [self.read_source(source) for source in sources]
+        with ThreadPoolExecutor(max_workers=min(MAX_READING_THREADS, len(sources))) as executor:
+            return list(executor.map(self.read_source, sources))
+
+    def parse_texts(self, texts):
+        """Parse texts of several files, in parallel processes if there is enough work for them"""
+        enough_work = len(texts) > 1 and sum(len(text) for text in texts) > MIN_PARALLEL_PARSING_SIZE
+        processes = min(os.cpu_count() or 1, len(texts), MAX_PARSING_PROCESSES)
+
+        # Processes are forked from a server that preloads only this module, since forking the program
+        # itself is unsafe while its other threads may hold locks. The main module is prepared in them
+        # too, so cli() makes it calcure.__main__, which multiprocessing does not run again:
+        if enough_work and processes > 1 and "forkserver" in multiprocessing.get_all_start_methods():
+            try:
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+                chunksize = max(1, len(texts)//(4*processes))
+                with ProcessPoolExecutor(processes, mp_context=context) as executor:
+                    results = list(executor.map(parse_text_in_process, [self]*len(texts), texts,
+                                                chunksize=chunksize))
+                for _, _, messages in results:
+                    for level, message in messages:
+                        logging.log(level, "%s", message)
+                return [(items, error) for items, error, _ in results]
+            except (OSError, BrokenProcessPool) as e_message:
+                logging.error("Failed to parse files in parallel, parsing them one by one. %s", e_message)
+        return [parse_text(self, text) for text in texts]
+
+    def load_items(self, resources):
+        """Load items from each resource in the order of the config, numbering their calendars.
+        Files that did not change are taken from the cache, other files and URLs are read
+        in parallel threads, and those with new content are parsed in parallel processes"""
+
+        # If only known files were seen changing, only they are read again:
+        changed_paths, self.fingerprints.changed_paths = self.fingerprints.changed_paths, set()
+        if changed_paths and self.sources is not None:
+            known_files = {source for _, _, source in self.sources}
+            if all(path in known_files and os.path.isfile(path) for path in changed_paths):
+                return self.reload_sources(changed_paths)
+
+        self.fingerprints.clear()
+        sources = [(calendar_number, resource, source)
+                   for calendar_number, resource in enumerate(resources)
+                   for source in self.find_sources(resource)]
+        items_of_sources = [None]*len(sources)
+        stats = [None]*len(sources)
+
+        # Take local files that were not modified from the cache:
+        for number, (_, _, source) in enumerate(sources):
+            if source.startswith('http'):
+                continue
+            try:
+                stats[number] = os.stat(source)
+            except OSError:
+                logging.error("Failed to load %s because file does not exist.", source)
+                self.fingerprints.record(source)
+                items_of_sources[number] = []
+                continue
+            self.fingerprints.record(source, stats[number])
+            items_of_sources[number] = self.cache.get_by_stat(source, stats[number])
+
+        # Read the rest, and take from the cache those whose content did not change:
+        to_read = [number for number, items in enumerate(items_of_sources) if items is None]
+        texts = self.read_sources([sources[number][2] for number in to_read])
+        to_parse = []
+        for number, text in zip(to_read, texts):
+            digest = content_digest(text)
+            items_of_sources[number] = self.cache.get_by_digest(sources[number][2], digest, stats[number])
+            if items_of_sources[number] is None:
+                to_parse.append((number, text, digest))
+
+        # Parse the new content:
+        results = self.parse_texts([text for _, text, _ in to_parse])
+        for (number, _, digest), (items, error) in zip(to_parse, results):
+            _, resource, source = sources[number]
+            if error is not None:
+                logging.error("Failed to parse %s. %s", resource, error)
+                items_of_sources[number] = []
+                continue
+            self.cache.put(source, digest, stats[number], items)
+            items_of_sources[number] = items
+
+        self.sources = sources
+        self.items_of_sources = items_of_sources
+        self.cache.save()
+        return self.merge_sources()
+
+    def reload_sources(self, paths):
+        """Read again the files with these paths, keeping items of other files, and return all items"""
+        for number, (_, resource, source) in enumerate(self.sources):
+            if source in paths:
+                self.fingerprints.record(source)
+                self.items_of_sources[number] = self.load_source(source, resource)
+        self.cache.keep(source for _, _, source in self.sources)
+        self.cache.save()
+        return self.merge_sources()
+
+    def merge_sources(self):
+        """Return items of all sources in the order of the config"""
+        all_items = []
+        for (calendar_number, _, _), items in zip(self.sources, self.items_of_sources):
+            for item in items:
+                item.calendar_number = calendar_number
+                all_items.append(item)
+        return all_items
 
 
 class TaskLoaderICS(LoaderICS):
@@ -334,17 +822,22 @@ class TaskLoaderICS(LoaderICS):
         self.user_ics_tasks.done_hidden = cf.HIDE_DONE_TASKS
         self.ics_task_files = cf.ICS_TASK_FILES
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
-
-    def parse_task(self, component, calendar_number):
-        """Parse single task and add it to the user_ics_tasks"""
+        self.cache = ParsedICSCache(cf.cache_folder / "ics_tasks.pickle", (self.use_persian_calendar,))
+        self.url_cache = URLCache(cf.cache_folder / "urls")
+        self.url_timeout = cf.ICS_URL_TIMEOUT
+        self.fingerprints = Fingerprints(".ics")
+        self.sources = None
+        self.items_of_sources = None
+
+    def parse_task(self, component):
+        """Parse single task and return it, unless it was cancelled"""
         task_status = component.get('status')
 
         if task_status == "CANCELLED":
-            return
+            return None
 
         task_priority = component.get('priority')
         task_name = str(component.get('summary'))
-        task_id = self.user_ics_tasks.generate_id()
 
         # Assign status from priority:
         status = Status.NORMAL
@@ -369,11 +862,19 @@ class TaskLoaderICS(LoaderICS):
         timer = Timer([])
         is_private = False
 
-        # Add task:
-        new_task = Task(task_id, task_name, status, timer, is_private,
-                        year, month, day, calendar_number)
-        self.user_ics_tasks.add_item(new_task)
+        # Task id is assigned when tasks of all files are collected:
+        return Task(None, task_name, status, timer, is_private, year, month, day)
 
+    def parse_calendar(self, text):
+        """Parse tasks of a single ics file"""
+        tasks = []
+        cal = icalendar.Calendar.from_ical(text)
+        for component in cal.walk():
+            if component.name == 'VTODO':
+                task = self.parse_task(component)
+                if task is not None:
+                    tasks.append(task)
+        return tasks
 
     def load(self):
         """Load tasks from each of the ics files"""
@@ -383,18 +884,9 @@ class TaskLoaderICS(LoaderICS):
             return self.user_ics_tasks
 
         self.user_ics_tasks.delete_all_items()
-        for calendar_number, filename in enumerate(self.ics_task_files):
-            # For each resource from config, load a list that has one or more ics files:
-            ics_files = self.read_resource(filename)
-            for ics_file in ics_files:
-                try:
-                    cal = icalendar.Calendar.from_ical(ics_file)
-                    for component in cal.walk():
-                        if component.name == 'VTODO':
-                            self.parse_task(component, calendar_number)
-                except Exception as e_message:
-                    logging.error("Failed to parse %s. %s", filename, e_message)
-
+        for task_id, task in enumerate(self.load_items(self.ics_task_files)):
+            task.item_id = task_id
+            self.user_ics_tasks.add_item(task)
         return self.user_ics_tasks
 
 
@@ -406,9 +898,24 @@ class EventLoaderICS(LoaderICS):
         self.ics_event_files = cf.ICS_EVENT_FILES
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
         self.local_timezone = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
-
-    def parse_event(self, component, index, calendar_number):
-        """Parse single event and add it to user_ics_events"""
+        self.cache = ParsedICSCache(cf.cache_folder / "ics_events.pickle",
+                                    (self.use_persian_calendar, str(self.local_timezone)))
+        self.url_cache = URLCache(cf.cache_folder / "urls")
+        self.url_timeout = cf.ICS_URL_TIMEOUT
+        self.fingerprints = Fingerprints(".ics")
+        self.sources = None
+        self.items_of_sources = None
+
+    def parse_exdates(self, component):
+        """Return the list of dates excluded from the recurrence rule"""
+        exdates = component.get('exdate')
+        if not exdates:
+            return None
+        exdates_list = exdates if isinstance(exdates, list) else [exdates]
+        return [exdate.dt for exdates in exdates_list for exdate in exdates.dts]
+
+    def parse_event(self, component, index):
+        """Parse single event and return it"""
 
         # Default parameters:
         hour = None
@@ -460,7 +967,7 @@ class EventLoaderICS(LoaderICS):
             # Parsing recurring rules:
             if 'rrule' in component:
                 rrule = component.get('rrule').to_ical().decode('utf-8')
-                exdate = component.get('exdate')
+                exdate = self.parse_exdates(component)
                 repetition = 0
 
         except AttributeError:
@@ -477,10 +984,20 @@ class EventLoaderICS(LoaderICS):
         if self.use_persian_calendar:
             year, month, day = convert_to_persian_date(year, month, day)
 
-        # Add event:
-        new_event = UserEvent(event_id, year, month, day, name, repetition, frequency,
-                              status, is_private, calendar_number, hour, minute, rrule, exdate)
-        self.user_ics_events.add_item(new_event)
+        # Calendar number is assigned when events of all files are collected:
+        return UserEvent(event_id, year, month, day, name, repetition, frequency,
+                         status, is_private, None, hour, minute, rrule, exdate)
+
+    def parse_calendar(self, text):
+        """Parse events of a single ics file"""
+        events = []
+        cal = icalendar.Calendar.from_ical(text)
+        index = 0
+        for component in cal.walk():
+            if component.name == 'VEVENT':
+                index += 1
+                events.append(self.parse_event(component, index))
+        return events
 
     def load(self):
         """Load events from each of the ics files"""
@@ -490,19 +1007,65 @@ class EventLoaderICS(LoaderICS):
             return self.user_ics_events
 
         self.user_ics_events.delete_all_items()
-        for calendar_number, filename in enumerate(self.ics_event_files):
-
-            # For each resource from config, load a list that has one or more ics files:
-            ics_files = self.read_resource(filename)
-            for ics_file in ics_files:
-                try:
-                    cal = icalendar.Calendar.from_ical(ics_file)
-                    index = 0
-                    for component in cal.walk():
-                        if component.name == 'VEVENT':
-                            index += 1
-                            self.parse_event(component, index, calendar_number)
-
-                except Exception as e_message:
-                    logging.error("Failed to parse %s. %s", filename, e_message)
+        for event in self.load_items(self.ics_event_files):
+            self.user_ics_events.add_item(event)
         return self.user_ics_events
+
+
+class BackgroundLoader:
+    """Load data from slow sources in a separate thread, so that the interface is drawn
+    before they are ready. Loaders fill their own collections, which are then copied
+    into collections displayed on the screen by the main thread"""
+
+    def __init__(self):
+        self.thread = None
+        self.loaded = []
+        self.pending = []
+        self.load_time = 0
+
+    @property
+    def is_loading(self):
+        """Check if data is being loaded or waits to be merged"""
+        return self.thread is not None
+
+    def start(self, targets):
+        """Start loading each pair of the displayed collection and the loader that fills it.
+        If loading is already going on, the pairs are loaded again once it is merged"""
+        if self.is_loading:
+            self.pending += [target for target in targets if target not in self.pending]
+            return
+        self.thread = threading.Thread(target=self.load, args=(targets,), daemon=True)
+        self.thread.start()
+
+    def load(self, targets):
+        """Run loaders one by one, keeping the collections that were loaded"""
+        start_time = time.perf_counter()
+        for displayed_collection, loader in targets:
+            if loader.fingerprints.are_unchanged:
+                continue
+            try:
+                self.loaded.append((displayed_collection, loader.load()))
+            except Exception as e_message:
+                logging.error("Failed to load data. %s", e_message)
+        self.load_time = time.perf_counter() - start_time
+
+    def merge(self):
+        """If loading finished, pass loaded items to the displayed collections and return True,
+        unless all sources were unchanged and nothing was loaded. Then start loading what was
+        requested meanwhile"""
+        if self.thread is None or self.thread.is_alive():
+            return False
+        self.thread.join()
+        loaded, self.loaded = self.loaded, []
+        self.thread = None
+        for displayed_collection, loaded_collection in loaded:
+            displayed_collection.replace_items(loaded_collection)
+
+        # Loaders fill the same collections again, so they start only after the items were passed:
+        if self.pending:
+            pending, self.pending = self.pending, []
+            self.start(pending)
+        if not loaded:
+            return False
+        logging.info("Loaded data in the background in %.3f s.", self.load_time)
+        return True
@@ -0,0 +1,113 @@
+"""Module that measures how long loading, drawing and saving take"""
+
+import cProfile
+import functools
+import logging
+import pstats
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+class FrameTimes:
+    """Durations of the most recent frames, from the start of drawing until they are sent to the terminal"""
+
+    def __init__(self, max_frames=200):
+        self.times = deque(maxlen=max_frames)
+
+    def add(self, seconds):
+        """Remember the duration of a frame"""
+        self.times.append(seconds)
+
+    @property
+    def last(self):
+        """Duration of the last frame"""
+        return self.times[-1] if self.times else 0
+
+    def percentile(self, fraction):
+        """Duration that this fraction of recent frames did not exceed"""
+        if not self.times:
+            return 0
+        times = sorted(self.times)
+        return times[min(len(times) - 1, int(fraction*len(times)))]
+
+
+class Profiler:
+    """Wall time of methods of loaders, views and savers, measured by wrapping the methods.
+    Times of nested calls are included in the time of the calling method"""
+
+    def __init__(self, summary_file, stats_file=None):
+        self.summary_file = Path(summary_file)
+        self.stats_file = Path(stats_file) if stats_file else None
+        self.timings = {}
+        self.lock = threading.Lock()
+        self.cprofile = cProfile.Profile() if self.stats_file else None
+        self.start_time = None
+
+    def record(self, name, seconds):
+        """Add one call that took this time"""
+        with self.lock:
+            self.timings.setdefault(name, []).append(seconds)
+
+    def measure(self, cls, method_name, name=None):
+        """Replace the method of the class with one that records how long each call takes"""
+        method = getattr(cls, method_name)
+        name = name or f"{cls.__name__}.{method_name}"
+        profiler = self
+
+        @functools.wraps(method)
+        def measured_method(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - start)
+
+        setattr(cls, method_name, measured_method)
+
+    def start(self):
+        """Start counting the run time and, if asked, collecting cProfile statistics of the main thread"""
+        self.start_time = time.perf_counter()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    @property
+    def summary(self):
+        """Return the table of calls, total, mean and longest time of each measured method"""
+        run_time = time.perf_counter() - self.start_time if self.start_time else 0
+        lines = [f"Run time: {run_time:.3f} s. Times of nested calls are included in the calling method.", "",
+                 f"{'Name':<40} {'Calls':>8} {'Total ms':>12} {'Mean ms':>10} {'Max ms':>10}"]
+        with self.lock:
+            timings = sorted(self.timings.items(), key=lambda item: sum(item[1]), reverse=True)
+        for name, times in timings:
+            total = sum(times)
+            lines.append(f"{name:<40} {len(times):>8} {total*1000:>12.2f} {total/len(times)*1000:>10.3f} "
+                         f"{max(times)*1000:>10.3f}")
+        return "\n".join(lines) + "\n"
+
+    def save(self):
+        """Write the summary and cProfile statistics"""
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        try:
+            self.summary_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.summary_file, "w", encoding="utf-8") as file:
+                file.write(self.summary)
+            if self.cprofile is not None:
+                with open(self.summary_file, "a", encoding="utf-8") as file:
+                    file.write("\n")
+                    stats = pstats.Stats(self.cprofile, stream=file)
+                    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(30)
+                stats.dump_stats(self.stats_file)
+        except Exception as e_message:
+            logging.error("Failed to write profile %s. %s", self.summary_file, e_message)
+
+
+def subclasses(cls):
+    """Return all subclasses of the class, including subclasses of subclasses"""
+    result = []
+    for subclass in cls.__subclasses__():
+        result.append(subclass)
+        result.extend(subclasses(subclass))
+    return result
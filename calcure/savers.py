@@ -1,63 +1,311 @@
 """Module that controls saving data files"""
 
+import logging
+import threading
+import time
 from pathlib import Path
 
 from calcure.data import *
 from calcure.calendars import convert_to_gregorian_date
+from calcure.changelog import ChangeLog
 
 
-class TaskSaverCSV:
+class SaverCSV:
+    """Save data into CSV files.
+
+    Saving is done in two steps: a snapshot takes the changes from the collection,
+    and then snapshots are written into the file. Snapshots are either rows of all items
+    that replace the file, or records that are appended to the change log of the file.
+    Fingerprints of the loader, if given, are updated after writing, so that the program
+    does not take its own changes for changes made by others"""
+
+    def write(self, snapshots):
+        """Write snapshots in the order they were taken, rewriting the file only with the last full one"""
+        full_snapshots = [number for number, (rows, _) in enumerate(snapshots) if rows is not None]
+        first = full_snapshots[-1] if full_snapshots else 0
+        if full_snapshots:
+            self.write_file(snapshots[first][0])
+            if self.change_log is not None:
+                self.change_log.clear()
+        records = [record for _, records in snapshots[first:] for record in records]
+        if records and self.change_log is not None:
+            self.change_log.append(records)
+        if self.fingerprints is not None:
+            self.fingerprints.refresh()
+
+    def save(self):
+        """Write the changes made since the last save"""
+        self.write([self.snapshot()])
+
+    def save_all(self):
+        """Rewrite the file with all items and remove the change log"""
+        self.write([self.snapshot_all()])
+
+    def compact(self):
+        """Fold the change log into the file"""
+        if self.change_log is not None and self.change_log.exists:
+            self.save_all()
+
+
+class TaskSaverCSV(SaverCSV):
     """Save tasks into CSV files"""
 
-    def __init__(self, user_tasks, cf):
+    def __init__(self, user_tasks, cf, fingerprints=None):
         self.user_tasks = user_tasks
+        self.fingerprints = fingerprints
         self.tasks_file = cf.TASKS_FILE
+        self.change_log = ChangeLog(self.tasks_file) if cf.CSV_CHANGE_LOG else None
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
 
-    def save(self):
-        """Rewrite CSV file with changed tasks"""
+    def row(self, task):
+        """Return the columns of the task in the CSV file"""
+
+        # If persian calendar was used, we convert event back to Gregorian for storage:
+        if self.use_persian_calendar and task.year != 0:
+            year, month, day = convert_to_gregorian_date(task.year, task.month, task.day)
+        else:
+            year, month, day = task.year, task.month, task.day
+
+        dot = "."
+        return [year, month, day, f"{dot*task.privacy}{task.name}", task.status.name.lower(), *task.timer.stamps]
+
+    def snapshot(self):
+        """Take records of tasks changed since the last save, or rows of all tasks if changes are not logged"""
+        if self.change_log is None or not self.user_tasks.tracks_changes:
+            return self.snapshot_all()
+        if self.change_log.is_larger_than_base:
+            rows, _ = self.snapshot_all()
+
+            # Items keep their ids until they are loaded again, so the new log starts with them:
+            return rows, [["ids", *(task.item_id for task in self.user_tasks.items)]]
+        records = [["delete", task.item_id] for task in self.user_tasks.deleted_items.values()]
+        records += [["set", task.item_id, *self.row(task)] for task in self.user_tasks.modified_items.values()]
+        if self.user_tasks.is_order_changed:
+            records.append(["order", *(task.item_id for task in self.user_tasks.items)])
+        self.user_tasks.changed = False
+        return None, records
+
+    def snapshot_all(self):
+        """Take rows of all tasks"""
+        rows = [self.row(task) for task in self.user_tasks.items]
+        self.user_tasks.changed = False
+        return rows, []
+
+    def write_file(self, rows):
+        """Rewrite CSV file with the rows of tasks"""
         original_file = self.tasks_file
         dummy_file = Path(f"{self.tasks_file}.bak")
         with open(dummy_file, "w", encoding="utf-8") as f:
-            for task in self.user_tasks.items:
-
-                # If persian calendar was used, we convert event back to Gregorian for storage:
-                if self.use_persian_calendar and task.year != 0:
-                    year, month, day = convert_to_gregorian_date(task.year, task.month, task.day)
-                else:
-                    year, month, day = task.year, task.month, task.day
-
-                dot = "."
-                f.write(f'{year},{month},{day},"{dot*task.privacy}{task.name}",{task.status.name.lower()}')
-                for stamp in task.timer.stamps:
+            for year, month, day, name, status, *stamps in rows:
+                f.write(f'{year},{month},{day},"{name}",{status}')
+                for stamp in stamps:
                     f.write(f',{str(stamp)}')
                 f.write("\n")
         dummy_file.replace(original_file)
-        self.user_tasks.changed = False
 
 
-class EventSaverCSV:
+class EventSaverCSV(SaverCSV):
     """Save events into CSV files"""
 
-    def __init__(self, user_events, cf):
+    def __init__(self, user_events, cf, fingerprints=None):
         self.user_events = user_events
+        self.fingerprints = fingerprints
         self.events_file = cf.EVENTS_FILE
+        self.change_log = ChangeLog(self.events_file) if cf.CSV_CHANGE_LOG else None
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
 
-    def save(self):
-        """Rewrite the data file with changed events"""
+    def row(self, ev):
+        """Return the columns of the event in the CSV file"""
+
+        # If persian calendar was used, we convert event back to Gregorian for storage:
+        if self.use_persian_calendar:
+            year, month, day = convert_to_gregorian_date(ev.year, ev.month, ev.day)
+        else:
+            year, month, day = ev.year, ev. month, ev.day
+
+        name = f'{"."*ev.privacy}{ev.name}'
+        return [ev.item_id, year, month, day, name, ev.repetition, ev.frequency.name.lower(), ev.status.name.lower()]
+
+    def snapshot(self):
+        """Take records of events changed since the last save, or rows of all events if changes are not logged"""
+        if self.change_log is None or not self.user_events.tracks_changes:
+            return self.snapshot_all()
+        if self.change_log.is_larger_than_base:
+            rows, _ = self.snapshot_all()
+
+            # Items keep their ids until they are loaded again, so the new log starts with them:
+            return rows, [["ids", *(ev.item_id for ev in self.user_events.items)]]
+        records = [["delete", ev.item_id] for ev in self.user_events.deleted_items.values()]
+        records += [["set", *self.row(ev)] for ev in self.user_events.modified_items.values()]
+        self.user_events.changed = False
+        return None, records
+
+    def snapshot_all(self):
+        """Take rows of all events"""
+        rows = [self.row(ev) for ev in self.user_events.items]
+        self.user_events.changed = False
+        return rows, []
+
+    def write_file(self, rows):
+        """Rewrite the data file with the rows of events"""
         original_file = self.events_file
         dummy_file = Path(f"{self.events_file}.bak")
         with open(dummy_file, "w", encoding="utf-8") as file:
-            for ev in self.user_events.items:
+            for event_id, year, month, day, name, repetition, frequency, status in rows:
+                file.write(f'{event_id},{year},{month},{day},"{name}",{repetition},{frequency},{status}\n')
+        dummy_file.replace(original_file)
 
-                # If persian calendar was used, we convert event back to Gregorian for storage:
-                if self.use_persian_calendar:
-                    year, month, day = convert_to_gregorian_date(ev.year, ev.month, ev.day)
-                else:
-                    year, month, day = ev.year, ev. month, ev.day
 
-                name = f'{"."*ev.privacy}{ev.name}'
-                file.write(f'{ev.item_id},{year},{month},{day},"{name}",{ev.repetition},{ev.frequency.name.lower()},{ev.status.name.lower()}\n')
-        dummy_file.replace(original_file)
+class TaskSaverSQLite:
+    """Save tasks into the SQLite database, writing only the rows of changed tasks"""
+
+    def __init__(self, user_tasks, database, cf, fingerprints=None):
+        self.user_tasks = user_tasks
+        self.database = database
+        self.fingerprints = fingerprints
+        self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
+
+    def row(self, task):
+        """Return the row of the task in the database"""
+        if self.use_persian_calendar and task.year != 0:
+            year, month, day = convert_to_gregorian_date(task.year, task.month, task.day)
+        else:
+            year, month, day = task.year, task.month, task.day
+        stamps = ",".join(str(stamp) for stamp in task.timer.stamps)
+        return (task.item_id, year, month, day, task.name, task.status.name.lower(), int(task.privacy), stamps)
+
+    def snapshot(self):
+        """Take the tasks added, changed or deleted since the last save"""
+        rows = [self.row(task) for task in self.user_tasks.modified_items.values()]
+        deleted_ids = [task.item_id for task in self.user_tasks.deleted_items.values()]
+        order = [task.item_id for task in self.user_tasks.items] if self.user_tasks.is_order_changed else None
+        self.user_tasks.changed = False
+        return rows, deleted_ids, order, False
+
+    def snapshot_all(self):
+        """Take all tasks to replace the tasks in the database"""
+        rows = [self.row(task) for task in self.user_tasks.items]
+        self.user_tasks.changed = False
+        return rows, [], [task.item_id for task in self.user_tasks.items], True
+
+    def write(self, snapshots):
+        """Write snapshots in the order they were taken"""
+        self.database.write_tasks(snapshots)
+        if self.fingerprints is not None:
+            self.fingerprints.refresh()
+
+    def save(self):
+        """Write the tasks added, changed or deleted since the last save"""
+        self.write([self.snapshot()])
+
+    def save_all(self):
+        """Replace all tasks in the database with the tasks of the collection"""
+        self.write([self.snapshot_all()])
+
+
+class EventSaverSQLite:
+    """Save events into the SQLite database, writing only the rows of changed events"""
+
+    def __init__(self, user_events, database, cf, fingerprints=None):
+        self.user_events = user_events
+        self.database = database
+        self.fingerprints = fingerprints
+        self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
+
+    def row(self, ev):
+        """Return the row of the event in the database"""
+        if self.use_persian_calendar:
+            year, month, day = convert_to_gregorian_date(ev.year, ev.month, ev.day)
+        else:
+            year, month, day = ev.year, ev.month, ev.day
+        return (ev.item_id, year, month, day, ev.name, int(ev.repetition), ev.frequency.name.lower(),
+                ev.status.name.lower(), int(ev.privacy))
+
+    def snapshot(self):
+        """Take the events added, changed or deleted since the last save"""
+        rows = [self.row(event) for event in self.user_events.modified_items.values()]
+        deleted_ids = [event.item_id for event in self.user_events.deleted_items.values()]
+        self.user_events.changed = False
+        return rows, deleted_ids, False
+
+    def snapshot_all(self):
+        """Take all events to replace the events in the database"""
+        rows = [self.row(event) for event in self.user_events.items]
         self.user_events.changed = False
+        return rows, [], True
+
+    def write(self, snapshots):
+        """Write snapshots in the order they were taken"""
+        self.database.write_events(snapshots)
+        if self.fingerprints is not None:
+            self.fingerprints.refresh()
+
+    def save(self):
+        """Write the events added, changed or deleted since the last save"""
+        self.write([self.snapshot()])
+
+    def save_all(self):
+        """Replace all events in the database with the events of the collection"""
+        self.write([self.snapshot_all()])
+
+
+class BackgroundSaver:
+    """Write changes in a separate thread, so that a slow disk does not hold the interface.
+    Snapshots of changes are taken by the main thread, and a burst of changes that come
+    within the delay of each other is written at once"""
+
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self.pending = {}
+        self.scheduled = 0
+        self.written = 0
+        self.last_change_time = 0
+        self.is_urgent = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def save(self, saver):
+        """Take the changes of the collection of the saver and schedule writing them"""
+        snapshot = saver.snapshot()
+        with self.condition:
+            self.pending.setdefault(saver, []).append(snapshot)
+            self.scheduled += 1
+            self.last_change_time = time.monotonic()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def run(self):
+        """Wait for changes and write them once no new changes came for the delay"""
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                while not self.is_urgent:
+                    remaining = self.last_change_time + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                pending, self.pending = self.pending, {}
+            for saver, snapshots in pending.items():
+                try:
+                    saver.write(snapshots)
+                except Exception as e_message:
+                    logging.error("Failed to save data. %s", e_message)
+            with self.condition:
+                self.written += sum(len(snapshots) for snapshots in pending.values())
+                if self.written == self.scheduled:
+                    self.is_urgent = False
+                self.condition.notify_all()
+
+    def flush(self):
+        """Write the scheduled changes right away and wait until they are written"""
+        with self.condition:
+            target = self.scheduled
+            if self.written >= target:
+                return
+            self.is_urgent = True
+            self.condition.notify_all()
+            while self.written < target:
+                self.condition.wait()
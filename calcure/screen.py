@@ -7,6 +7,27 @@ from calcure.data import Events, AppState, CalState
 from calcure.calendars import Calendar
 
 
+def current_date(use_persian_calendar):
+    """Return todays's date in datetime format"""
+    if use_persian_calendar:
+        import jdatetime
+        return jdatetime.date.today()
+    return datetime.date.today()
+
+
+class Frame:
+    """Size of the terminal, boundaries of the panes and today's date, taken once
+    at the start of each frame and used by all views while the frame is drawn"""
+
+    def __init__(self, stdscr, right_pane_percentage, use_persian_calendar):
+        self.y_max, self.x_max = stdscr.getmaxyx()
+        if 5 < right_pane_percentage < 95:
+            self.journal_pane_width = int(self.x_max//(100/right_pane_percentage))
+        else:
+            self.journal_pane_width = self.x_max//4
+        self.today = current_date(use_persian_calendar)
+
+
 class Screen:
     """Main state of the program that describes what is displayed and how"""
     def __init__(self, stdscr, cf):
@@ -25,51 +46,55 @@ class Screen:
         self.right_pane_percentage = cf.RIGHT_PANE_PERCENTAGE
         self.currently_drawn = self.state
         self.selection_mode = False
+        self.show_performance = False
         self.reload_data = False
+        self.is_loading = False
+        self.input_timed_out = False
+        self.ticking_views = []
+        self.month_layout = None
         self.key = None
+        self.frame = None
+        self.new_frame()
         self.day = self.today.day
         self.month = self.today.month
         self.year = self.today.year
         self.reload_interval = cf.DATA_RELOAD_INTERVAL
         self.last_data_reload_time = datetime.datetime.now()
+        self.last_data_load_time = self.last_data_reload_time
 
     @property
     def is_active_pane(self):
         """Return True if currently drawn pane in the active one"""
         return self.state == self.currently_drawn
 
+    def new_frame(self):
+        """Take the size of the terminal and today's date for the next frame"""
+        self.frame = Frame(self.stdscr, self.right_pane_percentage, self.use_persian_calendar)
+        if self.frame.x_max < 40 or self.frame.x_max < self.frame.journal_pane_width:
+            self.split = False
+
     @property
     def y_max(self):
         """Get maximum size of the screen"""
-        y_max, _ = self.stdscr.getmaxyx()
-        return y_max
+        return self.frame.y_max
 
     @property
     def journal_pane_width(self):
         """Calculate the width of the right pane if the value is adequate"""
-        _, x_max = self.stdscr.getmaxyx()
-        if 5 < self.right_pane_percentage < 95:
-            return int(x_max//(100/self.right_pane_percentage))
-        return x_max//4
+        return self.frame.journal_pane_width
 
     @property
     def x_max(self):
         """Calculate the right boundary of the screen"""
-        _, x_max = self.stdscr.getmaxyx()
-        if x_max < 40:
-            self.split = False
         if self.split and self.currently_drawn != AppState.JOURNAL:
-            return x_max - self.journal_pane_width
-        return x_max
+            return self.frame.x_max - self.frame.journal_pane_width
+        return self.frame.x_max
 
     @property
     def x_min(self):
         """Calculate the left boundary of the screen"""
-        _, x_max = self.stdscr.getmaxyx()
-        if x_max < self.journal_pane_width:
-            self.split = False
         if self.split and self.currently_drawn == AppState.JOURNAL:
-            return x_max - self.journal_pane_width + 2
+            return self.frame.x_max - self.frame.journal_pane_width + 2
         return 0
 
     @property
@@ -84,11 +109,7 @@ class Screen:
     @property
     def today(self) -> datetime:
         """Return todays's date in datetime format"""
-        if self.use_persian_calendar:
-            import jdatetime
-            return jdatetime.date.today()
-        else:
-            return datetime.date.today()
+        return self.frame.today
 
     @property
     def number_of_weeks(self) -> int:
@@ -100,6 +121,7 @@ class Screen:
         """Check if enough time passed since last data reload or it was requested"""
         if self.reload_data:
             self.reload_data = False
+            self.last_data_reload_time = datetime.datetime.now()
             return True
         if self.reload_interval == 0:
             return False
@@ -172,9 +194,10 @@ class Screen:
 
     def reset_to_today(self):
         """Reset the day, month, and year to the current date"""
-        self.month = self.today.month
-        self.year = self.today.year
-        self.day = self.today.day
+        today = current_date(self.use_persian_calendar)
+        self.month = today.month
+        self.year = today.year
+        self.day = today.day
 
     def is_valid_day(self, number) -> bool:
         """Check if input corresponds to a date in this month"""
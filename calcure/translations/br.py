@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "COMBINAÇÃO DE TECLAS DO DIÁRIO"
 KEYS_GENERAL = {
         " Espaço ": "Muda entre calendário e diário",
         "   /   ": "Alternar tela dividida",
+        "   O   ": "Alternar dados de desempenho",
         "   *   ": "Alternar privacidade global",
         "   ?   ": "Alternar essa ajuda",
         "   Q   ": "Reload",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Adicionar data limite da tarefa número: "
 MSG_TS_DEAD_DEL   = "Remover data limite da tarefa número: "
 MSG_TS_DEAD_DATE  = "Adicionar data limite em (AAAA/MM/DD): "
 MSG_WEATHER       = "Clima está carregando..."
+MSG_LOADING       = "Carregando calendários..."
 MSG_ERRORS        = "Ocorreram erros. Veja info.log na sua pasta de configuração."
 MSG_GOTO          = "Ir para a data (AAAA/MM/DD): "
 MSG_GOTO_D        = "Ir para a data: "
@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "JOURNAL-TASTENKOMBINATIONEN"
 KEYS_GENERAL = {
         " Space ": "Zwischen Kalender und Journal wechseln",
         "   /   ": "Geteilte Ansicht umschalten",
+        "   O   ": "Leistungsdaten ein-/ausblenden",
         "   *   ": "Globale Privatsphäre umschalten",
         "   ?   ": "Diese Hilfe ein-/ausblenden",
         "   Q   ": "Neu laden",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Deadline für Aufgabennummer hinzufügen: "
 MSG_TS_DEAD_DEL   = "Deadline für Aufgabennummer entfernen: "
 MSG_TS_DEAD_DATE  = "Deadline hinzufügen am (JJJJ/MM/TT): "
 MSG_WEATHER       = "Wetter wird geladen..."
+MSG_LOADING       = "Kalender werden geladen..."
 MSG_ERRORS        = "Es sind Fehler aufgetreten. Siehe info.log im Konfigurationsordner."
 MSG_INPUT         = "Ungültige Eingabe."
 MSG_GOTO          = "Zum Datum gehen (JJJJ/MM/TT): "
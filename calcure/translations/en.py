@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "JOURNAL KEYBINDINGS"
 KEYS_GENERAL = {
         " Space ": "Switch between calendar and journal",
         "   /   ": "Toggle split screen",
+        "   O   ": "Toggle performance overlay",
         "   *   ": "Toggle global privacy",
         "   ?   ": "Toggle this help",
         "   Q   ": "Reload",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Add deadline for task number: "
 MSG_TS_DEAD_DEL   = "Remove deadline of the task number: "
 MSG_TS_DEAD_DATE  = "Add deadline on (YYYY/MM/DD): "
 MSG_WEATHER       = "Weather is loading..."
+MSG_LOADING       = "Loading calendars..."
 MSG_ERRORS        = "Errors have occurred. See info.log in your config folder."
 MSG_INPUT         = "Incorrect input."
 MSG_GOTO          = "Go to date (YYYY/MM/DD): "
@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "ATAJOS DEL DIARIO"
 KEYS_GENERAL = {
         " Espacio ": "Cambiar entre el calendario y el diario",
         "   /   ": "Alternar pantalla dividida",
+        "   O   ": "Alternar datos de rendimiento",
         "   *   ": "Alternar privacidad global",
         "   ?   ": "Alternar para ayuda",
         "   Q   ": "Recargar",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Agregar fecha límite para la tarea número: "
 MSG_TS_DEAD_DEL   = "Remover fecha límite para la tarea número: "
 MSG_TS_DEAD_DATE  = "Agregar fecha límite en (YYY/MM/DD): "
 MSG_WEATHER       = "Cargando el clima..."
+MSG_LOADING       = "Cargando calendarios..."
 MSG_ERRORS        = "Han ocurrido errores. Vea info.log en su carpeta config."
 MSG_INPUT         = "Entrada incorrecta."
 MSG_GOTO          = "Ir a la fecha (YYYY/MM/DD): "
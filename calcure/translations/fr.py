@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL = "JOURNAL"
 KEYS_GENERAL = {
         " Space ": "Basculer entre calendrier et journal",
         "   /   ": "Basculer l'écran partagé",
+        "   O   ": "Basculer l'affichage des performances",
         "   *   ": "Basculer la confidentialité globale",
         "   ?   ": "Basculer cette aide",
         "   Q   ": "Rafraîchir",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Ajouter le deadline pour la tâche numéro: "
 MSG_TS_DEAD_DEL   = "Supprimer le deadline de la tâche numéro: "
 MSG_TS_DEAD_DATE  = "Ajouter le deadline (AAAA/MM/JJ): "
 MSG_WEATHER       = "La météo se charge..."
+MSG_LOADING       = "Chargement des calendriers..."
 MSG_ERRORS        = "Des erreurs se sont produites. Voir info.log dans votre dossier de configuration."
 MSG_GOTO          = "Aller au (YYYY/MM/DD): "
 MSG_GOTO_D        = "Aller au: "
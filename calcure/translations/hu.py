@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "NAPLÓ BILLENTYŰK"
 KEYS_GENERAL = {
         " Space ": "Váltás a naptár és napló között",
         "   /   ": "Képernyő felosztás be-/kikapcsolása",
+        "   O   ": "Teljesítményadatok megjelenítése",
         "   *   ": "Adatvédelmi mód be-/kikapcsolása",
         "   ?   ": "Súgó megjelenítése",
         "   Q   ": "Újratöltés",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Határidő hozzáadása feladathoz (sorszám): "
 MSG_TS_DEAD_DEL   = "Határidő eltávolítása feladathoz (sorszám): "
 MSG_TS_DEAD_DATE  = "Határidő hozzáadása (ÉÉÉÉ/HH/NN): "
 MSG_WEATHER       = "Időjárás betöltése..."
+MSG_LOADING       = "Naptárak betöltése..."
 MSG_ERRORS        = "Hiba történt. Lásd info.log a konfigurációs mappában."
 MSG_INPUT         = "Hibás bemenet."
 MSG_GOTO          = "Ugrás dátumra (ÉÉÉÉ/HH/NN): "
@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "SCORCIATOIE DA TASTIERA PER IL DIARIO"
 KEYS_GENERAL = {
         " Barra spaziatrice ": "Cambia fra calendario e diario",
         "   /   ": "Attiva la divisione dello schermo",
+        "   O   ": "Attiva i dati sulle prestazioni",
         "   *   ": "Attiva la privacy globale",
         "   ?   ": "Aiuto",
         "   Q   ": "Reload",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Aggiungi una scadenza per l'attività con numero: "
 MSG_TS_DEAD_DEL   = "Rimuovi la scadenza per l'attività con numero: "
 MSG_TS_DEAD_DATE  = "Aggiungi una scandeza per il (AAAA/MM/GG): "
 MSG_WEATHER       = "Caricamento del meteo..."
+MSG_LOADING       = "Caricamento dei calendari..."
 MSG_ERRORS        = "Si sono verificati degli errori. Consulta info.log nella cartella di configurazione."
 MSG_GOTO          = "Vai alla data (YYYY/MM/DD): "
 MSG_GOTO_D        = "Vai alla data: "
@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "КЛАВИШИ ЖУРНАЛА"
 KEYS_GENERAL = {
         " Space ": "Переключать между календарём и журналом",
         "   /   ": "Переключать режим разделённого экрана",
+        "   O   ": "Показать производительность",
         "   *   ": "Переключать приватность",
         "   ?   ": "Вызвать экран помощи",
         "   Q   ": "Перезагрузить",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Добавить дедлайн к задаче номер:
 MSG_TS_DEAD_DEL   = "Удалить дедлайн задачи номер: "
 MSG_TS_DEAD_DATE  = "Установить дедлайн на (YYYY/MM/DD): "
 MSG_WEATHER       = "Загружается информации о погоде..."
+MSG_LOADING       = "Загружаются календари..."
 MSG_ERRORS        = "Возникли ошибки. Детали в info.log файле в конфиг директории."
 MSG_GOTO          = "Перейти к дате (YYYY/MM/DD): "
 MSG_GOTO_D        = "Перейти к дате: "
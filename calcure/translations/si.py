@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "UPRAVLJANJE Z DNEVNIKOM"
 KEYS_GENERAL = {
         " Presl.": "Preklopi med koledarjem in dnevnikom",
         "   /   ": "Vklopi/izklopi razdeljeni zaslon",
+        "   O   ": "Prikaži/skrij podatke o zmogljivosti",
         "   *   ": "Globalno vklopi/izklopi zasebnost",
         "   ?   ": "Prikaži/skrij pomoč",
         "   Q   ": "Osveži podatke",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Dodaj rok za opravilo s številko: "
 MSG_TS_DEAD_DEL   = "Odstrani rok za opravilo s številko: "
 MSG_TS_DEAD_DATE  = "Dodaj rok (LLLL/MM/DD): "
 MSG_WEATHER       = "Vreme se nalaga ..."
+MSG_LOADING       = "Koledarji se nalagajo..."
 MSG_ERRORS        = "Prišlo je do napak. Poglej info.log v svoji konfiguracijski mapi."
 MSG_INPUT         = "Neveljaven vnos."
 MSG_GOTO          = "Pojdi na datum (LLLL/MM/DD): "
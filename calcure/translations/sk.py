@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "SKRATKY PRE DENNÍK"
 KEYS_GENERAL = {
         " Medz ": "Prepnúť medzi kalendárom a denníkom",
         "   /   ": "Vypnúť/zapnúť rozdelenie obrazovky",
+        "   O   ": "Vypnúť/zapnúť údaje o výkone",
         "   *   ": "Vypnúť/zapnúť globálne súkromie",
         "   ?   ": "Vypnúť/zapnúť tohto pomocníka",
         "   Q   ": "Znova načítať",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Pridať hraničný termín úlohy číslo: "
 MSG_TS_DEAD_DEL   = "Odstrániť hraničný termín ulohy číslo: "
 MSG_TS_DEAD_DATE  = "Pridať hraničný termín dňa (RRRR/MM/DD): "
 MSG_WEATHER       = "Počasie sa načíta..."
+MSG_LOADING       = "Kalendáre sa načítavajú..."
 MSG_ERRORS        = "Došlo k chybe. Otvorte info.log v priečinku s konfiguráciou."
 MSG_INPUT         = "Neplatný vstup."
 MSG_GOTO          = "Prejsť na dátum (RRRR/MM/DD): "
@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "GÜNLÜK TUŞ ATAMALARI"
 KEYS_GENERAL = {
         " Space ": "Takvim ve günlük arasında geçiş yapma",
         "   /   ": "Bölünmüş ekranı aç / kapat",
+        "   O   ": "Performans bilgisini aç / kapat",
         "   *   ": "Genel gizliliği aç / kapat",
         "   ?   ": "Bu yardımı aç / kapat",
         "   Q   ": "Yeniden yükle",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "Görev numarası için son tarih ekle: "
 MSG_TS_DEAD_DEL   = "Görev numarasının son tarihini kaldırın: "
 MSG_TS_DEAD_DATE  = "Son tarih ekleyin (YYYY/MM/DD): "
 MSG_WEATHER       = "Hava durumu yükleniyor..."
+MSG_LOADING       = "Takvimler yükleniyor..."
 MSG_ERRORS        = "Hatalar oluştu. Yapılandırma klasörünüzdeki info.log dosyasına bakın."
 MSG_GOTO          = "Tarihe git (YYYY/MM/DD): "
 MSG_GOTO_D        = "Tarihe git: "
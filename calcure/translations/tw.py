@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "日誌快捷鍵"
 KEYS_GENERAL = {
         " Space ": "切換日曆和日誌",
         "   /   ": "切換螢幕分割顯示",
+        "   O   ": "切換效能資訊",
         "   *   ": "切換全域隱私模式",
         "   ?   ": "顯示此說明",
         "   Q   ": "重新載入",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "為任務編號新增截止日期："
 MSG_TS_DEAD_DEL   = "移除任務編號的截止日期："
 MSG_TS_DEAD_DATE  = "設定截止日期(YYYY/MM/DD)："
 MSG_WEATHER       = "正在載入天氣..."
+MSG_LOADING       = "正在載入行事曆..."
 MSG_ERRORS        = "發生錯誤，詳情請查看配置資料夾中的 info.log。"
 MSG_INPUT         = "輸入錯誤。"
 MSG_GOTO          = "前往日期(YYYY/MM/DD)："
@@ -13,6 +13,7 @@ TITLE_KEYS_JOURNAL  = "任务键位绑定"
 KEYS_GENERAL = {
         " Space ": "切换日历和任务视图",
         "   /   ": "切换分屏模式",
+        "   O   ": "切换性能信息",
         "   *   ": "切换全局隐私模式",
         "   ?   ": "显示此帮助",
         "   Q   ": "重新加载",
@@ -104,6 +105,7 @@ MSG_TS_DEAD_ADD   = "为任务编号添加截止日期："
 MSG_TS_DEAD_DEL   = "移除任务编号的截止日期："
 MSG_TS_DEAD_DATE  = "设置截止日期 (YYYY/MM/DD)："
 MSG_WEATHER       = "正在加载天气信息..."
+MSG_LOADING       = "正在加载日历..."
 MSG_ERRORS        = "发生错误。查看配置文件夹中的 info.log。"
 MSG_INPUT         = "输入有误。"
 MSG_GOTO          = "跳转至日期 (YYYY/MM/DD)："
@@ -0,0 +1,150 @@
+"""Module that notices changes of data files made by other programs while calcure is running"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import threading
+import time
+
+from calcure.loaders import Fingerprints
+
+
+# Events of inotify after which a file in a watched folder may have new content:
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+WATCHED_EVENTS = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Watcher:
+    """Collect paths of files and folders that changed, noticed in a separate thread,
+    until the main loop takes them"""
+
+    def __init__(self):
+        self.changed_paths = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add_changes(self, paths):
+        """Remember the paths that changed"""
+        with self.lock:
+            self.changed_paths.update(paths)
+
+    def take_changes(self):
+        """Return the paths that changed since the last call"""
+        with self.lock:
+            changed_paths, self.changed_paths = self.changed_paths, set()
+        return changed_paths
+
+    def start(self):
+        """Start watching in the background"""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+
+class InotifyWatcher(Watcher):
+    """Watch folders of the files with inotify of Linux, so changes are noticed as soon as they happen.
+    Files are often replaced rather than rewritten, so their folders are watched instead of them"""
+
+    def __init__(self):
+        super().__init__()
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.file_descriptor = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.folders = {}
+        self.start()
+
+    def watch(self, paths):
+        """Watch the folders and the folders of the files, adding those that are not watched yet"""
+        folders = {path if os.path.isdir(path) else os.path.dirname(path) for path in paths}
+        with self.lock:
+            watched_folders = set(self.folders.values())
+        for folder in folders - watched_folders:
+            if not os.path.isdir(folder):
+                continue
+            descriptor = self.libc.inotify_add_watch(self.file_descriptor, os.fsencode(folder), WATCHED_EVENTS)
+            if descriptor < 0:
+                logging.error("Failed to watch %s. %s", folder, os.strerror(ctypes.get_errno()))
+                continue
+            with self.lock:
+                self.folders[descriptor] = folder
+
+    def run(self):
+        """Read events of inotify and turn them into paths of changed files and folders"""
+        while True:
+            try:
+                buffer = os.read(self.file_descriptor, 65536)
+            except OSError as e_message:
+                logging.error("Stopped watching files for changes. %s", e_message)
+                return
+            paths = set()
+            offset = 0
+            while offset < len(buffer):
+                descriptor, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+
+                # Once a watched folder is deleted, it has to be watched again if it is created anew:
+                with self.lock:
+                    if mask & IN_IGNORED:
+                        folder = self.folders.pop(descriptor, None)
+                    else:
+                        folder = self.folders.get(descriptor)
+                if folder is not None:
+                    paths.add(os.path.join(folder, os.fsdecode(name)) if name else folder)
+            self.add_changes(paths)
+
+
+class PollingWatcher(Watcher):
+    """Check fingerprints of the files and folders every second, where inotify is not available"""
+
+    def __init__(self, interval=1):
+        super().__init__()
+        self.interval = interval
+        self.fingerprints = Fingerprints()
+        self.start()
+
+    def watch(self, paths):
+        """Watch the files and folders, adding those that are not watched yet"""
+        with self.lock:
+            new_paths = [path for path in paths if str(path) not in self.fingerprints.files]
+        for path in new_paths:
+            fingerprint = self.fingerprints.current(path)
+            with self.lock:
+                self.fingerprints.files[str(path)] = fingerprint
+
+    def run(self):
+        """Compare fingerprints of the files and folders with those seen a second ago"""
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                files = dict(self.fingerprints.files)
+            paths = set()
+            for path, fingerprint in files.items():
+                current = self.fingerprints.current(path)
+                if current != fingerprint:
+                    paths.add(path)
+                    with self.lock:
+                        self.fingerprints.files[path] = current
+            self.add_changes(paths)
+
+
+def make_watcher():
+    """Return the watcher that uses inotify if it works on this system, or the one that polls files"""
+    if hasattr(os, "O_CLOEXEC"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e_message:
+            logging.info("Inotify is not available, files are checked for changes every second. %s", e_message)
+    return PollingWatcher()
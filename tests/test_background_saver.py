@@ -0,0 +1,84 @@
+"""Tests of writing changes in a background thread"""
+
+import threading
+import time
+
+from calcure.savers import BackgroundSaver
+
+
+class RecordingSaver:
+    """Saver that remembers the snapshots it was asked to write"""
+
+    def __init__(self, fail=False):
+        self.number = 0
+        self.writes = []
+        self.fail = fail
+        self.thread = None
+
+    def snapshot(self):
+        self.number += 1
+        return self.number
+
+    def write(self, snapshots):
+        self.thread = threading.current_thread()
+        self.writes.append(list(snapshots))
+        if self.fail:
+            raise OSError("disk is full")
+
+
+def test_burst_of_changes_is_written_at_once():
+    background_saver = BackgroundSaver(delay=0.2)
+    saver = RecordingSaver()
+    for _ in range(50):
+        background_saver.save(saver)
+    assert saver.writes == []
+    time.sleep(0.5)
+    assert saver.writes == [list(range(1, 51))]
+    assert saver.thread is not threading.current_thread()
+
+
+def test_writing_waits_until_changes_stop_coming():
+    background_saver = BackgroundSaver(delay=0.2)
+    saver = RecordingSaver()
+    for _ in range(5):
+        background_saver.save(saver)
+        time.sleep(0.1)
+    assert saver.writes == []
+    time.sleep(0.4)
+    assert saver.writes == [[1, 2, 3, 4, 5]]
+
+
+def test_flush_writes_right_away_and_waits():
+    background_saver = BackgroundSaver(delay=60)
+    events_saver, tasks_saver = RecordingSaver(), RecordingSaver()
+    background_saver.save(events_saver)
+    background_saver.save(tasks_saver)
+    background_saver.save(tasks_saver)
+    start = time.monotonic()
+    background_saver.flush()
+    assert time.monotonic() - start < 5
+    assert events_saver.writes == [[1]]
+    assert tasks_saver.writes == [[1, 2]]
+
+    # Nothing to write:
+    background_saver.flush()
+    assert tasks_saver.writes == [[1, 2]]
+
+    # Later changes wait for the delay again:
+    background_saver.save(tasks_saver)
+    time.sleep(0.2)
+    assert tasks_saver.writes == [[1, 2]]
+    background_saver.flush()
+    assert tasks_saver.writes == [[1, 2], [3]]
+
+
+def test_failed_write_does_not_stop_saving(caplog):
+    background_saver = BackgroundSaver(delay=0)
+    saver = RecordingSaver(fail=True)
+    background_saver.save(saver)
+    background_saver.flush()
+    assert "Failed to save data" in caplog.text
+    saver.fail = False
+    background_saver.save(saver)
+    background_saver.flush()
+    assert saver.writes == [[1], [2]]
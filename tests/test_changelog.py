@@ -0,0 +1,175 @@
+"""Tests of the change log of CSV files: logging edits, replaying them on load and folding them into the file"""
+
+from types import SimpleNamespace
+
+from calcure.changelog import ChangeLog
+from calcure.data import Task, Timer, Status, UserEvent, Frequency
+from calcure.loaders import TaskLoaderCSV, EventLoaderCSV
+from calcure.savers import TaskSaverCSV, EventSaverCSV
+
+
+def make_cf(tmp_path, change_log=True):
+    """Settings of the loaders and savers, with data files in a temporary folder"""
+    return SimpleNamespace(TASKS_FILE=tmp_path / "tasks.csv", EVENTS_FILE=tmp_path / "events.csv",
+                           HIDE_DONE_TASKS=False, USE_PERSIAN_CALENDAR=False, CSV_CHANGE_LOG=change_log)
+
+
+def write_tasks(cf, names):
+    """Write the tasks file with the tasks of these names, as other programs would"""
+    with open(cf.TASKS_FILE, "w", encoding="utf-8") as file:
+        for name in names:
+            file.write(f'0,0,0,"{name}",normal\n')
+
+
+def append_task(cf, name):
+    """Add a task to the end of the tasks file, as other programs would"""
+    with open(cf.TASKS_FILE, "a", encoding="utf-8") as file:
+        file.write(f'0,0,0,"{name}",important\n')
+
+
+def names(collection):
+    return [item.name for item in collection.items]
+
+
+def load_tasks(cf):
+    return TaskLoaderCSV(cf).load()
+
+
+def add_task(user_tasks, name):
+    user_tasks.add_item(Task(user_tasks.generate_id(), name, Status.NORMAL, Timer([]), False))
+
+
+def test_edits_are_logged_and_replayed(tmp_path):
+    cf = make_cf(tmp_path)
+    write_tasks(cf, ["a", "b", "c", "d"])
+    user_tasks = load_tasks(cf)
+    saver = TaskSaverCSV(user_tasks, cf)
+
+    add_task(user_tasks, "e")
+    user_tasks.rename_item(1, "B")
+    user_tasks.delete_item(2)
+    user_tasks.toggle_item_status(3, Status.DONE)
+    saver.save()
+    user_tasks.move_task(3, 0)
+    saver.save()
+
+    # The file is not rewritten, the changes are in the log:
+    assert open(cf.TASKS_FILE, encoding="utf-8").read().count("\n") == 4
+    assert saver.change_log.exists
+
+    reloaded = load_tasks(cf)
+    assert names(reloaded) == names(user_tasks) == ["e", "a", "B", "d"]
+    assert [task.item_id for task in reloaded.items] == [task.item_id for task in user_tasks.items]
+    assert reloaded.items[3].status == Status.DONE
+
+
+def test_compaction_folds_the_log_into_the_file(tmp_path):
+    cf = make_cf(tmp_path)
+    write_tasks(cf, ["a", "b"])
+    user_tasks = load_tasks(cf)
+    saver = TaskSaverCSV(user_tasks, cf)
+    add_task(user_tasks, "c")
+    user_tasks.delete_item(0)
+    saver.save()
+
+    saver.compact()
+    assert not saver.change_log.exists
+    assert names(load_tasks(cf)) == ["b", "c"]
+    assert names(load_tasks(make_cf(tmp_path, change_log=False))) == ["b", "c"]
+
+
+def test_edits_after_compaction_keep_ids(tmp_path):
+    cf = make_cf(tmp_path)
+    write_tasks(cf, ["a", "b", "c"])
+    user_tasks = load_tasks(cf)
+    saver = TaskSaverCSV(user_tasks, cf)
+
+    # Once the log grows larger than the file, the file is rewritten and the log starts with ids:
+    user_tasks.delete_item(0)
+    for number in range(20):
+        add_task(user_tasks, f"task {number}")
+        saver.save()
+    assert saver.change_log.read()[1][0][0] == "ids"
+    user_tasks.rename_item(user_tasks.items[-1].item_id, "last")
+    saver.save()
+
+    reloaded = load_tasks(cf)
+    assert names(reloaded) == names(user_tasks)
+    assert [task.item_id for task in reloaded.items] == [task.item_id for task in user_tasks.items]
+
+
+def test_log_survives_external_change_of_the_file(tmp_path):
+    cf = make_cf(tmp_path)
+    write_tasks(cf, ["a", "b", "c"])
+    user_tasks = load_tasks(cf)
+    saver = TaskSaverCSV(user_tasks, cf)
+    add_task(user_tasks, "added in calcure")
+    user_tasks.rename_item(0, "A")
+    user_tasks.delete_item(1)
+    saver.save()
+
+    append_task(cf, "added outside")
+    reloaded = load_tasks(cf)
+    assert names(reloaded) == ["A", "c", "added outside", "added in calcure"]
+    assert reloaded.items[2].status == Status.IMPORTANT
+
+    # The log is started anew for the changed file, and the old one is kept aside:
+    log = ChangeLog(cf.TASKS_FILE)
+    header, _ = log.read()
+    assert log.is_started_for_base(header)
+    assert log.stale_file.exists()
+    assert names(load_tasks(cf)) == names(reloaded)
+
+    # Further edits go on top of the new log:
+    saver = TaskSaverCSV(reloaded, cf)
+    add_task(reloaded, "later")
+    saver.save()
+    saver.compact()
+    assert names(load_tasks(make_cf(tmp_path, change_log=False))) == ["A", "c", "added outside",
+                                                                      "added in calcure", "later"]
+
+
+def test_log_of_events_survives_external_change_of_the_file(tmp_path):
+    cf = make_cf(tmp_path)
+    with open(cf.EVENTS_FILE, "w", encoding="utf-8") as file:
+        file.write('0,2026,1,1,"First",1,once,normal\n')
+    user_events = EventLoaderCSV(cf).load()
+    saver = EventSaverCSV(user_events, cf)
+    user_events.add_item(UserEvent(user_events.items[-1].item_id + 1, 2026, 1, 2, "Second", 1,
+                                   Frequency.ONCE, Status.NORMAL, False))
+    saver.save()
+
+    with open(cf.EVENTS_FILE, "a", encoding="utf-8") as file:
+        file.write('1,2026,1,3,"Outside",1,once,normal\n')
+    assert names(EventLoaderCSV(cf).load()) == ["First", "Outside", "Second"]
+
+
+def test_missing_log_and_disabled_log(tmp_path):
+    cf = make_cf(tmp_path, change_log=False)
+    write_tasks(cf, ["a"])
+    user_tasks = load_tasks(cf)
+    add_task(user_tasks, "b")
+    TaskSaverCSV(user_tasks, cf).save()
+    assert not ChangeLog(cf.TASKS_FILE).exists
+    assert names(load_tasks(make_cf(tmp_path))) == ["a", "b"]
+
+
+def test_log_with_ids_survives_external_change_of_the_file(tmp_path):
+    cf = make_cf(tmp_path)
+    write_tasks(cf, ["a", "b", "c"])
+    user_tasks = load_tasks(cf)
+    saver = TaskSaverCSV(user_tasks, cf)
+    user_tasks.delete_item(0)
+    for number in range(20):
+        add_task(user_tasks, f"task {number}")
+        saver.save()
+    add_task(user_tasks, "added in calcure")
+    saver.save()
+
+    # Rows added outside go after the rows of the file, and before the tasks that are only in the log:
+    in_file = names(load_tasks(make_cf(tmp_path, change_log=False)))
+    in_log = names(user_tasks)[len(in_file):]
+    append_task(cf, "added outside")
+    assert names(load_tasks(cf)) == in_file + ["added outside"] + in_log
+    assert names(load_tasks(cf)) == in_file + ["added outside"] + in_log
+    assert in_log[-1] == "added in calcure"
@@ -0,0 +1,43 @@
+"""Tests of adding tasks and events with command line arguments"""
+
+import importlib
+import sys
+from types import SimpleNamespace
+
+
+def import_main(monkeypatch, tmp_path):
+    """Import calcure with a clean home folder and without arguments of pytest"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / ".config").mkdir(exist_ok=True)
+    monkeypatch.setattr(sys, "argv", ["calcure"])
+    return importlib.import_module("calcure.__main__")
+
+
+def test_task_added_after_deletion_keeps_other_tasks(monkeypatch, tmp_path):
+    main = import_main(monkeypatch, tmp_path)
+    from calcure.data import Task, Status, Timer
+    from calcure.database import Database
+    from calcure.loaders import TaskLoaderSQLite
+    from calcure.savers import TaskSaverSQLite
+
+    cf = SimpleNamespace(HIDE_DONE_TASKS=False, USE_PERSIAN_CALENDAR=False)
+    database = Database(tmp_path / "calcure.db")
+    loader = TaskLoaderSQLite(database, cf)
+    user_tasks = loader.load()
+    saver = TaskSaverSQLite(user_tasks, database, cf)
+    for name in ["a", "b", "c"]:
+        user_tasks.add_item(Task(user_tasks.generate_id(), name, Status.NORMAL, Timer([]), False))
+    saver.save()
+    user_tasks.delete_item(user_tasks.items[1].item_id)
+    saver.save()
+
+    # Adding a task from the command line, as in a new run of the program:
+    user_tasks = TaskLoaderSQLite(database, cf).load()
+    saver = TaskSaverSQLite(user_tasks, database, cf)
+    screen = SimpleNamespace(state=None)
+    monkeypatch.setattr(main, "get_args", lambda: SimpleNamespace(task="newtask", event=None))
+    main.read_items_from_user_arguments(screen, user_tasks, None, saver, None)
+
+    names = [task.name for task in TaskLoaderSQLite(database, cf).load().items]
+    database.close()
+    assert names == ["a", "c", "newtask"]
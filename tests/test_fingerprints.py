@@ -0,0 +1,141 @@
+"""Tests of telling if the files read by loaders changed since they were read"""
+
+import os
+from types import SimpleNamespace
+
+from calcure.loaders import Fingerprints, TaskLoaderCSV, EventLoaderICS, BackgroundLoader
+
+
+EVENT = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:test
+BEGIN:VEVENT
+UID:{name}
+DTSTART;VALUE=DATE:20260105
+SUMMARY:{name}
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def write_event(path, name):
+    path.write_text(EVENT.format(name=name))
+
+
+def bump(path):
+    """Give the file a modification time that differs from the one it had"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def make_ics_loader(tmp_path, files):
+    cf = SimpleNamespace(ICS_EVENT_FILES=files, USE_PERSIAN_CALENDAR=False, cache_folder=tmp_path / "cache",
+                         ICS_URL_TIMEOUT=1)
+    return EventLoaderICS(cf)
+
+
+def test_nothing_read_counts_as_changed():
+    fingerprints = Fingerprints()
+    assert not fingerprints.are_unchanged
+
+
+def test_fingerprints_notice_modified_replaced_and_removed_files(tmp_path):
+    data_file = tmp_path / "tasks.csv"
+    data_file.write_text('0,0,0,"one",normal\n')
+    fingerprints = Fingerprints()
+    fingerprints.record(data_file)
+    assert fingerprints.are_unchanged
+
+    bump(data_file)
+    assert not fingerprints.are_unchanged
+    fingerprints.refresh()
+    assert fingerprints.are_unchanged
+
+    replacement = tmp_path / "new.csv"
+    replacement.write_text('0,0,0,"one",normal\n')
+    os.replace(replacement, data_file)
+    assert not fingerprints.are_unchanged
+    fingerprints.refresh()
+
+    data_file.unlink()
+    assert not fingerprints.are_unchanged
+
+
+def test_remote_sources_always_count_as_changed(tmp_path):
+    fingerprints = Fingerprints()
+    fingerprints.record(tmp_path)
+    fingerprints.has_remote_sources = True
+    assert not fingerprints.are_unchanged
+
+
+def test_csv_loader_is_skipped_until_its_file_changes(tmp_path):
+    cf = SimpleNamespace(TASKS_FILE=tmp_path / "tasks.csv", HIDE_DONE_TASKS=False,
+                         USE_PERSIAN_CALENDAR=False, CSV_CHANGE_LOG=True)
+    cf.TASKS_FILE.write_text('0,0,0,"one",normal\n')
+    loader = TaskLoaderCSV(cf)
+    loader.load()
+    assert loader.fingerprints.are_unchanged
+
+    # A change log that appears next to the file counts as a change too:
+    (tmp_path / "tasks.csv.log").write_text("")
+    assert not loader.fingerprints.are_unchanged
+
+
+def test_ics_folder_notices_added_and_removed_files(tmp_path):
+    folder = tmp_path / "calendar"
+    folder.mkdir()
+    write_event(folder / "a.ics", "a")
+    loader = make_ics_loader(tmp_path, [str(folder)])
+    assert len(loader.load().items) == 1
+    assert loader.fingerprints.are_unchanged
+
+    write_event(folder / "b.ics", "b")
+    assert not loader.fingerprints.are_unchanged
+    assert len(loader.load().items) == 2
+
+    (folder / "a.ics").unlink()
+    assert not loader.fingerprints.are_unchanged
+    assert [event.name for event in loader.load().items] == ["b"]
+
+
+def test_only_changed_ics_files_are_read_again(tmp_path):
+    folder = tmp_path / "calendar"
+    folder.mkdir()
+    for name in ["a", "b", "c"]:
+        write_event(folder / f"{name}.ics", name)
+    loader = make_ics_loader(tmp_path, [str(folder)])
+    loader.load()
+    read_sources = []
+    load_source = loader.load_source
+    loader.load_source = lambda source, resource: read_sources.append(source) or load_source(source, resource)
+
+    write_event(folder / "b.ics", "B")
+    bump(folder / "b.ics")
+    loader.fingerprints.mark_changed([str(folder / "b.ics"), str(folder / "b.ics.swp"), str(tmp_path / "x.ics")])
+    assert loader.fingerprints.changed_paths == {str(folder / "b.ics")}
+    assert sorted(event.name for event in loader.load().items) == ["B", "a", "c"]
+    assert read_sources == [str(folder / "b.ics")]
+    assert loader.fingerprints.are_unchanged
+
+    # A new file in the folder is covered, and leads to reading the folder again:
+    write_event(folder / "d.ics", "d")
+    loader.fingerprints.mark_changed([str(folder / "d.ics")])
+    assert sorted(event.name for event in loader.load().items) == ["B", "a", "c", "d"]
+
+
+def test_background_loader_skips_unchanged_loaders(tmp_path):
+    folder = tmp_path / "calendar"
+    folder.mkdir()
+    write_event(folder / "a.ics", "a")
+    loader = make_ics_loader(tmp_path, [str(folder)])
+    background_loader = BackgroundLoader()
+    displayed = loader.user_ics_events.__class__()
+
+    background_loader.start([(displayed, loader)])
+    background_loader.thread.join()
+    assert background_loader.merge()
+    assert [event.name for event in displayed.items] == ["a"]
+
+    background_loader.start([(displayed, loader)])
+    background_loader.thread.join()
+    assert not background_loader.merge()
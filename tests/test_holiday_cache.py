@@ -0,0 +1,74 @@
+"""Tests of reusing holidays generated on previous runs"""
+
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from calcure.cache import HolidayCache
+from calcure.loaders import HolidayLoader
+
+pytest.importorskip("holidays")
+
+
+def make_holiday_loader(tmp_path):
+    cf = SimpleNamespace(HOLIDAY_COUNTRY="Germany", USE_PERSIAN_CALENDAR=False, cache_folder=tmp_path / "cache")
+    return HolidayLoader(cf)
+
+
+def holiday_names(loader, year):
+    return sorted(holiday.name for holiday in loader.load_year(year))
+
+
+def count_generated_tables(monkeypatch, loader):
+    """Make the loader count the tables it asks the holidays module for"""
+    generated = []
+    generate_table = loader.generate_table
+    monkeypatch.setattr(loader, "generate_table", lambda *key: generated.append(key) or generate_table(*key))
+    return generated
+
+
+def test_generated_holidays_are_reused_by_the_next_run(tmp_path, monkeypatch):
+    names = holiday_names(make_holiday_loader(tmp_path), 2026)
+    assert "Neujahr" in names
+
+    loader = make_holiday_loader(tmp_path)
+    generated = count_generated_tables(monkeypatch, loader)
+    assert holiday_names(loader, 2026) == names
+    assert generated == []
+
+    # Years that were not displayed before are generated and added to the cache:
+    holiday_names(loader, 2027)
+    assert generated == [("Germany", None, 2027)]
+    assert HolidayCache(tmp_path / "cache" / "holidays.pickle").get(("Germany", None, 2027)) is not None
+
+
+def test_cache_of_other_holidays_version_is_not_used(tmp_path, monkeypatch):
+    loader = make_holiday_loader(tmp_path)
+    holiday_names(loader, 2026)
+    with open(loader.cache.cache_file, "rb") as file:
+        version, module_version, tables = pickle.load(file)
+    with open(loader.cache.cache_file, "wb") as file:
+        pickle.dump((version, "0.1", tables), file)
+
+    loader = make_holiday_loader(tmp_path)
+    generated = count_generated_tables(monkeypatch, loader)
+    holiday_names(loader, 2026)
+    assert generated == [("Germany", None, 2026)]
+
+
+def test_corrupted_cache_falls_back_to_generating(tmp_path, monkeypatch, caplog):
+    names = holiday_names(make_holiday_loader(tmp_path), 2026)
+    (tmp_path / "cache" / "holidays.pickle").write_bytes(b"\x80\x05not a pickle")
+
+    loader = make_holiday_loader(tmp_path)
+    generated = count_generated_tables(monkeypatch, loader)
+    assert holiday_names(loader, 2026) == names
+    assert generated == [("Germany", None, 2026)]
+    assert "Failed to read cache" in caplog.text
+
+    # The cache is written anew:
+    loader = make_holiday_loader(tmp_path)
+    generated = count_generated_tables(monkeypatch, loader)
+    assert holiday_names(loader, 2026) == names
+    assert generated == []
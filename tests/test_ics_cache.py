@@ -0,0 +1,126 @@
+"""Tests of reusing events parsed from ics files on the next run"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+from calcure import configuration
+from calcure.configuration import Config
+from calcure.loaders import EventLoaderICS
+
+from test_fingerprints import write_event, bump, make_ics_loader
+
+
+def load_in_new_run(tmp_path, files):
+    """Load events with a new loader, as the next run of the program does, and return it with their names"""
+    loader = make_ics_loader(tmp_path, files)
+    return loader, [event.name for event in loader.load().items]
+
+
+def test_unchanged_file_is_not_read_again(tmp_path):
+    path = tmp_path / "a.ics"
+    write_event(path, "a")
+    load_in_new_run(tmp_path, [str(path)])
+
+    loader, names = load_in_new_run(tmp_path, [str(path)])
+    assert names == ["a"]
+    assert (loader.cache.hits, loader.cache.misses) == (1, 0)
+
+
+def test_touched_file_is_read_but_not_parsed_again(tmp_path):
+    path = tmp_path / "a.ics"
+    write_event(path, "a")
+    load_in_new_run(tmp_path, [str(path)])
+
+    bump(path)
+    loader, names = load_in_new_run(tmp_path, [str(path)])
+    assert names == ["a"]
+    assert (loader.cache.hits, loader.cache.misses) == (1, 0)
+
+    # The new modification time is saved, so the next run does not read it either:
+    loader, _ = load_in_new_run(tmp_path, [str(path)])
+    loader.read_source = lambda source: None
+    assert loader.load().items[0].name == "a"
+
+
+def test_file_with_other_modification_time_or_size_is_parsed_again(tmp_path):
+    path = tmp_path / "a.ics"
+    write_event(path, "a")
+    load_in_new_run(tmp_path, [str(path)])
+
+    # Same size, other modification time:
+    write_event(path, "b")
+    bump(path)
+    loader, names = load_in_new_run(tmp_path, [str(path)])
+    assert names == ["b"]
+    assert loader.cache.misses == 1
+
+    # Same modification time, other size:
+    stat = os.stat(path)
+    write_event(path, "longer")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    loader, names = load_in_new_run(tmp_path, [str(path)])
+    assert names == ["longer"]
+    assert loader.cache.misses == 1
+
+
+def test_removed_files_are_dropped_from_the_cache(tmp_path):
+    paths = [tmp_path / "a.ics", tmp_path / "b.ics"]
+    for path in paths:
+        write_event(path, path.stem)
+    loader, _ = load_in_new_run(tmp_path, [str(path) for path in paths])
+    assert set(loader.cache.entries) == {str(path) for path in paths}
+
+    loader, _ = load_in_new_run(tmp_path, [str(paths[0])])
+    loader.cache.read()
+    assert set(loader.cache.entries) == {str(paths[0])}
+
+
+def test_corrupted_cache_falls_back_to_parsing(tmp_path, caplog):
+    path = tmp_path / "a.ics"
+    write_event(path, "a")
+    loader, _ = load_in_new_run(tmp_path, [str(path)])
+    loader.cache.cache_file.write_bytes(b"\x80\x05not a pickle")
+
+    loader, names = load_in_new_run(tmp_path, [str(path)])
+    assert names == ["a"]
+    assert "Failed to read cache" in caplog.text
+
+    # The cache is written anew:
+    caplog.clear()
+    loader, names = load_in_new_run(tmp_path, [str(path)])
+    assert names == ["a"]
+    assert loader.cache.hits == 1
+    assert "Failed to read cache" not in caplog.text
+
+
+def test_cache_of_other_settings_is_not_used(tmp_path):
+    path = tmp_path / "a.ics"
+    write_event(path, "a")
+    load_in_new_run(tmp_path, [str(path)])
+
+    cf = SimpleNamespace(ICS_EVENT_FILES=[str(path)], USE_PERSIAN_CALENDAR=True, cache_folder=tmp_path / "cache",
+                         ICS_URL_TIMEOUT=1)
+    loader = EventLoaderICS(cf)
+    assert (loader.load().items[0].year, loader.cache.misses) == (1404, 1)
+
+
+def test_cache_folder_follows_xdg_cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "home" / ".config").mkdir(parents=True)
+    monkeypatch.setattr(sys, "argv", ["calcure"])
+    monkeypatch.setattr(configuration, "_args", None)
+
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    assert Config().cache_folder == tmp_path / "home" / ".cache" / "calcure"
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    cf = Config()
+    assert cf.cache_folder == tmp_path / "xdg" / "calcure"
+
+    path = tmp_path / "a.ics"
+    write_event(path, "a")
+    cf.ICS_EVENT_FILES = [str(path)]
+    EventLoaderICS(cf).load()
+    assert (tmp_path / "xdg" / "calcure" / "ics_events.pickle").exists()
+    assert not (tmp_path / "home" / ".cache").exists()
@@ -0,0 +1,115 @@
+"""Tests of calculating repetitions of events, compared with stepping through them one by one as it was done before"""
+
+import pytest
+
+from calcure.calendars import Calendar, date_to_ordinal, ordinal_to_date, next_month
+from calcure.data import UserEvent, Frequency, Status, RepeatedEvents, Events
+
+
+def stepped_date(year, month, day, frequency, use_persian_calendar):
+    """Date of a repetition as calculated before repetitions were calculated arithmetically"""
+    new_day = day
+    new_month = month
+    new_year = year
+    skip_days = 0
+    if frequency in [Frequency.WEEKLY, Frequency.BIWEEKLY, Frequency.DAILY]:
+        for i in range(1000):
+            if month + i > 12:
+                year = year + 1
+                month = month - 12
+            last_day = Calendar(0, use_persian_calendar).last_day(year, month+i)
+            if day > skip_days + last_day:
+                skip_days += last_day
+                skip_months = i + 1
+            else:
+                skip_months = i
+                break
+        new_day = day - skip_days
+        new_month = month + skip_months
+        new_year = year
+    if frequency == Frequency.MONTHLY:
+        if month > 12:
+            new_year = year + (month - 1)//12
+            new_month = month - 12*(new_year - year)
+    return new_year, new_month, new_day
+
+
+def stepped_repetitions(event, start, end, use_persian_calendar):
+    """Repetitions within [start, end) as they were found before, leaving out dates that do not exist"""
+    calendar = Calendar(0, use_persian_calendar)
+    dates = []
+    for rep in range(1, event.repetition):
+        year = event.year + rep*(event.frequency == Frequency.YEARLY)
+        month = event.month + rep*(event.frequency == Frequency.MONTHLY)
+        day = (event.day + rep*(event.frequency == Frequency.DAILY) + 7*rep*(event.frequency == Frequency.WEEKLY)
+               + 14*rep*(event.frequency == Frequency.BIWEEKLY))
+        year, month, day = stepped_date(year, month, day, event.frequency, use_persian_calendar)
+        if start <= (year, month, day) < end and 0 < day <= calendar.last_day(year, month):
+            dates.append((year, month, day))
+    return dates
+
+
+def calculated_repetitions(event, start, end, use_persian_calendar):
+    """Repetitions within [start, end) as they are displayed now"""
+    events = Events()
+    events.add_item(event)
+    return [(item.year, item.month, item.day) for item in RepeatedEvents(events, use_persian_calendar, start, end).items]
+
+
+def month_windows(first_year, last_year):
+    """Windows of each month of the years, as the monthly view asks for them"""
+    for year in range(first_year, last_year + 1):
+        for month in range(1, 13):
+            yield (year, month, 1), (*next_month(year, month), 1)
+
+
+FREQUENCIES = [Frequency.DAILY, Frequency.WEEKLY, Frequency.BIWEEKLY, Frequency.MONTHLY, Frequency.YEARLY]
+
+
+@pytest.mark.parametrize("use_persian_calendar, first_dates, years", [
+    (False, [(2024, 1, 31), (2024, 2, 29), (2025, 3, 30), (2025, 12, 15)], (2023, 2028)),
+    (True, [(1402, 6, 31), (1403, 12, 30), (1404, 1, 1), (1404, 11, 29)], (1401, 1407)),
+], ids=["gregorian", "persian"])
+@pytest.mark.parametrize("frequency", FREQUENCIES, ids=lambda frequency: frequency.name.lower())
+def test_repetitions_match_stepping_through_them(use_persian_calendar, first_dates, years, frequency):
+    for year, month, day in first_dates:
+        for repetition in [1, 2, 13, 40, 400]:
+            event = UserEvent(0, year, month, day, "Event", repetition, frequency, Status.NORMAL, False)
+            stepped = stepped_repetitions(event, (0, 0, 0), (10000, 0, 0), use_persian_calendar)
+            for start, end in month_windows(*years):
+                assert (calculated_repetitions(event, start, end, use_persian_calendar)
+                        == [date for date in stepped if start <= date < end]), (year, month, day, repetition, start)
+
+
+def test_monthly_repetitions_skip_months_without_the_day():
+    event = UserEvent(0, 2025, 1, 31, "End of month", 12, Frequency.MONTHLY, Status.NORMAL, False)
+    months = [month for month in range(1, 13)
+              if calculated_repetitions(event, (2025, month, 1), (*next_month(2025, month), 1), False)]
+    assert months == [3, 5, 7, 8, 10, 12]
+
+
+def test_repetitions_in_a_wide_window():
+    event = UserEvent(0, 2025, 12, 30, "Daily", 5, Frequency.DAILY, Status.NORMAL, False)
+    assert event.occurrences((2025, 1, 1), (2027, 1, 1), False) == [(2025, 12, 30), (2025, 12, 31), (2026, 1, 1),
+                                                                    (2026, 1, 2), (2026, 1, 3)]
+
+
+def test_event_repeated_once_has_no_repetitions():
+    # Before, an event with a repetition count but no frequency was displayed again on its own day:
+    event = UserEvent(0, 2025, 5, 10, "Once", 3, Frequency.ONCE, Status.NORMAL, False)
+    assert calculated_repetitions(event, (2025, 5, 1), (2025, 6, 1), False) == []
+    assert stepped_repetitions(event, (2025, 5, 1), (2025, 6, 1), False) == [(2025, 5, 10), (2025, 5, 10)]
+
+
+@pytest.mark.parametrize("use_persian_calendar", [False, True], ids=["gregorian", "persian"])
+def test_ordinals_round_trip(use_persian_calendar):
+    calendar = Calendar(0, use_persian_calendar)
+    first_year = 1400 if use_persian_calendar else 2020
+    previous = None
+    for year in range(first_year, first_year + 6):
+        for month in range(1, 13):
+            for day in range(1, calendar.last_day(year, month) + 1):
+                ordinal = date_to_ordinal(year, month, day, use_persian_calendar)
+                assert ordinal_to_date(ordinal, use_persian_calendar) == (year, month, day)
+                assert previous is None or ordinal == previous + 1
+                previous = ordinal
@@ -0,0 +1,60 @@
+"""Tests of parsing ics files in parallel processes"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+EVENT = """BEGIN:VEVENT
+UID:{number}
+DTSTART;VALUE=DATE:20260105
+SUMMARY:Event {number}
+END:VEVENT
+"""
+
+# Script like the one that pip installs as the calcure command, with drawing replaced by parsing:
+CONSOLE_SCRIPT = """
+import os
+import sys
+if __name__ != "__main__":
+    with open({marker!r}, "a") as file:
+        file.write(__name__ + "\\n")
+
+import calcure.loaders
+from calcure.__main__ import cli
+import calcure.__main__ as calcure_main
+
+os.cpu_count = lambda: 2
+calcure.loaders.MIN_PARALLEL_PARSING_SIZE = 0
+
+def parse(stdscr):
+    with open({calendar!r}, encoding="utf-8") as file:
+        text = file.read()
+    loader = calcure.loaders.EventLoaderICS(calcure_main.cf)
+    results = loader.parse_texts([text, text, text])
+    print(sum(len(items) for items, _ in results), sum(error is not None for _, error in results))
+
+calcure_main.curses.wrapper = parse
+if __name__ == "__main__":
+    sys.exit(cli())
+"""
+
+
+def test_console_script_is_not_run_again_by_parsing_processes(tmp_path):
+    calendar = tmp_path / "calendar.ics"
+    calendar.write_text("BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:test\n"
+                        + "".join(EVENT.format(number=number) for number in range(50)) + "END:VCALENDAR\n")
+    marker = tmp_path / "imported"
+    script = tmp_path / "calcure"
+    script.write_text(CONSOLE_SCRIPT.format(marker=str(marker), calendar=str(calendar)))
+    (tmp_path / ".config").mkdir()
+
+    environment = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(REPOSITORY))
+    result = subprocess.run([sys.executable, str(script)], cwd=tmp_path, env=environment,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["150", "0"]
+    assert not marker.exists(), marker.read_text()
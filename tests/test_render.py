@@ -0,0 +1,45 @@
+"""Smoke test of drawing every view on a fake screen, as the render benchmark does"""
+
+import curses
+import datetime
+import sys
+
+import pytest
+
+from benchmarks.headless import FakeScreen
+
+
+@pytest.fixture
+def calcure(monkeypatch, tmp_path):
+    """Main module of calcure imported with a clean home folder and without a terminal"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    (tmp_path / ".config").mkdir(exist_ok=True)
+    monkeypatch.setattr(sys, "argv", ["calcure"])
+    monkeypatch.setattr(curses, "color_pair", lambda number: number << 8)
+    import calcure.__main__
+    return calcure.__main__
+
+
+@pytest.mark.parametrize("name", ["monthly", "weekly", "daily", "journal"])
+@pytest.mark.parametrize("split", [False, True], ids=["single", "split"])
+def test_every_view_is_drawn(calcure, name, split):
+    from benchmarks.bench_render import make_dataset, make_views, draw
+    from calcure.data import AppState, UserEvent, Frequency, Status
+    from calcure.screen import Screen
+
+    stdscr = FakeScreen(50, 200)
+    screen = Screen(stdscr, calcure.cf)
+    screen.split = split
+    screen.currently_drawn = AppState.JOURNAL if name == "journal" else AppState.CALENDAR
+    dataset = make_dataset(1000, seed=0)
+    today = datetime.date.today()
+    dataset[0].add_item(UserEvent(1000, today.year, today.month, today.day, "Event today", 1, Frequency.ONCE,
+                                  Status.NORMAL, False))
+    view = make_views(calcure, stdscr, screen, dataset)[name]
+    draw(stdscr, screen, view)
+    first_frame = stdscr.text()
+    assert ("Event" if name != "journal" else "Task") in first_frame
+
+    # The next frame with the same data looks the same:
+    draw(stdscr, screen, view)
+    assert stdscr.text() == first_frame
@@ -0,0 +1,50 @@
+"""Tests of repetitions of ics events given by recurrence rules"""
+
+import datetime
+import time
+
+import pytest
+
+from calcure.data import UserEvent, Frequency, Status, RepeatedEvents, Events
+
+
+def repetitions(event, start, end):
+    events = Events()
+    events.add_item(event)
+    return [(item.year, item.month, item.day) for item in RepeatedEvents(events, False, start, end).items]
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    """Set the local timezone of the process for the test"""
+    def set_timezone(timezone):
+        monkeypatch.setenv("TZ", timezone)
+        time.tzset()
+    yield set_timezone
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize("timezone", ["UTC", "America/Los_Angeles", "Asia/Tokyo"])
+def test_all_day_rule_ending_on_a_date(local_timezone, caplog, timezone):
+    # Dateutil takes an UNTIL date only in UTC once dtstart has a timezone, which events always have:
+    local_timezone(timezone)
+    event = UserEvent(0, 2026, 1, 5, "All day", 0, Frequency.ONCE, Status.NORMAL, False,
+                      rrule="FREQ=WEEKLY;UNTIL=20260302")
+    dates = repetitions(event, (2026, 1, 1), (2026, 4, 1))
+    assert "Problem occurred" not in caplog.text
+    assert dates[0] == (2026, 1, 12)
+    assert dates[-1] == (2026, 3, 2)
+    assert len(dates) == 8
+
+
+def test_timed_rule_ending_in_utc():
+    event = UserEvent(0, 2026, 1, 5, "Timed", 0, Frequency.ONCE, Status.NORMAL, False, hour=9, minute=30,
+                      rrule="FREQ=DAILY;UNTIL=20260110T235959Z")
+    assert repetitions(event, (2026, 1, 1), (2026, 2, 1)) == [(2026, 1, day) for day in range(6, 11)]
+
+
+def test_rule_with_excluded_dates():
+    event = UserEvent(0, 2026, 1, 5, "Weekly", 0, Frequency.ONCE, Status.NORMAL, False,
+                      rrule="FREQ=WEEKLY;COUNT=4", exdate=[datetime.date(2026, 1, 19)])
+    assert repetitions(event, (2026, 1, 1), (2026, 3, 1)) == [(2026, 1, 12), (2026, 1, 26)]
@@ -0,0 +1,128 @@
+"""Tests of downloading subscribed ics URLs with conditional requests and a local copy"""
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from test_fingerprints import EVENT, make_ics_loader
+
+
+class CalendarServer(ThreadingHTTPServer):
+    """Server of one ics file that remembers the requests it got"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), CalendarHandler)
+        self.body = EVENT.format(name="first")
+        self.etag = '"1"'
+        self.last_modified = "Mon, 05 Jan 2026 10:00:00 GMT"
+        self.use_gzip = False
+        self.delay = 0
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/calendar.ics"
+
+
+class CalendarHandler(BaseHTTPRequestHandler):
+    """Answer with 304 when the client has the current version, like calendar servers do"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        time.sleep(server.delay)
+        # If-Modified-Since counts only without If-None-Match, as in RFC 7232:
+        if "If-None-Match" in self.headers:
+            is_unchanged = self.headers["If-None-Match"] == server.etag
+        else:
+            is_unchanged = server.last_modified and self.headers.get("If-Modified-Since") == server.last_modified
+        if is_unchanged:
+            self.send_response(304)
+            self.end_headers()
+            return
+        content = server.body.encode("utf-8")
+        self.send_response(200)
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        if server.last_modified:
+            self.send_header("Last-Modified", server.last_modified)
+        if server.use_gzip and "gzip" in self.headers.get("Accept-Encoding", ""):
+            content = gzip.compress(content)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        try:
+            self.wfile.write(content)
+        except OSError: # The client stopped waiting
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = CalendarServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def event_names(loader):
+    return [event.name for event in loader.load().items]
+
+
+@pytest.mark.parametrize("etag, last_modified", [('"1"', None), (None, "Mon, 05 Jan 2026 10:00:00 GMT")],
+                         ids=["etag", "last-modified"])
+def test_unchanged_url_reuses_the_saved_copy(tmp_path, server, etag, last_modified):
+    server.etag, server.last_modified = etag, last_modified
+    loader = make_ics_loader(tmp_path, [server.url])
+    assert event_names(loader) == ["first"]
+    assert "If-None-Match" not in server.requests[0]
+
+    # The server answers 304 without the body, which is taken from the cache, also by a new run:
+    server.body = ""
+    loader = make_ics_loader(tmp_path, [server.url])
+    assert loader.read_url(server.url) == EVENT.format(name="first")
+    assert event_names(loader) == ["first"]
+    assert server.requests[-1].get("If-None-Match") == etag
+    assert server.requests[-1].get("If-Modified-Since") == last_modified
+
+
+def test_changed_url_is_downloaded_again(tmp_path, server):
+    loader = make_ics_loader(tmp_path, [server.url])
+    assert event_names(loader) == ["first"]
+    server.body = EVENT.format(name="second")
+    server.etag = '"2"'
+    assert event_names(loader) == ["second"]
+
+
+def test_gzip_content_is_decoded(tmp_path, server):
+    server.use_gzip = True
+    loader = make_ics_loader(tmp_path, [server.url])
+    assert loader.read_url(server.url) == EVENT.format(name="first")
+    assert "gzip" in server.requests[0]["Accept-Encoding"]
+
+
+def test_unreachable_url_falls_back_to_the_saved_copy(tmp_path, server, caplog):
+    loader = make_ics_loader(tmp_path, [server.url])
+    assert event_names(loader) == ["first"]
+
+    server.etag, server.last_modified = '"2"', None
+    server.delay = 2
+    loader.url_timeout = 0.2
+    assert loader.read_url(server.url) == EVENT.format(name="first")
+    assert "Failed to load" in caplog.text
+
+
+def test_unreachable_url_without_saved_copy_gives_nothing(tmp_path, server, caplog):
+    server.delay = 2
+    loader = make_ics_loader(tmp_path, [server.url])
+    loader.url_timeout = 0.2
+    assert loader.read_url(server.url) == ""
+    assert "Failed to load" in caplog.text
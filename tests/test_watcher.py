@@ -0,0 +1,95 @@
+"""Tests of noticing changes of data files made by other programs"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from calcure.data import Task, Timer, Status
+from calcure.loaders import TaskLoaderCSV
+from calcure.savers import TaskSaverCSV, BackgroundSaver
+from calcure.watcher import InotifyWatcher, PollingWatcher, make_watcher
+
+
+def make_watchers():
+    """Watchers that work on this system"""
+    watchers = [PollingWatcher(interval=0.05)]
+    try:
+        watchers.append(InotifyWatcher())
+    except (OSError, AttributeError):
+        pass
+    return watchers
+
+
+def wait_for_changes(watcher, timeout=2):
+    """Return the paths that the watcher noticed changing, waiting for the first of them"""
+    end = time.monotonic() + timeout
+    changes = set()
+    while time.monotonic() < end:
+        changes |= watcher.take_changes()
+        if changes:
+            time.sleep(0.1)
+            return changes | watcher.take_changes()
+        time.sleep(0.02)
+    return changes
+
+
+@pytest.mark.parametrize("watcher", make_watchers(), ids=lambda watcher: type(watcher).__name__)
+def test_watchers_notice_written_and_replaced_files(tmp_path, watcher):
+    data_file = tmp_path / "tasks.csv"
+    data_file.write_text("first\n")
+    watcher.watch([str(data_file)])
+    time.sleep(0.1)
+
+    with open(data_file, "a", encoding="utf-8") as file:
+        file.write("second\n")
+    assert str(data_file) in wait_for_changes(watcher)
+
+    # Editors often write a new file and put it in place of the old one:
+    replacement = tmp_path / "tasks.csv.new"
+    replacement.write_text("third\n")
+    os.replace(replacement, data_file)
+    assert str(data_file) in wait_for_changes(watcher)
+
+
+def test_make_watcher_returns_a_working_watcher(tmp_path):
+    watcher = make_watcher()
+    watcher.watch([str(tmp_path)])
+    (tmp_path / "new.ics").write_text("")
+    assert wait_for_changes(watcher)
+
+
+def test_edit_in_calcure_then_change_outside_then_reload(tmp_path):
+    cf = SimpleNamespace(TASKS_FILE=tmp_path / "tasks.csv", HIDE_DONE_TASKS=False,
+                         USE_PERSIAN_CALENDAR=False, CSV_CHANGE_LOG=True)
+    cf.TASKS_FILE.write_text('0,0,0,"one",normal\n0,0,0,"two",normal\n')
+    loader = TaskLoaderCSV(cf)
+    user_tasks = loader.load()
+    saver = TaskSaverCSV(user_tasks, cf, loader.fingerprints)
+    background_saver = BackgroundSaver(delay=0.05)
+    watcher = make_watcher()
+    watcher.watch(loader.fingerprints.files)
+
+    # The edit is written into the change log, which is not taken for a change made outside:
+    user_tasks.add_item(Task(user_tasks.generate_id(), "added in calcure", Status.NORMAL, Timer([]), False))
+    background_saver.save(saver)
+    background_saver.flush()
+    wait_for_changes(watcher, timeout=0.5)
+    assert loader.fingerprints.are_unchanged
+
+    with open(cf.TASKS_FILE, "a", encoding="utf-8") as file:
+        file.write('0,0,0,"added outside",normal\n')
+    assert wait_for_changes(watcher)
+
+    # What the main loop does once changes are noticed:
+    background_saver.flush()
+    assert not loader.fingerprints.are_unchanged
+    user_tasks = loader.load()
+    assert [task.name for task in user_tasks.items] == ["one", "two", "added outside", "added in calcure"]
+
+    # Nothing is lost once the log is folded into the file on exit:
+    TaskSaverCSV(user_tasks, cf, loader.fingerprints).compact()
+    assert cf.TASKS_FILE.read_text().splitlines() == ['0,0,0,"one",normal', '0,0,0,"two",normal',
+                                                     '0,0,0,"added outside",normal',
+                                                     '0,0,0,"added in calcure",normal']